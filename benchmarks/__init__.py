@@ -0,0 +1 @@
+"""Benchmarks offline do extrator (servidor local + cenários de carga)."""
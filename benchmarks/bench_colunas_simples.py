@@ -0,0 +1,104 @@
+"""
+Benchmark das colunas "simples" (classe de busca + classe de retorno) no servidor local.
+
+Compara, na página /simples/?containers=N do servidor local, o caminho antigo
+(find_elements pela classe de busca e find_element da classe de retorno em cada
+container) com o script em lote do DataExtractor (SCRIPT_COLUNAS_LOTE, um único
+execute_script). A página tem N containers sem a classe de retorno antes do único
+que a contém, e uma das colunas não existe em nenhum container: no caminho antigo
+cada container sem a classe custa um round-trip e a espera implícita inteira.
+
+Os valores dos dois caminhos são comparados; o benchmark falha se divergirem.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_colunas_simples --containers 10 50 --espera-implicita 0.2
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_extractor import config_isolada
+from benchmarks.servidor_local import ServidorLocal
+
+# Uma coluna encontrada apenas no último container e outra que não existe na página
+PARES = [["cell", "destaque"], ["cell", "inexistente"]]
+
+
+def extrair_por_elementos(driver, pares):
+    """Caminho antigo: find_elements + find_element por container, primeiro texto não vazio."""
+    from selenium.webdriver.common.by import By
+
+    valores = []
+    for classe_busca, classe_retorno in pares:
+        valor = "N/A"
+        for elemento in driver.find_elements(By.CLASS_NAME, classe_busca):
+            try:
+                texto = elemento.find_element(By.CLASS_NAME, classe_retorno).text
+            except Exception:
+                continue
+            if texto:
+                valor = texto
+                break
+        valores.append(valor)
+    return valores
+
+
+def extrair_em_lote(driver, pares):
+    """Caminho atual: todas as colunas simples em um único execute_script."""
+    from data_extractor import SCRIPT_COLUNAS_LOTE
+    return driver.execute_script(SCRIPT_COLUNAS_LOTE, [], pares)["simples"]
+
+
+def medir(extrator, funcao):
+    """Executa `funcao` e retorna (valores, segundos, round-trips)."""
+    antes = extrator.metrics.total_roundtrips()
+    inicio = time.perf_counter()
+    valores = funcao(extrator.driver, PARES)
+    return valores, time.perf_counter() - inicio, extrator.metrics.total_roundtrips() - antes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das colunas simples (elementos x script em lote)")
+    parser.add_argument("--containers", type=int, nargs="+", default=[10, 50],
+                        help="Quantidades de containers sem a classe de retorno")
+    parser.add_argument("--espera-implicita", type=float, default=0.2,
+                        help="implicitly_wait em segundos (o extrator usa 5)")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições do caminho em lote")
+    args = parser.parse_args()
+
+    from data_extractor import DataExtractor
+
+    with ServidorLocal() as servidor, tempfile.TemporaryDirectory(prefix="bench_simples_") as dir_estado:
+        config = config_isolada(dir_estado, acoes=[], colunas_personalizadas=[], headless=True,
+                                base_url=servidor.base_url)
+        extrator = DataExtractor(config, status_callback=lambda msg, prog: None)
+        divergencias = 0
+        try:
+            extrator.setup_driver()
+            extrator.driver.implicitly_wait(args.espera_implicita)
+            print(f"Servidor local em {servidor.base_url} | espera implícita {args.espera_implicita}s")
+
+            for containers in args.containers:
+                extrator.driver.get(f"{servidor.base_url}/simples/?containers={containers}")
+                antigos, tempo_antigo, rt_antigo = medir(extrator, extrair_por_elementos)
+                amostras = [medir(extrator, extrair_em_lote) for _ in range(max(1, args.repeticoes))]
+                novos, _, rt_novo = amostras[-1]
+                tempo_novo = min(tempo for _, tempo, _ in amostras)
+
+                print(f"\n== {containers} containers ==")
+                print(f"  elementos : {tempo_antigo * 1000:8.1f} ms | {rt_antigo} round-trips | {antigos}")
+                print(f"  lote (JS) : {tempo_novo * 1000:8.1f} ms | {rt_novo} round-trips | {novos}")
+                print(f"  speedup   : {tempo_antigo / tempo_novo:.1f}x" if tempo_novo else "  speedup   : -")
+                if antigos != novos:
+                    divergencias += 1
+                    print("  ERRO: os valores dos dois caminhos divergem")
+        finally:
+            extrator.cleanup()
+
+    return 1 if divergencias else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Benchmark offline do DataExtractor contra o servidor local (benchmarks/servidor_local.py).
+
+Executa `extract_stock_data`, `extract_portfolio_data` e a exportação para Excel
+para cada tamanho de lista de tickers e reporta throughput, percentis de latência
+por ticker, pico de RSS (processo + filhos) e quantidade de processos do Chrome.
+Cada execução é anexada a `benchmarks/resultados/historico.jsonl` e comparada
+com a execução anterior do mesmo tamanho.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_extractor --tamanhos 10 100 1000 --atraso-ms 0
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+try:
+    import psutil
+except ImportError:  # psutil é opcional: sem ele o RSS vem de resource e o Chrome não é contado
+    psutil = None
+
+from benchmarks.servidor_local import ServidorLocal, gerar_tickers
+
+DIR_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+ARQUIVO_HISTORICO = os.path.join(DIR_RESULTADOS, "historico.jsonl")
+ARQUIVO_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+
+
+def percentil(valores, p):
+    """Percentil por interpolação linear (valores já ordenados)."""
+    if not valores:
+        return 0.0
+    k = (len(valores) - 1) * p / 100.0
+    inferior = int(k)
+    superior = min(inferior + 1, len(valores) - 1)
+    return valores[inferior] + (valores[superior] - valores[inferior]) * (k - inferior)
+
+
+class AmostradorRecursos:
+    """Amostra periodicamente o RSS do processo e filhos e a contagem de processos Chrome."""
+
+    def __init__(self, intervalo=0.25):
+        self.intervalo = intervalo
+        self.pico_rss = 0
+        self.pico_chrome = 0
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _amostrar(self):
+        processo = psutil.Process()
+        while not self._parar.is_set():
+            try:
+                filhos = processo.children(recursive=True)
+                rss = processo.memory_info().rss
+                chrome = 0
+                for filho in filhos:
+                    try:
+                        rss += filho.memory_info().rss
+                        if "chrome" in filho.name().lower():
+                            chrome += 1
+                    except psutil.Error:
+                        continue
+                self.pico_rss = max(self.pico_rss, rss)
+                self.pico_chrome = max(self.pico_chrome, chrome)
+            except psutil.Error:
+                pass
+            self._parar.wait(self.intervalo)
+
+    def __enter__(self):
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._amostrar, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+        if psutil is None:
+            self.pico_rss = _rss_maximo_resource()
+            self.pico_chrome = None
+
+
+def _rss_maximo_resource():
+    """Fallback sem psutil: maior RSS do processo e dos filhos já finalizados (apenas Unix)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    fator = 1 if sys.platform == "darwin" else 1024
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * fator
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * fator
+    return proprio + filhos
+
+
+def carregar_colunas():
+    with open(ARQUIVO_CONFIG, 'r', encoding='utf-8') as f:
+        return json.load(f).get("colunas_personalizadas", [])
+
+
+def config_isolada(dir_estado, **config):
+    """
+    Configuração do extrator com o estado persistente (índice de seletores, snapshot
+    do delta, histórico de indicadores e séries) em `dir_estado`: os tickers e
+    seletores sintéticos do benchmark não podem ir para o cache/ do usuário.
+    """
+    return dict(config,
+                indice_seletores=os.path.join(dir_estado, "indice_seletores.json"),
+                snapshot_execucao=os.path.join(dir_estado, "ultima_execucao.json"),
+                arquivo_historico_indicadores=os.path.join(dir_estado, "historico_indicadores.json"),
+                dir_series=os.path.join(dir_estado, "series"))
+
+
+def executar_cenario(tamanho, base_url, colunas, dir_saida, abas=1):
+    """Executa um cenário completo e retorna as métricas medidas."""
+    import pandas as pd
+    from data_extractor import DataExtractor
+
+    config = config_isolada(
+        os.path.join(dir_saida, f"estado_{tamanho}"),
+        acoes=gerar_tickers(tamanho),
+        colunas_personalizadas=colunas,
+        headless=True,
+        base_url=base_url,
+        abas_paralelas=abas,
+    )
+    extrator = DataExtractor(config, status_callback=lambda msg, prog: None)
+
+    with AmostradorRecursos() as recursos:
+        inicio = time.perf_counter()
+        try:
+            extrator.setup_driver()
+            extrator.access_site_and_await_login()
+
+            inicio_acoes = time.perf_counter()
+            dados_acoes = extrator.extract_stock_data()
+            tempo_acoes = time.perf_counter() - inicio_acoes
+
+            inicio_carteiras = time.perf_counter()
+            dados_carteiras = extrator.extract_portfolio_data()
+            tempo_carteiras = time.perf_counter() - inicio_carteiras
+
+            inicio_export = time.perf_counter()
+            extrator.salvar_excel(pd.DataFrame(dados_acoes), pd.DataFrame(dados_carteiras), output_dir=dir_saida)
+            tempo_export = time.perf_counter() - inicio_export
+        finally:
+            extrator.cleanup()
+        tempo_total = time.perf_counter() - inicio
+
+    latencias = sorted(extrator.metrics.tickers.values())
+    erros = sum(1 for linha in dados_acoes if "Erro" in linha)
+    return {
+        "tamanho": tamanho,
+        "tempo_total_s": round(tempo_total, 3),
+        "tempo_acoes_s": round(tempo_acoes, 3),
+        "tempo_carteiras_s": round(tempo_carteiras, 3),
+        "tempo_exportacao_s": round(tempo_export, 3),
+        "throughput_tickers_s": round(tamanho / tempo_acoes, 3) if tempo_acoes else 0.0,
+        "latencia_ticker_ms": {
+            "p50": round(percentil(latencias, 50) * 1000, 1),
+            "p90": round(percentil(latencias, 90) * 1000, 1),
+            "p99": round(percentil(latencias, 99) * 1000, 1),
+            "max": round(latencias[-1] * 1000, 1) if latencias else 0.0,
+        },
+        "linhas_carteiras": len(dados_carteiras),
+        "erros": erros,
+        "pico_rss_mb": round(recursos.pico_rss / 2**20, 1) if recursos.pico_rss else None,
+        "pico_processos_chrome": recursos.pico_chrome,
+        "roundtrips_webdriver": extrator.metrics.total_roundtrips(),
+    }
+
+
+def ultimo_resultado(tamanho):
+    """Retorna o último resultado registrado para o tamanho informado, se houver."""
+    if not os.path.exists(ARQUIVO_HISTORICO):
+        return None
+    anterior = None
+    with open(ARQUIVO_HISTORICO, 'r', encoding='utf-8') as f:
+        for linha in f:
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                continue
+            if registro.get("tamanho") == tamanho:
+                anterior = registro
+    return anterior
+
+
+def registrar_resultado(resultado):
+    os.makedirs(DIR_RESULTADOS, exist_ok=True)
+    with open(ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+
+def _variacao(atual, anterior):
+    if not anterior:
+        return ""
+    return f" ({(atual / anterior - 1) * 100:+.1f}%)"
+
+
+def imprimir_resultado(resultado, anterior):
+    lat = resultado["latencia_ticker_ms"]
+    print(f"\n== {resultado['tamanho']} tickers ==")
+    print(f"  throughput : {resultado['throughput_tickers_s']:.2f} tickers/s"
+          f"{_variacao(resultado['throughput_tickers_s'], anterior and anterior['throughput_tickers_s'])}")
+    print(f"  latência   : p50 {lat['p50']:.0f} ms | p90 {lat['p90']:.0f} ms | p99 {lat['p99']:.0f} ms"
+          f"{_variacao(lat['p50'], anterior and anterior['latencia_ticker_ms']['p50'])}")
+    print(f"  etapas     : ações {resultado['tempo_acoes_s']:.1f}s | carteiras {resultado['tempo_carteiras_s']:.1f}s"
+          f" | exportação {resultado['tempo_exportacao_s']:.1f}s")
+    print(f"  recursos   : pico RSS {resultado['pico_rss_mb']} MB | processos Chrome {resultado['pico_processos_chrome']}")
+    print(f"  round-trips: {resultado['roundtrips_webdriver']} | erros: {resultado['erros']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline do DataExtractor")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--atraso-ms", type=int, default=0, help="Latência artificial do servidor local")
+    parser.add_argument("--linhas-carteira", type=int, default=30)
+    parser.add_argument("--abas", type=int, default=1, help="Abas do navegador carregando tickers em paralelo")
+    parser.add_argument("--rotulo", default="", help="Identificação livre da execução (ex: branch ou commit)")
+    parser.add_argument("--nao-registrar", action="store_true", help="Não grava no histórico")
+    args = parser.parse_args()
+
+    colunas = carregar_colunas()
+    with ServidorLocal(atraso_ms=args.atraso_ms, linhas_carteira=args.linhas_carteira) as servidor, \
+            tempfile.TemporaryDirectory(prefix="bench_exports_") as dir_saida:
+        print(f"Servidor local em {servidor.base_url}")
+        for tamanho in args.tamanhos:
+            resultado = executar_cenario(tamanho, servidor.base_url, colunas, dir_saida, args.abas)
+            resultado.update({
+                "data": datetime.now().isoformat(timespec="seconds"),
+                "rotulo": args.rotulo,
+                "atraso_ms": args.atraso_ms,
+                "abas": args.abas,
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+            })
+            imprimir_resultado(resultado, ultimo_resultado(tamanho))
+            if not args.nao_registrar:
+                registrar_resultado(resultado)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark de abertura do executável gerado pelo PyInstaller.
+
+Executa o artefato de `dist/` com INVESTIDOR10_SAIR_APOS_INICIO=1 (a aplicação
+fecha assim que a janela principal é exibida) e mede:
+  - abertura "fria": a primeira execução, feita a partir de uma cópia recém-criada
+    do artefato em um diretório temporário (arquivos que o executável ainda não leu);
+  - abertura "quente": as execuções seguintes do artefato em `dist/`.
+
+O tamanho registrado em dist/build_info.json pelo build_executable.py é anexado ao
+resultado, que vai para benchmarks/resultados/historico_abertura.jsonl e é comparado
+com a execução anterior do mesmo perfil.
+
+Para uma medição realmente fria do sistema de arquivos, execute logo após reiniciar a máquina.
+
+Uso (a partir da raiz do projeto, após `python build_executable.py --perfil onedir`):
+    python -m benchmarks.bench_launch --repeticoes 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_DIST = os.path.join(RAIZ_PROJETO, "dist")
+ARQUIVO_BUILD_INFO = os.path.join(DIR_DIST, "build_info.json")
+DIR_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+ARQUIVO_HISTORICO = os.path.join(DIR_RESULTADOS, "historico_abertura.jsonl")
+
+NOME_EXECUTAVEL = "ExtractorInvestidor10"
+
+
+def localizar_executavel(dir_dist):
+    """Retorna (caminho do executável, perfil) do artefato em `dir_dist`."""
+    sufixo = ".exe" if sys.platform == "win32" else ""
+    candidatos = [
+        (os.path.join(dir_dist, NOME_EXECUTAVEL, NOME_EXECUTAVEL + sufixo), "onedir"),
+        (os.path.join(dir_dist, NOME_EXECUTAVEL + sufixo), "onefile"),
+    ]
+    for caminho, perfil in candidatos:
+        if os.path.isfile(caminho):
+            return caminho, perfil
+    raise FileNotFoundError(f"Nenhum executável encontrado em {dir_dist}. Execute build_executable.py primeiro.")
+
+
+def executar_ate_janela(executavel, timeout=120):
+    """Abre o executável até a janela principal ser exibida e retorna o tempo em segundos."""
+    ambiente = dict(os.environ, INVESTIDOR10_SAIR_APOS_INICIO="1")
+    inicio = time.perf_counter()
+    resultado = subprocess.run([executavel], cwd=os.path.dirname(executavel), env=ambiente,
+                               stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=timeout)
+    decorrido = time.perf_counter() - inicio
+    if resultado.returncode != 0:
+        saida = (resultado.stdout.strip() or resultado.stderr.strip()).splitlines()
+        raise RuntimeError(f"O executável falhou: {saida[0] if saida else resultado.returncode}")
+    return decorrido
+
+
+def medir_fria(executavel, perfil):
+    """Mede a primeira abertura de uma cópia nova do artefato."""
+    with tempfile.TemporaryDirectory(prefix="bench_launch_") as temporario:
+        if perfil == "onedir":
+            origem = os.path.dirname(executavel)
+            destino = os.path.join(temporario, os.path.basename(origem))
+            shutil.copytree(origem, destino)
+            copia = os.path.join(destino, os.path.basename(executavel))
+        else:
+            copia = os.path.join(temporario, os.path.basename(executavel))
+            shutil.copy2(executavel, copia)
+        return executar_ate_janela(copia)
+
+
+def ultimo_resultado(perfil):
+    """Último resultado registrado para o mesmo perfil, se houver."""
+    if not os.path.exists(ARQUIVO_HISTORICO):
+        return None
+    anterior = None
+    with open(ARQUIVO_HISTORICO, 'r', encoding='utf-8') as f:
+        for linha in f:
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                continue
+            if registro.get("perfil") == perfil:
+                anterior = registro
+    return anterior
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de abertura do executável")
+    parser.add_argument("--dist", default=DIR_DIST, help="Diretório com o artefato gerado")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções quentes")
+    parser.add_argument("--nao-registrar", action="store_true")
+    args = parser.parse_args()
+
+    executavel, perfil = localizar_executavel(args.dist)
+    print(f"Artefato: {executavel} (perfil {perfil})")
+
+    fria = medir_fria(executavel, perfil)
+    executar_ate_janela(executavel)  # aquece o cache do sistema de arquivos
+    quentes = [executar_ate_janela(executavel) for _ in range(args.repeticoes)]
+
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "perfil": perfil,
+        "fria_s": round(fria, 3),
+        "quente_mediana_s": round(statistics.median(quentes), 3),
+        "quente_min_s": round(min(quentes), 3),
+    }
+    if os.path.exists(ARQUIVO_BUILD_INFO):
+        with open(ARQUIVO_BUILD_INFO, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        if info.get("perfil") == perfil:
+            resultado["tamanho_mb"] = info.get("tamanho_mb")
+            resultado["arquivos"] = info.get("arquivos")
+
+    print(f"Abertura fria:   {resultado['fria_s']:.2f}s")
+    print(f"Abertura quente: mediana {resultado['quente_mediana_s']:.2f}s | min {resultado['quente_min_s']:.2f}s")
+    if "tamanho_mb" in resultado:
+        print(f"Tamanho:         {resultado['tamanho_mb']} MB em {resultado['arquivos']} arquivo(s)")
+
+    anterior = ultimo_resultado(perfil)
+    if anterior:
+        for chave, rotulo in (("fria_s", "fria"), ("quente_mediana_s", "quente"), ("tamanho_mb", "tamanho")):
+            if anterior.get(chave) and resultado.get(chave):
+                variacao = (resultado[chave] - anterior[chave]) / anterior[chave] * 100
+                print(f"  {rotulo}: {variacao:+.1f}% em relação a {anterior['data']}")
+
+    if not args.nao_registrar:
+        os.makedirs(DIR_RESULTADOS, exist_ok=True)
+        with open(ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark do motor CDP (cdp_engine.py) contra o caminho Selenium no servidor local.
+
+Extrai as mesmas páginas de FIIs do servidor local uma vez por motor, com as
+colunas do config.json: `motor_extracao: "selenium"` (driver.get +
+execute_script, cada um uma requisição HTTP ao chromedriver), `"cdp"`
+(Page.navigate + Runtime.evaluate direto no WebSocket da aba) e, se pedido com
+`--motores`, `"playwright"` (várias páginas simultâneas, ver
+playwright_backend.py). Reporta o throughput, a latência p50/p90 por ticker e os
+comandos enviados em cada caminho.
+
+As linhas extraídas por cada motor são comparadas com as do primeiro (o
+Selenium, por padrão); o benchmark falha se divergirem ou se o motor CDP não
+conseguir se conectar.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_motor_cdp --tamanho 100 --atraso-ms 0
+    python -m benchmarks.bench_motor_cdp --motores selenium playwright --paginas 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_extractor import carregar_colunas, config_isolada, percentil
+from benchmarks.servidor_local import ServidorLocal, gerar_tickers
+
+MOTORES = ("selenium", "cdp", "playwright")
+
+
+def executar_motor(motor, tickers, base_url, colunas, paginas=1):
+    """Extrai os tickers com o motor informado e retorna (linhas, métricas)."""
+    from data_extractor import DataExtractor
+
+    # Estado novo por motor: o índice de seletores de um motor não pode pular seletores no outro
+    dir_estado = tempfile.TemporaryDirectory(prefix="bench_motor_")
+    config = config_isolada(
+        dir_estado.name,
+        acoes=tickers,
+        colunas_personalizadas=colunas,
+        headless=True,
+        base_url=base_url,
+        motor_extracao=motor,
+        paginas_simultaneas=paginas,
+    )
+    extrator = DataExtractor(config, status_callback=lambda msg, prog: None)
+    try:
+        extrator.setup_driver()
+        extrator.access_site_and_await_login()
+        antes = dict(extrator.metrics.roundtrips)
+        inicio = time.perf_counter()
+        linhas = extrator.extract_stock_data()
+        tempo = time.perf_counter() - inicio
+        comandos = {nome: total - antes.get(nome, 0) for nome, total in extrator.metrics.roundtrips.items()}
+        cdp = sum(total for nome, total in comandos.items() if nome.startswith("cdp:"))
+        latencias = sorted(extrator.metrics.tickers.values())
+    finally:
+        extrator.cleanup()
+        dir_estado.cleanup()
+
+    return linhas, {
+        "tempo_s": tempo,
+        "throughput": len(tickers) / tempo if tempo else 0.0,
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p90_ms": percentil(latencias, 90) * 1000,
+        "webdriver": sum(comandos.values()) - cdp,
+        "cdp": cdp,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do motor CDP contra o Selenium")
+    parser.add_argument("--tamanho", type=int, default=100, help="Quantidade de tickers")
+    parser.add_argument("--atraso-ms", type=int, default=0, help="Latência artificial do servidor local")
+    parser.add_argument("--motores", nargs="+", choices=MOTORES, default=["selenium", "cdp"],
+                        help="Motores comparados (o primeiro é a referência)")
+    parser.add_argument("--paginas", type=int, default=4, help="Páginas simultâneas do Playwright")
+    args = parser.parse_args()
+
+    colunas = carregar_colunas()
+    tickers = gerar_tickers(args.tamanho)
+    with ServidorLocal(atraso_ms=args.atraso_ms) as servidor:
+        print(f"Servidor local em {servidor.base_url} | {args.tamanho} tickers | {len(colunas)} colunas")
+        resultados = {motor: executar_motor(motor, tickers, servidor.base_url, colunas, args.paginas)
+                      for motor in args.motores}
+
+    referencia = args.motores[0]
+    falhas = 0
+    for motor in args.motores:
+        linhas, medidas = resultados[motor]
+        speedup = resultados[referencia][1]["tempo_s"] / medidas["tempo_s"] if medidas["tempo_s"] else 0.0
+        print(f"  {motor:<10}: {medidas['throughput']:6.2f} tickers/s | p50 {medidas['p50_ms']:6.1f} ms"
+              f" | p90 {medidas['p90_ms']:6.1f} ms | {medidas['webdriver']} comandos WebDriver"
+              f" | {medidas['cdp']} comandos CDP | {speedup:.2f}x")
+        if motor == "cdp" and not medidas["cdp"]:
+            print("ERRO: o motor CDP não se conectou (a extração seguiu pelo Selenium)")
+            falhas += 1
+        if linhas != resultados[referencia][0]:
+            print(f"ERRO: as linhas extraídas por {motor} divergem das de {referencia}")
+            falhas += 1
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
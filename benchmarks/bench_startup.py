@@ -0,0 +1,122 @@
+"""
+Benchmark de inicialização da aplicação.
+
+Mede, em processos novos:
+  1. o tempo de importação de `main` (via `python -X importtime`) e verifica que
+     nenhuma dependência pesada (selenium, pandas, xlsxwriter...) é carregada antes
+     da primeira janela;
+  2. o tempo até a janela principal ser exibida (`main.py` com
+     INVESTIDOR10_SAIR_APOS_INICIO=1, que fecha a aplicação logo após desenhá-la).
+
+Retorna código 1 se algum orçamento for excedido.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_startup --repeticoes 5 --orcamento-janela 1.0
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+ARQUIVO_HISTORICO = os.path.join(DIR_RESULTADOS, "historico_inicializacao.jsonl")
+
+MODULOS_PESADOS = [
+    "selenium", "webdriver_manager", "pandas", "numpy", "xlsxwriter", "openpyxl", "PIL", "data_extractor",
+]
+
+
+def medir_importacao():
+    """Retorna (tempo de importação de `main` em segundos, módulos pesados carregados)."""
+    codigo = (
+        "import json, sys, main; "
+        f"print(json.dumps([m for m in {MODULOS_PESADOS!r} if m in sys.modules]))"
+    )
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ_PROJETO, capture_output=True, text=True, check=True
+    )
+    tempo_us = 0
+    for linha in resultado.stderr.splitlines():
+        # Formato: "import time: self [us] | cumulative | imported package"
+        partes = linha.split("|")
+        if len(partes) == 3 and partes[2].strip() == "main":
+            tempo_us = int(partes[1].strip())
+    carregados = json.loads(resultado.stdout.strip().splitlines()[-1])
+    return tempo_us / 1e6, carregados
+
+
+def medir_janela(repeticoes):
+    """Executa `main.py` até a janela principal ser exibida e retorna os tempos (s) por execução."""
+    ambiente = dict(os.environ, INVESTIDOR10_SAIR_APOS_INICIO="1")
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = subprocess.run([sys.executable, "main.py"], cwd=RAIZ_PROJETO, env=ambiente,
+                                   stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60)
+        decorrido = time.perf_counter() - inicio
+        if resultado.returncode != 0 or "Erro" in resultado.stdout:
+            saida = (resultado.stdout.strip() or resultado.stderr.strip()).splitlines()
+            raise RuntimeError(f"main.py falhou: {saida[0] if saida else resultado.returncode}")
+        tempos.append(decorrido)
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da aplicação")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--orcamento-importacao", type=float, default=0.3,
+                        help="Tempo máximo de importação de main (s)")
+    parser.add_argument("--orcamento-janela", type=float, default=1.0,
+                        help="Tempo máximo (mediana) até a janela principal (s)")
+    parser.add_argument("--nao-registrar", action="store_true")
+    args = parser.parse_args()
+
+    ok = True
+    tempo_importacao, carregados = medir_importacao()
+    print(f"Importação de main: {tempo_importacao * 1000:.0f} ms (orçamento {args.orcamento_importacao * 1000:.0f} ms)")
+    if carregados:
+        print(f"  ERRO: dependências pesadas carregadas na inicialização: {', '.join(carregados)}")
+        ok = False
+    if tempo_importacao > args.orcamento_importacao:
+        print("  ERRO: orçamento de importação excedido")
+        ok = False
+
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "importacao_s": round(tempo_importacao, 4),
+        "modulos_pesados": carregados,
+    }
+
+    try:
+        tempos = medir_janela(args.repeticoes)
+        mediana = statistics.median(tempos)
+        print(f"Janela principal: mediana {mediana:.2f}s | min {min(tempos):.2f}s | max {max(tempos):.2f}s "
+              f"(orçamento {args.orcamento_janela:.2f}s)")
+        resultado.update({"janela_mediana_s": round(mediana, 3), "janela_min_s": round(min(tempos), 3)})
+        if mediana > args.orcamento_janela:
+            print("  ERRO: orçamento de abertura da janela excedido")
+            ok = False
+    except Exception as e:
+        # Sem display disponível (ex: CI sem X), apenas a medição de importação é feita
+        print(f"Janela principal não medida: {e}")
+
+    if not args.nao_registrar:
+        os.makedirs(DIR_RESULTADOS, exist_ok=True)
+        with open(ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
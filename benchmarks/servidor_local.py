@@ -0,0 +1,315 @@
+"""
+Servidor HTTP local que substitui o investidor10.com.br nos benchmarks.
+
+Serve as páginas gravadas em `benchmarks/fixtures/`:
+    /                      -> página inicial mínima (usada no "login")
+    /fiis/<TICKER>/        -> página de FII com valores determinísticos por ticker
+    /carteiras/resumo/     -> tabela de carteiras (quantidade de linhas via ?linhas=N)
+    /fiis/?page=N          -> listagem paginada do universo de FIIs (usada pela descoberta)
+    /simples/?containers=N -> N containers ".cell" sem ".destaque" seguidos de um que o contém
+    /api/fii/dividendos/<TICKER>/ e /api/fii/cotacoes/<TICKER>/
+                           -> séries JSON dos gráficos, carregadas pela página do FII
+
+Uso isolado:
+    python -m benchmarks.servidor_local --porta 8765 --atraso-ms 50
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import date, timedelta
+from string import Template
+from urllib.parse import urlparse, parse_qs
+
+DIR_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PADRAO_FII = re.compile(r"^/fiis/([A-Za-z0-9]+)/?$")
+PADRAO_API_SERIE = re.compile(r"^/api/fii/(dividendos|cotacoes)/([A-Za-z0-9]+)/?$")
+SEGMENTOS = ["Logística", "Shoppings", "Lajes Corporativas", "Papéis", "Híbrido", "Agências"]
+TIPOS = ["Fundo de tijolo", "Fundo de papel", "Fundo de fundos"]
+ITENS_POR_PAGINA = 50
+
+
+def _ler_fixture(nome):
+    with open(os.path.join(DIR_FIXTURES, nome), 'r', encoding='utf-8') as f:
+        return Template(f.read())
+
+
+def formatar_br(valor, casas=2):
+    """Formata um número no padrão brasileiro (1.234,56)."""
+    texto = f"{valor:,.{casas}f}"
+    return texto.replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def valores_fii(ticker):
+    """Gera valores determinísticos para um ticker (mesmo ticker, mesma página)."""
+    rng = random.Random(ticker)
+    cotacao = rng.uniform(5, 150)
+    dy_12m = rng.uniform(6, 16)
+    cotas = rng.randint(1_000_000, 60_000_000)
+    vp_cota = cotacao / rng.uniform(0.7, 1.2)
+    patrimonio = vp_cota * cotas
+    liquidez = rng.uniform(100_000, 20_000_000)
+    valor_mercado = cotacao * cotas
+    return {
+        "ticker": ticker,
+        "nome": f"Fundo de Investimento Imobiliário {ticker}",
+        "cnpj": f"{rng.randint(10, 99)}.{rng.randint(100, 999)}.{rng.randint(100, 999)}/0001-{rng.randint(10, 99)}",
+        "segmento": rng.choice(SEGMENTOS),
+        "tipo": rng.choice(TIPOS),
+        "cotacao": formatar_br(cotacao),
+        "pvp": formatar_br(cotacao / vp_cota),
+        "pvp_2024": formatar_br(rng.uniform(0.7, 1.2)),
+        "pvp_2023": formatar_br(rng.uniform(0.7, 1.2)),
+        "dy_atual": formatar_br(dy_12m / 12),
+        "dy_3m": formatar_br(dy_12m / 4),
+        "dy_6m": formatar_br(dy_12m / 2),
+        "dy_12m": formatar_br(dy_12m),
+        "dy_2024": formatar_br(rng.uniform(6, 16)),
+        "dy_2023": formatar_br(rng.uniform(6, 16)),
+        "dividendo": formatar_br(cotacao * dy_12m / 1200),
+        "dividendo_3m": formatar_br(cotacao * dy_12m / 400),
+        "dividendo_6m": formatar_br(cotacao * dy_12m / 200),
+        "dividendo_12m": formatar_br(cotacao * dy_12m / 100),
+        "valorizacao": formatar_br(rng.uniform(-20, 25)),
+        "rent_1m": formatar_br(rng.uniform(-5, 5)),
+        "rent_1a": formatar_br(rng.uniform(-20, 30)),
+        "vacancia": formatar_br(rng.uniform(0, 15)),
+        "cotistas": formatar_br(rng.randint(1_000, 900_000), 0),
+        "cotas": formatar_br(cotas, 0),
+        "vp_cota": formatar_br(vp_cota),
+        "patrimonio": formatar_br(patrimonio),
+        "patrimonio_2024": formatar_br(patrimonio * rng.uniform(0.8, 1.1)),
+        "patrimonio_2023": formatar_br(patrimonio * rng.uniform(0.7, 1.05)),
+        "liquidez": formatar_br(liquidez),
+        "liquidez_2024": formatar_br(liquidez * rng.uniform(0.6, 1.4)),
+        "liquidez_2023": formatar_br(liquidez * rng.uniform(0.6, 1.4)),
+        "valor_mercado": formatar_br(valor_mercado),
+        "valor_mercado_2024": formatar_br(valor_mercado * rng.uniform(0.8, 1.2)),
+        "valor_mercado_2023": formatar_br(valor_mercado * rng.uniform(0.7, 1.2)),
+    }
+
+
+def serie_fii(ticker, nome, hoje=None):
+    """
+    Gera a série JSON de um gráfico no formato do site: dividendos mensais dos
+    últimos 5 anos ou cotações diárias (dias úteis) do último ano.
+    """
+    hoje = hoje or date.today()
+    rng = random.Random(f"{nome}-{ticker}")
+    cotacao = float(valores_fii(ticker)["cotacao"].replace(".", "").replace(",", "."))
+    if nome == "dividendos":
+        pontos = []
+        for meses in range(60, 0, -1):
+            ano, mes = divmod(hoje.year * 12 + hoje.month - 1 - meses, 12)
+            pagamento = date(ano, mes + 1, 15)
+            pontos.append({"data_com": (pagamento - timedelta(days=10)).strftime("%d/%m/%Y"),
+                           "payment_date": pagamento.strftime("%d/%m/%Y"),
+                           "price": round(cotacao * rng.uniform(0.005, 0.011), 4)})
+        return pontos
+    pontos = []
+    dia = hoje - timedelta(days=365)
+    preco = cotacao * rng.uniform(0.8, 1.2)
+    while dia <= hoje:
+        if dia.weekday() < 5:
+            preco = max(1.0, preco * (1 + rng.gauss(0, 0.01)))
+            pontos.append({"price": round(preco, 2), "created_at": dia.strftime("%d/%m/%Y")})
+        dia += timedelta(days=1)
+    return {"real": pontos}
+
+
+def linhas_carteira(quantidade):
+    """Gera as linhas <tr> da tabela de carteiras."""
+    linhas = []
+    for ticker in gerar_tickers(quantidade):
+        rng = random.Random(f"carteira-{ticker}")
+        qtd = rng.randint(1, 500)
+        preco_medio = rng.uniform(5, 150)
+        cotacao = preco_medio * rng.uniform(0.8, 1.2)
+        linhas.append(
+            "                    <tr>"
+            f"<td>{ticker}</td><td>{qtd}</td><td>R$ {formatar_br(preco_medio)}</td>"
+            f"<td>R$ {formatar_br(cotacao)}</td><td>R$ {formatar_br(qtd * cotacao)}</td>"
+            f"<td>{formatar_br((cotacao / preco_medio - 1) * 100)}%</td><td>{formatar_br(100 / quantidade)}%</td>"
+            "</tr>"
+        )
+    return "\n".join(linhas)
+
+
+def pagina_listagem(template, universo, pagina):
+    """Gera uma página da listagem de FIIs (ITENS_POR_PAGINA fundos por página)."""
+    tickers = gerar_tickers(universo)
+    total_paginas = max(1, -(-len(tickers) // ITENS_POR_PAGINA))
+    inicio = (pagina - 1) * ITENS_POR_PAGINA
+    linhas = []
+    for ticker in tickers[inicio:inicio + ITENS_POR_PAGINA]:
+        v = valores_fii(ticker)
+        linhas.append(
+            "                <tr>"
+            f'<td><a href="/fiis/{ticker.lower()}/">{ticker}</a></td><td>{v["nome"]}</td>'
+            f'<td>{v["segmento"]}</td><td>{v["tipo"]}</td><td>R$ {v["cotacao"]}</td>'
+            f'<td>{v["pvp"]}</td><td>{v["dy_12m"]}%</td>'
+            "</tr>"
+        )
+    paginacao = "\n".join(f'        <li><a href="/fiis/?page={n}">{n}</a></li>' for n in range(1, total_paginas + 1))
+    return template.substitute(linhas="\n".join(linhas), paginacao=paginacao)
+
+
+def pagina_simples(template, containers):
+    """Gera a página de colunas simples: só o último container ".cell" tem o ".destaque"."""
+    linhas = [
+        f'        <div class="cell"><div class="name"><span>Indicador {i}</span></div>'
+        f'<div class="value"><span>{formatar_br(i)}</span></div></div>'
+        for i in range(containers)
+    ]
+    linhas.append('        <div class="cell"><div class="name"><span>Destaque</span></div>'
+                  '<div class="destaque"><span>42,00</span></div></div>')
+    return template.substitute(containers="\n".join(linhas))
+
+
+def gerar_tickers(quantidade):
+    """Gera `quantidade` tickers sintéticos no formato XXXX11."""
+    letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    tickers = []
+    for i in range(quantidade):
+        n = i
+        prefixo = ""
+        for _ in range(4):
+            prefixo = letras[n % 26] + prefixo
+            n //= 26
+        tickers.append(f"{prefixo}11")
+    return tickers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    template_fii = None
+    template_carteiras = None
+    template_listagem = None
+    template_simples = None
+    atraso_s = 0.0
+    linhas_carteira = 30
+    universo = 500
+
+    def log_message(self, format, *args):
+        pass
+
+    def _responder(self, status, corpo):
+        dados = corpo.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _responder_json(self, dados):
+        corpo = json.dumps(dados).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        if self.atraso_s:
+            threading.Event().wait(self.atraso_s)
+
+        url = urlparse(self.path)
+        if url.path in ("", "/"):
+            self._responder(200, "<!DOCTYPE html><html><body><h1>Investidor10 (cópia local)</h1></body></html>")
+            return
+
+        if url.path.rstrip("/") == "/fiis":
+            pagina = int(parse_qs(url.query).get("page", ["1"])[0])
+            self._responder(200, pagina_listagem(self.template_listagem, self.universo, pagina))
+            return
+
+        if url.path.rstrip("/") == "/simples":
+            containers = int(parse_qs(url.query).get("containers", ["50"])[0])
+            self._responder(200, pagina_simples(self.template_simples, containers))
+            return
+
+        match = PADRAO_API_SERIE.match(url.path)
+        if match:
+            self._responder_json(serie_fii(match.group(2).upper(), match.group(1)))
+            return
+
+        match = PADRAO_FII.match(url.path)
+        if match:
+            self._responder(200, self.template_fii.substitute(valores_fii(match.group(1).upper())))
+            return
+
+        if url.path.rstrip("/") == "/carteiras/resumo":
+            linhas = int(parse_qs(url.query).get("linhas", [self.linhas_carteira])[0])
+            self._responder(200, self.template_carteiras.substitute(linhas=linhas_carteira(linhas)))
+            return
+
+        self._responder(404, "<!DOCTYPE html><html><body><h1>404</h1></body></html>")
+
+
+class ServidorLocal:
+    """
+    Servidor local em thread de fundo, usado como context manager.
+
+    Exemplo:
+        with ServidorLocal(atraso_ms=20) as servidor:
+            config["base_url"] = servidor.base_url
+    """
+
+    def __init__(self, porta=0, atraso_ms=0, linhas_carteira=30, universo=500):
+        handler = type("Handler", (_Handler,), {
+            "template_fii": _ler_fixture("fii.html"),
+            "template_carteiras": _ler_fixture("carteiras.html"),
+            "template_listagem": _ler_fixture("listagem.html"),
+            "template_simples": _ler_fixture("simples.html"),
+            "atraso_s": atraso_ms / 1000.0,
+            "linhas_carteira": linhas_carteira,
+            "universo": universo,
+        })
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", porta), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, porta = self.httpd.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def parar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.parar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que simula o Investidor10")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--atraso-ms", type=int, default=0, help="Latência artificial por requisição")
+    parser.add_argument("--linhas-carteira", type=int, default=30)
+    parser.add_argument("--universo", type=int, default=500, help="Quantidade de FIIs na listagem")
+    args = parser.parse_args()
+
+    servidor = ServidorLocal(args.porta, args.atraso_ms, args.linhas_carteira, args.universo)
+    print(f"Servindo em {servidor.base_url} (Ctrl+C para sair)")
+    try:
+        servidor.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Interface do navegador usada pelo extrator.
+
+`DataExtractor` extrai as páginas apenas por estas operações — navegar, esperar
+um seletor, avaliar um script, ler/gravar cookies e fechar —, e não pelos
+objetos de um pacote de automação específico:
+
+- `BackendSelenium` (este módulo): o Chrome controlado pelo chromedriver, como
+  sempre foi;
+- `BackendPlaywright` (playwright_backend.py): Playwright assíncrono, com várias
+  páginas carregando ao mesmo tempo e bloqueio de recursos por rota.
+
+Os scripts seguem a convenção do `execute_script` do Selenium: o corpo lê os
+parâmetros em `arguments` e devolve o resultado com `return`, para que os
+mesmos scripts de extração sirvam para qualquer backend.
+
+Os cookies trafegam no formato comum ao CDP e ao Playwright: dicionários com
+name, value, domain, path, expires (-1 para cookies de sessão), httpOnly,
+secure e, quando houver, sameSite.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_NAVEGACAO_S = 30
+CAMPOS_COOKIE = ("name", "value", "domain", "path", "expires", "httpOnly", "secure", "sameSite")
+
+
+def normalizar_cookie(cookie):
+    """Mantém apenas os campos comuns ao CDP e ao Playwright (sem sessão, tamanho ou prioridade)."""
+    normalizado = {campo: cookie[campo] for campo in CAMPOS_COOKIE if cookie.get(campo) is not None}
+    normalizado.setdefault("path", "/")
+    normalizado.setdefault("expires", -1)
+    return normalizado
+
+
+class BackendNavegador(ABC):
+    """Operações de navegador de que o extrator precisa."""
+
+    # Páginas que o backend carrega ao mesmo tempo em `extrair_paginas`
+    paginas_simultaneas = 1
+
+    @abstractmethod
+    def navegar(self, url, timeout=TIMEOUT_NAVEGACAO_S):
+        """Abre `url` na página atual e espera o evento load."""
+
+    @abstractmethod
+    def aguardar(self, seletor_css, timeout):
+        """Espera um elemento do seletor existir na página atual (TimeoutError se não aparecer)."""
+
+    @abstractmethod
+    def avaliar(self, script, *args):
+        """Executa um script no estilo do `execute_script` na página atual e devolve o resultado."""
+
+    @abstractmethod
+    def cookies(self):
+        """Todos os cookies do navegador."""
+
+    @abstractmethod
+    def adicionar_cookies(self, cookies):
+        """Grava cookies (ex: os de sessão de um navegador anterior)."""
+
+    @abstractmethod
+    def ativo(self):
+        """Indica se o navegador ainda responde."""
+
+    @abstractmethod
+    def fechar(self):
+        """Fecha o navegador."""
+
+    def extrair_paginas(self, urls, script, *args, cancelado=None, ao_concluir=None):
+        """
+        Abre cada URL e avalia o script nela.
+
+        A implementação padrão é sequencial, na página atual; backends com
+        `paginas_simultaneas` > 1 carregam várias páginas ao mesmo tempo.
+
+        Args:
+            urls (list): URLs a extrair
+            script (str): Script avaliado em cada página (mesmos `args` para todas)
+            cancelado (callable): Interrompe a extração das URLs restantes quando devolve True
+            ao_concluir (callable): Chamado com o índice de cada URL concluída (progresso)
+
+        Returns:
+            list: (valor, erro, segundos) por URL, na ordem de `urls`; URLs não
+            visitadas por cancelamento ficam como None
+        """
+        resultados = [None] * len(urls)
+        for indice, url in enumerate(urls):
+            if cancelado and cancelado():
+                break
+            inicio = time.perf_counter()
+            try:
+                self.navegar(url)
+                resultados[indice] = (self.avaliar(script, *args), None, time.perf_counter() - inicio)
+            except Exception as e:
+                resultados[indice] = (None, e, time.perf_counter() - inicio)
+            if ao_concluir:
+                ao_concluir(indice)
+        return resultados
+
+
+class BackendSelenium(BackendNavegador):
+    """Chrome controlado pelo Selenium (chromedriver)."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def navegar(self, url, timeout=TIMEOUT_NAVEGACAO_S):
+        # O timeout de carregamento do Selenium é o da sessão (driver.set_page_load_timeout)
+        self.driver.get(url)
+
+    def aguardar(self, seletor_css, timeout):
+        try:
+            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, seletor_css)))
+        except TimeoutException:
+            raise TimeoutError(f"Elemento '{seletor_css}' não apareceu em {timeout}s") from None
+
+    def avaliar(self, script, *args):
+        return self.driver.execute_script(script, *args)
+
+    def cookies(self):
+        # Network.getAllCookies traz os cookies de todos os domínios (get_cookies só os da página atual)
+        resposta = self.driver.execute_cdp_cmd("Network.getAllCookies", {})
+        return [normalizar_cookie(cookie) for cookie in resposta.get("cookies", [])]
+
+    def adicionar_cookies(self, cookies):
+        # Network.setCookies não exige estar no domínio do cookie (add_cookie exige)
+        cookies_cdp = []
+        for cookie in cookies:
+            cookie = normalizar_cookie(cookie)
+            if cookie["expires"] < 0:
+                del cookie["expires"]
+            cookies_cdp.append(cookie)
+        self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies_cdp})
+
+    def ativo(self):
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def fechar(self):
+        self.driver.quit()
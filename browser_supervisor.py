@@ -0,0 +1,161 @@
+"""
+Supervisão do navegador em execuções longas.
+
+O Chrome acumula memória ao longo de centenas de `driver.get`, e uma aba ou
+um chromedriver que morre aparece só como um erro genérico no ticker da vez.
+O supervisor:
+
+- conta as páginas abertas e, a cada `intervalo_amostra` páginas, soma o RSS e o
+  tempo de CPU do chromedriver e de todos os processos filhos (Chrome, renderers,
+  GPU) com psutil;
+- indica quando reciclar a sessão: depois de `max_paginas` páginas ou quando o
+  RSS passa de `max_rss_mb`;
+- reconhece erros de sessão perdida (Chrome fechado, aba travada, chromedriver
+  inacessível), para que o extrator reinicie o navegador e repita o ticker em
+  andamento em vez de registrá-lo como erro.
+
+A sonda de vida em si é `DataExtractor.navegador_ativo` (um único comando barato).
+"""
+
+import logging
+import time
+
+try:
+    import psutil
+except ImportError:  # Sem psutil (instalação incompleta) a reciclagem é só por número de páginas
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGINAS_PADRAO = 200
+MAX_RSS_MB_PADRAO = 1500
+INTERVALO_AMOSTRA_PADRAO = 10
+
+# Trechos de mensagens de erro que indicam sessão perdida (Selenium/chromedriver/urllib3/Playwright)
+MARCAS_SESSAO_PERDIDA = (
+    "invalid session id",
+    "session deleted",
+    "no such window",
+    "target window already closed",
+    "chrome not reachable",
+    # Frases do chromedriver ("disconnected" sozinho casaria com net::ERR_INTERNET_DISCONNECTED,
+    # um erro de rede da página); variações não listadas ficam para a sonda navegador_ativo()
+    "disconnected: not connected to devtools",
+    "disconnected: unable to receive message from renderer",
+    "disconnected: received inspector.detached event",
+    "tab crashed",
+    "gethandleverifier",
+    "failed to establish a new connection",
+    "connection refused",
+    "max retries exceeded",
+    "remotedisconnected",
+    "target page, context or browser has been closed",
+)
+# Exceções que indicam sessão perdida pelo nome da classe (sem importar o Selenium aqui)
+TIPOS_SESSAO_PERDIDA = {"InvalidSessionIdException", "NoSuchWindowException", "MaxRetryError",
+                        "ConnectionRefusedError", "RemoteDisconnected", "ProtocolError",
+                        "WebSocketConnectionClosedException", "ConnectionResetError", "BrokenPipeError",
+                        "TargetClosedError"}
+
+
+def erro_de_sessao(excecao):
+    """Indica se a exceção vem de uma sessão do navegador que não responde mais."""
+    if type(excecao).__name__ in TIPOS_SESSAO_PERDIDA:
+        return True
+    mensagem = str(excecao).lower()
+    return any(marca in mensagem for marca in MARCAS_SESSAO_PERDIDA)
+
+
+def processos_do_navegador(driver):
+    """chromedriver e todos os processos filhos (Chrome, renderers, GPU), ou [] sem psutil."""
+    if psutil is None or driver is None:
+        return []
+    try:
+        raiz = psutil.Process(driver.service.process.pid)
+        return [raiz] + raiz.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return []
+
+
+class SupervisorNavegador:
+    """Conta páginas, amostra RSS/CPU do navegador e decide quando reciclá-lo."""
+
+    def __init__(self, max_paginas=MAX_PAGINAS_PADRAO, max_rss_mb=MAX_RSS_MB_PADRAO,
+                 intervalo_amostra=INTERVALO_AMOSTRA_PADRAO):
+        """
+        Args:
+            max_paginas (int): Páginas por sessão antes de reciclar
+            max_rss_mb (int): RSS total (chromedriver + Chrome) que dispara a reciclagem
+            intervalo_amostra (int): A cada quantas páginas o RSS/CPU é amostrado
+        """
+        self.max_paginas = max_paginas
+        self.max_rss_mb = max_rss_mb
+        self.intervalo_amostra = max(1, intervalo_amostra)
+        self.paginas_sessao = 0
+        self.estatisticas = {"reciclagens": {}, "pico_rss_mb": None, "ultima_amostra": None}
+        self._cpu_anterior = None
+        if psutil is None and max_rss_mb:
+            logger.warning(f"psutil não está instalado: reciclar_rss_mb ({max_rss_mb} MB) será ignorado "
+                           "e o navegador será reciclado apenas pelo número de páginas (pip install psutil)")
+
+    @classmethod
+    def de_config(cls, config):
+        return cls(config.get("reciclar_apos_paginas", MAX_PAGINAS_PADRAO),
+                   config.get("reciclar_rss_mb", MAX_RSS_MB_PADRAO))
+
+    def amostrar(self, driver):
+        """
+        Soma RSS e CPU do navegador.
+
+        Returns:
+            dict | None: {"rss_mb", "cpu_percent", "processos"}, ou None sem psutil
+        """
+        processos = processos_do_navegador(driver)
+        if not processos:
+            return None
+        rss = 0
+        cpu = 0.0
+        for processo in processos:
+            try:
+                rss += processo.memory_info().rss
+                tempos = processo.cpu_times()
+                cpu += tempos.user + tempos.system
+            except psutil.Error:
+                continue
+        agora = time.monotonic()
+        cpu_percent = None
+        if self._cpu_anterior is not None:
+            cpu_antes, instante = self._cpu_anterior
+            if agora > instante:
+                cpu_percent = round(max(0.0, cpu - cpu_antes) / (agora - instante) * 100, 1)
+        self._cpu_anterior = (cpu, agora)
+
+        amostra = {"rss_mb": round(rss / 2**20, 1), "cpu_percent": cpu_percent, "processos": len(processos)}
+        self.estatisticas["ultima_amostra"] = amostra
+        pico = self.estatisticas["pico_rss_mb"]
+        self.estatisticas["pico_rss_mb"] = amostra["rss_mb"] if pico is None else max(pico, amostra["rss_mb"])
+        return amostra
+
+    def registrar_pagina(self, driver):
+        """
+        Registra uma página aberta na sessão atual.
+
+        Returns:
+            str | None: Motivo para reciclar agora ("paginas" ou "memoria"), ou None
+        """
+        self.paginas_sessao += 1
+        if self.paginas_sessao >= self.max_paginas:
+            return "paginas"
+        if self.paginas_sessao % self.intervalo_amostra == 0:
+            amostra = self.amostrar(driver)
+            if amostra and amostra["rss_mb"] >= self.max_rss_mb:
+                logger.info(f"Navegador com {amostra['rss_mb']} MB após {self.paginas_sessao} páginas")
+                return "memoria"
+        return None
+
+    def sessao_reiniciada(self, motivo):
+        """Zera os contadores da sessão e contabiliza a reciclagem."""
+        self.paginas_sessao = 0
+        self._cpu_anterior = None
+        reciclagens = self.estatisticas["reciclagens"]
+        reciclagens[motivo] = reciclagens.get(motivo, 0) + 1
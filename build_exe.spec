@@ -100,6 +100,9 @@ a = Analysis(
         'PIL.Image',
         'PIL.ImageTk',
 
+        # Memória e CPU do Chrome (reciclagem do navegador)
+        'psutil',
+
         # Módulos padrão Python
         'json',
         'threading',
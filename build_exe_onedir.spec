@@ -0,0 +1,117 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Perfil de build enxuto (modo one-dir).
+#
+# Diferente de build_exe.spec (one-file), o executável não precisa descompactar
+# pandas/selenium em um diretório temporário a cada abertura: as bibliotecas ficam
+# em dist/ExtractorInvestidor10/ ao lado do executável. Submódulos não usados e
+# pacotes de teste são excluídos e o bytecode é pré-compilado com otimização.
+#
+# Uso: python build_executable.py --perfil onedir
+
+block_cipher = None
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[
+        ('config.json', '.'),
+        ('screenshots', 'screenshots'),
+    ],
+    hiddenimports=[
+        # Módulos do projeto importados apenas pelo processo de extração
+        'extraction_worker',
+        'data_extractor',
+        'run_metrics',
+        'selector_miss_index',
+        'status_channel',
+
+        # Selenium e WebDriver Manager
+        'selenium.webdriver.chrome.service',
+        'selenium.webdriver.chrome.options',
+        'webdriver_manager.chrome',
+
+        # Exportação, leitura do Excel exportado (resultados e triagem) e imagens
+        'xlsxwriter',
+        'openpyxl',
+        'PIL.ImageTk',
+
+        # Memória e CPU do Chrome (reciclagem do navegador)
+        'psutil',
+    ],
+    hookspath=['hooks'],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[
+        # Pacotes de teste
+        'pandas.tests',
+        'numpy.tests',
+        'numpy.core.tests',
+        'numpy.lib.tests',
+        'numpy.linalg.tests',
+        'numpy.fft.tests',
+        'numpy.random.tests',
+        'numpy.ma.tests',
+        'numpy.polynomial.tests',
+        'numpy.typing.tests',
+        'selenium.webdriver.common.devtools.tests',
+        'unittest.test',
+        'test',
+        'pytest',
+
+        # Ferramentas de build do numpy
+        'numpy.f2py',
+        'numpy.distutils',
+
+        # Dependências opcionais do pandas que o projeto não usa
+        'pandas.io.formats.style',
+        'jinja2',
+        'matplotlib',
+        'scipy',
+        'pyarrow',
+        'sqlalchemy',
+        'tables',
+        'lxml',
+        'bs4',
+        'html5lib',
+        'IPython',
+    ],
+    win_no_prefer_redirects=False,
+    win_private_assemblies=False,
+    cipher=block_cipher,
+    noarchive=False,
+    optimize=1,  # Bytecode pré-compilado com -O (remove asserts, mantém docstrings)
+)
+
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='ExtractorInvestidor10',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,  # Binários comprimidos com UPX precisam ser descomprimidos a cada abertura
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='ExtractorInvestidor10',
+)
@@ -6,12 +6,22 @@ Versão 2.0 - Janeiro 2025
 Este script automatiza o processo de criação do executável usando PyInstaller.
 """
 
+import argparse
+import json
 import os
 import sys
 import subprocess
 import shutil
+from datetime import datetime
 from pathlib import Path
 
+# Perfis de build: arquivo .spec e caminho do artefato gerado
+PERFIS = {
+    "onefile": {"spec": "build_exe.spec", "artefato": Path("dist/ExtractorInvestidor10.exe")},
+    "onedir": {"spec": "build_exe_onedir.spec", "artefato": Path("dist/ExtractorInvestidor10")},
+}
+ARQUIVO_BUILD_INFO = Path("dist/build_info.json")
+
 
 def test_imports():
     """Testa se todas as importações necessárias estão funcionando."""
@@ -77,20 +87,20 @@ def ensure_hooks_directory():
     return True
 
 
-def build_executable():
-    """Constrói o executável usando PyInstaller."""
-    print("Iniciando build do executável...")
+def build_executable(perfil="onefile"):
+    """Constrói o executável usando PyInstaller com o perfil informado."""
+    print(f"Iniciando build do executável (perfil {perfil})...")
 
     try:
         # Comando para build usando o arquivo .spec
-        cmd = [sys.executable, "-m", "PyInstaller", "build_exe.spec", "--clean"]
+        cmd = [sys.executable, "-m", "PyInstaller", PERFIS[perfil]["spec"], "--clean"]
 
         print("Executando comando:", " ".join(cmd))
         result = subprocess.run(cmd, capture_output=True, text=True)
 
         if result.returncode == 0:
             print("✓ Executável criado com sucesso!")
-            print("Localização: dist/ExtractorInvestidor10.exe")
+            print(f"Localização: {PERFIS[perfil]['artefato']}")
             return True
         else:
             print("✗ Erro durante o build:")
@@ -103,7 +113,60 @@ def build_executable():
         return False
 
 
-def create_release_package():
+def tamanho_artefato(caminho):
+    """
+    Calcula o tamanho em disco do artefato gerado.
+
+    Returns:
+        tuple: (total em bytes, quantidade de arquivos, tamanho por pacote de primeiro nível)
+    """
+    caminho = Path(caminho)
+    if caminho.is_file():
+        return caminho.stat().st_size, 1, {caminho.name: caminho.stat().st_size}
+
+    total = 0
+    arquivos = 0
+    por_pacote = {}
+    for arquivo in caminho.rglob("*"):
+        if not arquivo.is_file():
+            continue
+        tamanho = arquivo.stat().st_size
+        total += tamanho
+        arquivos += 1
+        relativo = arquivo.relative_to(caminho).parts
+        # No one-dir do PyInstaller 6 as bibliotecas ficam em _internal/<pacote>
+        pacote = relativo[1] if relativo[0] == "_internal" and len(relativo) > 1 else relativo[0]
+        por_pacote[pacote] = por_pacote.get(pacote, 0) + tamanho
+    return total, arquivos, por_pacote
+
+
+def registrar_build_info(perfil):
+    """Grava dist/build_info.json com o tamanho (descompactado) do artefato gerado."""
+    artefato = PERFIS[perfil]["artefato"]
+    if not artefato.exists():
+        return None
+
+    total, arquivos, por_pacote = tamanho_artefato(artefato)
+    maiores = sorted(por_pacote.items(), key=lambda item: -item[1])[:15]
+    info = {
+        "perfil": perfil,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "artefato": str(artefato),
+        "tamanho_bytes": total,
+        "tamanho_mb": round(total / (1024 * 1024), 1),
+        "arquivos": arquivos,
+        "maiores_itens": {nome: round(tamanho / (1024 * 1024), 2) for nome, tamanho in maiores},
+    }
+    ARQUIVO_BUILD_INFO.parent.mkdir(exist_ok=True)
+    with open(ARQUIVO_BUILD_INFO, 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=4)
+
+    print(f"✓ Tamanho do artefato: {info['tamanho_mb']} MB em {arquivos} arquivo(s) ({ARQUIVO_BUILD_INFO})")
+    return info
+
+
+def create_release_package(perfil="onefile"):
     """Cria um pacote de release com o executável e arquivos necessários."""
     release_dir = Path("release")
 
@@ -114,10 +177,13 @@ def create_release_package():
     # Cria novo diretório de release
     release_dir.mkdir()
 
-    # Copia executável
-    exe_path = Path("dist/ExtractorInvestidor10.exe")
-    if exe_path.exists():
-        shutil.copy2(exe_path, release_dir / "ExtractorInvestidor10.exe")
+    # Copia executável (ou o diretório inteiro no perfil one-dir)
+    artefato = PERFIS[perfil]["artefato"]
+    if artefato.is_dir():
+        shutil.copytree(artefato, release_dir / artefato.name)
+        print(f"✓ {artefato.name}/ copiado para release/")
+    elif artefato.exists():
+        shutil.copy2(artefato, release_dir / artefato.name)
         print("✓ Executável copiado para release/")
 
     # Copia arquivos importantes
@@ -145,6 +211,11 @@ def create_release_package():
 
 def main():
     """Função principal."""
+    parser = argparse.ArgumentParser(description="Gera o executável do Extrator Investidor10")
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="onefile",
+                        help="onefile: um único .exe (padrão); onedir: diretório enxuto, abre mais rápido")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("CRIADOR DE EXECUTÁVEL - EXTRATOR INVESTIDOR10")
     print("=" * 60)
@@ -172,21 +243,26 @@ def main():
     clean_build_dirs()
 
     # Constrói o executável
-    if not build_executable():
+    if not build_executable(args.perfil):
         return False
 
+    # Registra o tamanho do artefato para acompanhar o impacto das dependências
+    registrar_build_info(args.perfil)
+
     # Cria pacote de release
-    create_release_package()
+    create_release_package(args.perfil)
 
     print("\n" + "=" * 60)
     print("BUILD CONCLUÍDO COM SUCESSO!")
     print("=" * 60)
     print("O executável está disponível em:")
-    print("- dist/ExtractorInvestidor10.exe")
-    print("- release/ExtractorInvestidor10.exe (pacote completo)")
+    print(f"- {PERFIS[args.perfil]['artefato']}")
+    print(f"- release/{PERFIS[args.perfil]['artefato'].name} (pacote completo)")
     print("\nO pacote 'release/' contém tudo que você precisa para distribuir.")
     print("\n💡 Teste o executável antes de publicar:")
     print("   cd release && ExtractorInvestidor10.exe")
+    print("\n⏱️ Meça o tempo de abertura do artefato:")
+    print("   python -m benchmarks.bench_launch")
 
     return True
 
@@ -0,0 +1,110 @@
+"""
+Calendário de negociação da B3.
+
+Dias de pregão (dias úteis sem feriados da bolsa) e horário do pregão regular,
+usados pelo agendador para não extrair dados fora do mercado e para saber se
+os dados de um ticker podem ter mudado desde a última coleta.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+    FUSO_B3 = ZoneInfo("America/Sao_Paulo")
+except Exception:
+    # Sem zoneinfo/tzdata o horário local da máquina é usado
+    FUSO_B3 = None
+
+HORARIO_ABERTURA = time(10, 0)
+HORARIO_FECHAMENTO = time(18, 0)
+
+# Feriados de data fixa em que a B3 não abre (mês, dia)
+FERIADOS_FIXOS = [
+    (1, 1),    # Confraternização Universal
+    (4, 21),   # Tiradentes
+    (5, 1),    # Dia do Trabalho
+    (9, 7),    # Independência
+    (10, 12),  # Nossa Senhora Aparecida
+    (11, 2),   # Finados
+    (11, 15),  # Proclamação da República
+    (12, 24),  # Véspera de Natal
+    (12, 25),  # Natal
+    (12, 31),  # Último dia do ano
+]
+# Dia Nacional de Zumbi e da Consciência Negra (feriado nacional a partir de 2024)
+CONSCIENCIA_NEGRA = (11, 20)
+ANO_INICIO_CONSCIENCIA_NEGRA = 2024
+
+
+def agora_b3():
+    """Data e hora atuais no fuso da B3 (sem tzinfo, para comparação com datas salvas)."""
+    if FUSO_B3 is None:
+        return datetime.now()
+    return datetime.now(FUSO_B3).replace(tzinfo=None)
+
+
+def domingo_de_pascoa(ano):
+    """Data do domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+def feriados_b3(ano, extras=None):
+    """
+    Feriados da B3 no ano.
+
+    Args:
+        ano (int): Ano
+        extras (list): Datas adicionais ("AAAA-MM-DD" ou date), ex: feriados decretados
+
+    Returns:
+        set: Conjunto de datas sem pregão (além dos fins de semana)
+    """
+    feriados = {date(ano, mes, dia) for mes, dia in FERIADOS_FIXOS}
+    if ano >= ANO_INICIO_CONSCIENCIA_NEGRA:
+        feriados.add(date(ano, *CONSCIENCIA_NEGRA))
+
+    pascoa = domingo_de_pascoa(ano)
+    feriados.update({
+        pascoa - timedelta(days=48),  # Segunda-feira de Carnaval
+        pascoa - timedelta(days=47),  # Terça-feira de Carnaval
+        pascoa - timedelta(days=2),   # Sexta-feira Santa
+        pascoa + timedelta(days=60),  # Corpus Christi
+    })
+
+    for extra in extras or []:
+        data_extra = date.fromisoformat(extra) if isinstance(extra, str) else extra
+        if data_extra.year == ano:
+            feriados.add(data_extra)
+    return feriados
+
+
+def eh_dia_pregao(dia, extras=None):
+    """Indica se há pregão na data (dia útil que não é feriado da B3)."""
+    if isinstance(dia, datetime):
+        dia = dia.date()
+    return dia.weekday() < 5 and dia not in feriados_b3(dia.year, extras)
+
+
+def pregao_aberto(momento, extras=None):
+    """Indica se o pregão regular está aberto no momento informado (horário da B3)."""
+    return eh_dia_pregao(momento, extras) and HORARIO_ABERTURA <= momento.time() < HORARIO_FECHAMENTO
+
+
+def ultimo_fechamento(momento, extras=None):
+    """Data e hora do último fechamento de pregão até o momento informado."""
+    dia = momento.date()
+    if not (eh_dia_pregao(dia, extras) and momento.time() >= HORARIO_FECHAMENTO):
+        dia -= timedelta(days=1)
+        while not eh_dia_pregao(dia, extras):
+            dia -= timedelta(days=1)
+    return datetime.combine(dia, HORARIO_FECHAMENTO)
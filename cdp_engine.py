@@ -0,0 +1,197 @@
+"""
+Motor de extração que fala com o Chrome direto pelo WebSocket do DevTools.
+
+Com o Selenium, cada `driver.get` e cada `execute_script` é uma requisição
+HTTP ao chromedriver, que a repassa ao Chrome pelo protocolo DevTools (CDP).
+No modo `motor_extracao: "cdp"` o extrator abre a sua própria conexão
+WebSocket com a aba que o chromedriver já controla e envia os comandos CDP
+sem intermediário:
+
+- `Page.navigate` + o evento `Page.loadEventFired` no lugar do `driver.get`;
+- `Runtime.evaluate` com `returnByValue` no lugar do `execute_script`.
+
+O script das colunas é registrado uma única vez como função da página
+(`Page.addScriptToEvaluateOnNewDocument`), então cada ticker envia apenas a
+chamada com os argumentos, e não o script inteiro.
+
+O navegador continua sendo iniciado pelo Selenium, com o mesmo perfil
+(`chrome_profile`), e o login continua sendo feito na janela dele: o motor só
+se conecta à aba depois disso, pelo endereço de depuração que o chromedriver
+informa nas capacidades da sessão. A conexão usa o pacote `websocket-client`,
+que já é instalado como dependência do Selenium.
+"""
+
+import json
+import logging
+import time
+import urllib.request
+from collections import deque
+
+try:
+    import websocket
+except ImportError:  # websocket-client vem com o Selenium; sem ele o extrator segue com o Selenium
+    websocket = None
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_COMANDO_S = 30
+TIMEOUT_CARREGAMENTO_S = 30
+
+
+class ErroCDP(Exception):
+    """Erro devolvido pelo Chrome a um comando CDP ou exceção lançada pelo script avaliado."""
+
+
+def endereco_depuracao(driver):
+    """Endereço "host:porta" do DevTools do Chrome controlado pelo chromedriver."""
+    endereco = (driver.capabilities.get("goog:chromeOptions") or {}).get("debuggerAddress")
+    if not endereco:
+        raise ErroCDP("O chromedriver não informou o endereço de depuração do Chrome")
+    return endereco
+
+
+def url_websocket_da_aba(endereco, handle=None, timeout=TIMEOUT_COMANDO_S):
+    """
+    URL do WebSocket da aba do Chrome.
+
+    O handle de janela do chromedriver é o id do alvo CDP (versões antigas
+    usam o prefixo "CDwindow-"); sem correspondência, usa a primeira aba.
+    """
+    with urllib.request.urlopen(f"http://{endereco}/json/list", timeout=timeout) as resposta:
+        alvos = json.load(resposta)
+    paginas = [alvo for alvo in alvos if alvo.get("type") == "page" and alvo.get("webSocketDebuggerUrl")]
+    if not paginas:
+        raise ErroCDP(f"Nenhuma aba disponível para conexão em {endereco}")
+    if handle:
+        id_alvo = handle.replace("CDwindow-", "")
+        for pagina in paginas:
+            if pagina.get("id") == id_alvo:
+                return pagina["webSocketDebuggerUrl"]
+    return paginas[0]["webSocketDebuggerUrl"]
+
+
+def argumentos_js(args):
+    """Argumentos serializados como um array JavaScript."""
+    return json.dumps(list(args), ensure_ascii=False)
+
+
+class ConexaoCDP:
+    """Conexão WebSocket com uma aba: comandos síncronos por id e fila dos eventos recebidos."""
+
+    def __init__(self, url_ws, timeout=TIMEOUT_COMANDO_S, ao_enviar=None):
+        """
+        Args:
+            url_ws (str): webSocketDebuggerUrl da aba
+            timeout (float): Espera máxima pela resposta de cada comando
+            ao_enviar (callable): Chamado com o nome de cada comando enviado (métricas)
+        """
+        if websocket is None:
+            raise ImportError("O motor CDP precisa do pacote websocket-client (pip install websocket-client)")
+        # Sem o cabeçalho Origin: o Chrome recusa conexões de outras origens sem --remote-allow-origins
+        self.ws = websocket.create_connection(url_ws, timeout=timeout, suppress_origin=True)
+        self.timeout = timeout
+        self.ao_enviar = ao_enviar
+        self.eventos = deque()
+        self._ultimo_id = 0
+
+    def _receber(self, prazo, descricao):
+        restante = prazo - time.monotonic()
+        if restante <= 0:
+            raise TimeoutError(f"Sem resposta do Chrome para {descricao}")
+        self.ws.settimeout(restante)
+        try:
+            return json.loads(self.ws.recv())
+        except websocket.WebSocketTimeoutException:
+            raise TimeoutError(f"Sem resposta do Chrome para {descricao}") from None
+
+    def enviar(self, metodo, parametros=None, timeout=None):
+        """
+        Envia um comando e espera a resposta; os eventos que chegam antes dela vão para a fila.
+
+        Returns:
+            dict: Campo "result" da resposta
+        """
+        self._ultimo_id += 1
+        id_comando = self._ultimo_id
+        if self.ao_enviar:
+            self.ao_enviar(metodo)
+        self.ws.send(json.dumps({"id": id_comando, "method": metodo, "params": parametros or {}}))
+        prazo = time.monotonic() + (timeout or self.timeout)
+        while True:
+            mensagem = self._receber(prazo, metodo)
+            if mensagem.get("id") == id_comando:
+                if "error" in mensagem:
+                    raise ErroCDP(f"{metodo}: {mensagem['error'].get('message')}")
+                return mensagem.get("result", {})
+            if "method" in mensagem:
+                self.eventos.append(mensagem)
+
+    def aguardar_evento(self, metodo, timeout=None):
+        """Parâmetros do próximo evento `metodo` (os demais eventos são descartados)."""
+        while self.eventos:
+            evento = self.eventos.popleft()
+            if evento["method"] == metodo:
+                return evento.get("params", {})
+        prazo = time.monotonic() + (timeout or self.timeout)
+        while True:
+            mensagem = self._receber(prazo, metodo)
+            if mensagem.get("method") == metodo:
+                return mensagem.get("params", {})
+
+    def fechar(self):
+        try:
+            self.ws.close()
+        except Exception as e:
+            logger.debug(f"Erro ao fechar a conexão CDP: {e}")
+
+
+class MotorCDP:
+    """Navegação e avaliação de scripts em uma aba, direto pelo CDP."""
+
+    def __init__(self, conexao):
+        self.conexao = conexao
+        self.conexao.enviar("Page.enable")
+
+    @classmethod
+    def conectar(cls, driver, ao_enviar=None):
+        """Conecta à aba atual do navegador iniciado pelo Selenium (mesmo perfil e login)."""
+        url_ws = url_websocket_da_aba(endereco_depuracao(driver), driver.current_window_handle)
+        logger.info(f"Motor CDP conectado a {url_ws}")
+        return cls(ConexaoCDP(url_ws, ao_enviar=ao_enviar))
+
+    def registrar_funcao(self, nome, corpo):
+        """
+        Define `window.<nome>` com o corpo de um script no estilo do `execute_script`
+        (lê `arguments` e usa `return`) no documento atual e em todos os próximos.
+        """
+        definicao = f"window.{nome} = function() {{\n{corpo}\n}};"
+        self.conexao.enviar("Page.addScriptToEvaluateOnNewDocument", {"source": definicao})
+        self.avaliar(definicao)
+
+    def navegar(self, url, timeout=TIMEOUT_CARREGAMENTO_S):
+        """Abre `url` e espera o evento load, como o `driver.get`."""
+        self.conexao.eventos.clear()
+        resultado = self.conexao.enviar("Page.navigate", {"url": url})
+        if resultado.get("errorText"):
+            raise ErroCDP(f"Falha ao abrir {url}: {resultado['errorText']}")
+        self.conexao.aguardar_evento("Page.loadEventFired", timeout)
+
+    def avaliar(self, expressao):
+        """Avalia uma expressão na página e devolve o valor serializado (returnByValue)."""
+        resultado = self.conexao.enviar("Runtime.evaluate", {"expression": expressao, "returnByValue": True})
+        if "exceptionDetails" in resultado:
+            detalhes = resultado["exceptionDetails"]
+            descricao = (detalhes.get("exception") or {}).get("description") or detalhes.get("text")
+            raise ErroCDP(f"Erro no script: {descricao}")
+        return resultado.get("result", {}).get("value")
+
+    def chamar(self, nome, *args):
+        """Chama uma função registrada por `registrar_funcao` com os argumentos informados."""
+        return self.avaliar(f"window.{nome}.apply(null, {argumentos_js(args)})")
+
+    def executar_script(self, script, *args):
+        """Equivalente ao `driver.execute_script` (o corpo vira uma função chamada com os argumentos)."""
+        return self.avaliar(f"(function() {{\n{script}\n}}).apply(null, {argumentos_js(args)})")
+
+    def fechar(self):
+        self.conexao.fechar()
@@ -0,0 +1,432 @@
+"""
+Configuração da aplicação (config.json).
+
+Concentra em um único lugar os valores padrão, a validação e a normalização
+das configurações, que antes eram feitas de formas diferentes por `main.py`
+e pela interface. O arquivo é lido uma única vez enquanto não for modificado
+(memória por mtime/tamanho) e as gravações são atômicas, ignoradas quando o
+conteúdo não mudou e, na interface, agrupadas em uma única escrita.
+
+Também monta o plano de extração (`PlanoExtracao`) a partir das colunas
+personalizadas, para que o extrator não precise reclassificar as colunas a
+cada ticker.
+"""
+
+import json
+import logging
+import os
+import threading
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_CONFIG_PADRAO = "config.json"
+ATRASO_GRAVACAO_MS = 500
+
+TEMAS_VALIDOS = ("claro", "escuro")
+MOTORES_EXTRACAO = ("selenium", "cdp", "playwright")
+TIPOS_COLUNA = ("simples", "avancado", "rotulo")
+# Separa o indicador do ano/período em rótulos do histórico de indicadores ("Patrimônio|2024")
+SEPARADOR_ROTULO = "|"
+FORMATOS_EXCEL = ("Texto", "Número", "Moeda", "Porcentagem", "Decimal")
+FORMATOS_NUMERICOS = ("Número", "Moeda", "Porcentagem", "Decimal")
+
+# Campos sempre presentes: nome -> (tipo, valor padrão)
+CAMPOS_OBRIGATORIOS = {
+    "acoes": (list, []),
+    "colunas_personalizadas": (list, []),
+    "headless": (bool, True),
+    "tema": (str, "escuro"),
+    "mostrar_mensagem_inicial": (bool, True),
+}
+
+# Campos opcionais (ver "Chaves Opcionais" no README): validados apenas se presentes
+CAMPOS_OPCIONAIS = {
+    "base_url": str,
+    "indice_seletores": str,
+    "seletores_limite_falhas": int,
+    "seletores_intervalo_reprobe": int,
+    "agendamentos": list,
+    "feriados_extras": list,
+    "comparar_execucoes": bool,
+    "delta_colunas_variacao": list,
+    "snapshot_execucao": str,
+    "descoberta_urls": list,
+    "triagens": list,
+    "regras_formatacao": list,
+    "historico_indicadores": bool,
+    "arquivo_historico_indicadores": str,
+    "captura_rede": bool,
+    "captura_rede_endpoints": dict,
+    "dir_series": str,
+    "reciclar_apos_paginas": int,
+    "reciclar_rss_mb": int,
+    "abas_paralelas": int,
+    "motor_extracao": str,
+    "paginas_simultaneas": int,
+    "bloquear_recursos": list,
+}
+
+
+def config_padrao():
+    """Retorna uma cópia nova da configuração padrão."""
+    return {nome: (list(padrao) if isinstance(padrao, list) else padrao)
+            for nome, (_, padrao) in CAMPOS_OBRIGATORIOS.items()}
+
+
+def normalizar_ticker(ticker):
+    """Normaliza um ticker (sem espaços, maiúsculo). Retorna None para valores inválidos."""
+    if not isinstance(ticker, str):
+        return None
+    ticker = ticker.strip().upper()
+    return ticker or None
+
+
+def normalizar_rotulo(rotulo):
+    """
+    Normaliza um rótulo de indicador para comparação ("Número  de Cotistas" -> "numero de cotistas").
+
+    Ignora acentos, caixa e espaços repetidos, inclusive em volta do separador de ano.
+    """
+    if not isinstance(rotulo, str):
+        return ""
+    sem_acento = "".join(c for c in unicodedata.normalize("NFKD", rotulo) if not unicodedata.combining(c))
+    partes = (" ".join(parte.split()) for parte in sem_acento.casefold().split(SEPARADOR_ROTULO))
+    return SEPARADOR_ROTULO.join(partes)
+
+
+def normalizar_acoes(acoes):
+    """Normaliza a lista de tickers, removendo vazios e duplicados (mantém a ordem)."""
+    normalizadas = []
+    vistos = set()
+    for acao in acoes:
+        ticker = normalizar_ticker(acao)
+        if ticker and ticker not in vistos:
+            vistos.add(ticker)
+            normalizadas.append(ticker)
+    return normalizadas
+
+
+def normalizar_coluna(coluna):
+    """
+    Valida uma coluna personalizada e preenche os campos ausentes.
+
+    Returns:
+        dict | None: Coluna normalizada, ou None se não tiver nome
+    """
+    if not isinstance(coluna, dict):
+        return None
+    nome = coluna.get("nome")
+    if not isinstance(nome, str) or not nome.strip():
+        return None
+
+    normalizada = dict(coluna)
+    normalizada["nome"] = nome.strip()
+    if normalizada.get("tipo") not in TIPOS_COLUNA:
+        normalizada["tipo"] = "avancado"
+    for campo in ("classe_busca", "classe_retorno", "seletor_css", "rotulo"):
+        valor = normalizada.get(campo)
+        normalizada[campo] = valor.strip() if isinstance(valor, str) else ""
+    if normalizada.get("formato_excel") not in FORMATOS_EXCEL:
+        normalizada["formato_excel"] = "Texto"
+    return normalizada
+
+
+def normalizar_config(dados):
+    """
+    Valida e normaliza um dicionário de configuração.
+
+    Valores com tipo inválido são substituídos pelo padrão; chaves desconhecidas
+    são preservadas.
+
+    Returns:
+        tuple: (config normalizada, lista de avisos)
+    """
+    avisos = []
+    config = config_padrao()
+    config.update(dados)
+
+    for nome, (tipo, padrao) in CAMPOS_OBRIGATORIOS.items():
+        if not isinstance(config[nome], tipo):
+            avisos.append(f"'{nome}' inválido ({config[nome]!r}), usando o padrão")
+            config[nome] = list(padrao) if isinstance(padrao, list) else padrao
+
+    for nome, tipo in CAMPOS_OPCIONAIS.items():
+        if nome not in config:
+            continue
+        valor = config[nome]
+        # bool é subclasse de int, mas não é um valor válido para os campos inteiros
+        if not isinstance(valor, tipo) or (tipo is int and (isinstance(valor, bool) or valor < 1)):
+            avisos.append(f"'{nome}' inválido ({valor!r}), ignorado")
+            del config[nome]
+
+    if "motor_extracao" in config and config["motor_extracao"] not in MOTORES_EXTRACAO:
+        avisos.append(f"Motor de extração '{config['motor_extracao']}' desconhecido, usando 'selenium'")
+        del config["motor_extracao"]
+
+    if config["tema"] not in TEMAS_VALIDOS:
+        avisos.append(f"Tema '{config['tema']}' desconhecido, usando 'escuro'")
+        config["tema"] = "escuro"
+
+    acoes = normalizar_acoes(config["acoes"])
+    if len(acoes) != len(config["acoes"]):
+        avisos.append(f"{len(config['acoes']) - len(acoes)} ticker(s) vazio(s) ou duplicado(s) removido(s)")
+    config["acoes"] = acoes
+
+    colunas = []
+    nomes = set()
+    for coluna in config["colunas_personalizadas"]:
+        normalizada = normalizar_coluna(coluna)
+        if normalizada is None:
+            avisos.append(f"Coluna personalizada sem nome ignorada: {coluna!r}")
+        elif normalizada["nome"] in nomes:
+            avisos.append(f"Coluna personalizada duplicada ignorada: {normalizada['nome']}")
+        else:
+            nomes.add(normalizada["nome"])
+            colunas.append(normalizada)
+    config["colunas_personalizadas"] = colunas
+
+    if "listas" in config:
+        config["listas"] = normalizar_listas(config["listas"], nomes, avisos)
+
+    return config, avisos
+
+
+def normalizar_listas(listas, nomes_colunas, avisos):
+    """
+    Valida as listas nomeadas ("listas" no config.json).
+
+    Cada lista tem um nome, seus tickers e os nomes das colunas personalizadas
+    que ela usa (lista de colunas vazia ou ausente = todas as colunas).
+
+    Args:
+        listas (list): Valor bruto de "listas"
+        nomes_colunas (set): Nomes das colunas personalizadas válidas
+        avisos (list): Recebe os avisos de validação
+
+    Returns:
+        list: Listas normalizadas
+    """
+    if not isinstance(listas, list):
+        avisos.append(f"'listas' inválido ({listas!r}), ignorado")
+        return []
+
+    normalizadas = []
+    nomes = set()
+    for lista in listas:
+        nome = lista.get("nome") if isinstance(lista, dict) else None
+        if not isinstance(nome, str) or not nome.strip():
+            avisos.append(f"Lista sem nome ignorada: {lista!r}")
+            continue
+        nome = nome.strip()
+        if nome in nomes:
+            avisos.append(f"Lista duplicada ignorada: {nome}")
+            continue
+        nomes.add(nome)
+
+        acoes = lista.get("acoes", [])
+        colunas = lista.get("colunas", [])
+        colunas_validas = []
+        for coluna in colunas if isinstance(colunas, list) else []:
+            if isinstance(coluna, str) and coluna in nomes_colunas:
+                colunas_validas.append(coluna)
+            else:
+                avisos.append(f"Lista '{nome}': coluna '{coluna}' não existe em colunas_personalizadas")
+
+        normalizada = dict(lista)
+        normalizada.update({
+            "nome": nome,
+            "acoes": normalizar_acoes(acoes if isinstance(acoes, list) else []),
+            "colunas": list(dict.fromkeys(colunas_validas)),
+        })
+        normalizadas.append(normalizada)
+    return normalizadas
+
+
+def acoes_da_execucao(config):
+    """
+    Tickers visitados em uma execução: `acoes` mais os de todas as listas,
+    sem repetição (um ticker presente em várias listas é extraído uma única vez).
+    """
+    acoes = list(config.get("acoes", []))
+    for lista in config.get("listas", []):
+        acoes.extend(lista.get("acoes", []))
+    return normalizar_acoes(acoes)
+
+
+def colunas_da_execucao(config):
+    """
+    Colunas avaliadas em uma execução: a união das colunas usadas por `acoes`
+    (todas) e pelas listas, na ordem de `colunas_personalizadas`.
+    """
+    colunas = config.get("colunas_personalizadas", [])
+    listas = config.get("listas", [])
+    if config.get("acoes") or any(not lista.get("colunas") for lista in listas):
+        return list(colunas)
+    usadas = {nome for lista in listas for nome in lista["colunas"]}
+    return [col for col in colunas if col.get("nome") in usadas]
+
+
+class PlanoExtracao:
+    """
+    Colunas personalizadas pré-classificadas para a extração.
+
+    Atributos:
+        colunas (list): Todas as colunas, na ordem configurada
+        simples (list): Colunas do tipo "simples" (classe de busca/retorno)
+        avancadas (list): Colunas do tipo "avancado" (seletor CSS)
+        rotulos (list): Colunas do tipo "rotulo" (rótulo no mapa de indicadores da página)
+        seletores (list): Seletores CSS distintos das colunas avançadas e dos seletores
+            alternativos das colunas por rótulo, na ordem
+        pares_simples (list): Pares [classe_busca, classe_retorno] distintos das colunas simples
+        formatos (dict): Nome da coluna -> formato do Excel
+        nomes_por_seletor (dict): Seletor CSS -> nomes das colunas que o usam
+    """
+
+    def __init__(self, colunas):
+        self.colunas = list(colunas)
+        self.simples = [col for col in self.colunas if col.get("tipo") == "simples"]
+        self.avancadas = [col for col in self.colunas if col.get("tipo") not in ("simples", "rotulo")]
+        self.rotulos = [col for col in self.colunas if col.get("tipo") == "rotulo"]
+        self.seletores = list(dict.fromkeys(col["seletor_css"] for col in self.avancadas + self.rotulos
+                                            if col.get("seletor_css")))
+        self.pares_simples = [list(par) for par in dict.fromkeys(
+            (col["classe_busca"], col["classe_retorno"]) for col in self.simples
+            if col.get("classe_busca") and col.get("classe_retorno"))]
+        self.formatos = {col["nome"]: col.get("formato_excel", "Texto") for col in self.colunas}
+        self.nomes_por_seletor = {}
+        for col in self.avancadas:
+            if col.get("seletor_css"):
+                self.nomes_por_seletor.setdefault(col["seletor_css"], []).append(col["nome"])
+
+    def __bool__(self):
+        return bool(self.colunas)
+
+    def __len__(self):
+        return len(self.colunas)
+
+
+def montar_plano_extracao(colunas_personalizadas):
+    """Monta o plano de extração a partir das colunas personalizadas da configuração."""
+    colunas = [col for col in map(normalizar_coluna, colunas_personalizadas or []) if col is not None]
+    return PlanoExtracao(colunas)
+
+
+class ConfigStore:
+    """Leitura memorizada e gravação atômica de um arquivo de configuração."""
+
+    def __init__(self, caminho=ARQUIVO_CONFIG_PADRAO):
+        """
+        Args:
+            caminho (str): Arquivo JSON de configuração
+        """
+        self.caminho = caminho
+        self.config = None
+        self.avisos = []
+        self.erro_carregamento = None
+        # Função no estilo `tk.Misc.after(ms, func)` usada para agrupar gravações;
+        # sem agendador, as gravações são imediatas
+        self.agendador = None
+        self._assinatura = None
+        self._ultimo_conteudo = None
+        self._gravacao_agendada = False
+        self._lock = threading.Lock()
+
+    def _assinatura_arquivo(self):
+        try:
+            stat = os.stat(self.caminho)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def carregar(self):
+        """
+        Retorna a configuração, relendo o arquivo apenas se ele mudou desde a última leitura.
+
+        Arquivos ausentes resultam na configuração padrão. Arquivos ilegíveis também,
+        com a causa em `erro_carregamento` (o arquivo não é sobrescrito até a próxima gravação).
+        """
+        with self._lock:
+            assinatura = self._assinatura_arquivo()
+            if self.config is not None and assinatura == self._assinatura:
+                return self.config
+
+            self.erro_carregamento = None
+            self.avisos = []
+            dados = {}
+            if assinatura is not None:
+                try:
+                    with open(self.caminho, 'r', encoding='utf-8') as f:
+                        dados = json.load(f)
+                    if not isinstance(dados, dict):
+                        raise ValueError("O conteúdo do arquivo de configuração não é um dicionário válido.")
+                except (OSError, ValueError) as e:
+                    # json.JSONDecodeError é subclasse de ValueError
+                    self.erro_carregamento = str(e)
+                    logger.warning(f"Erro ao ler {self.caminho}: {e}. Usando configuração padrão.")
+                    dados = {}
+
+            self.config, self.avisos = normalizar_config(dados)
+            for aviso in self.avisos:
+                logger.info(f"Configuração: {aviso}")
+            self._assinatura = assinatura
+            self._ultimo_conteudo = None
+            return self.config
+
+    def salvar(self, imediato=False):
+        """
+        Grava a configuração atual.
+
+        Com um `agendador` definido e `imediato=False`, chamadas próximas resultam
+        em uma única gravação após ATRASO_GRAVACAO_MS.
+        """
+        if self.agendador is None or imediato:
+            self._gravacao_agendada = False
+            self._gravar()
+            return
+        if not self._gravacao_agendada:
+            self._gravacao_agendada = True
+            self.agendador(ATRASO_GRAVACAO_MS, self._gravar_agendado)
+
+    def descarregar(self):
+        """Executa imediatamente uma gravação agendada pendente (ex: ao fechar a aplicação)."""
+        if self._gravacao_agendada:
+            self._gravar_agendado()
+
+    def _gravar_agendado(self):
+        if not self._gravacao_agendada:
+            return
+        self._gravacao_agendada = False
+        try:
+            self._gravar()
+        except OSError as e:
+            logger.error(f"Erro ao salvar configurações em {self.caminho}: {e}")
+
+    def _gravar(self):
+        """Grava o arquivo de forma atômica, se o conteúdo mudou desde a última gravação."""
+        if self.config is None:
+            return
+        with self._lock:
+            conteudo = json.dumps(self.config, ensure_ascii=False, indent=4)
+            if conteudo == self._ultimo_conteudo and self._assinatura_arquivo() == self._assinatura:
+                return
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            temporario = f"{self.caminho}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                f.write(conteudo)
+            os.replace(temporario, self.caminho)
+            self._ultimo_conteudo = conteudo
+            self._assinatura = self._assinatura_arquivo()
+
+
+_stores = {}
+
+
+def obter_store(caminho=ARQUIVO_CONFIG_PADRAO):
+    """Retorna o ConfigStore compartilhado do arquivo (main e interface usam a mesma instância)."""
+    chave = os.path.abspath(caminho)
+    if chave not in _stores:
+        _stores[chave] = ConfigStore(caminho)
+    return _stores[chave]
@@ -3,9 +3,6 @@ from tkinter import messagebox, filedialog
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
 from datetime import datetime
 import xlsxwriter
@@ -16,14 +13,171 @@ import threading
 import time
 import logging
 import re
+from collections import deque
+from run_metrics import RunMetrics
+from selector_miss_index import SelectorMissIndex, ARQUIVO_INDICE_PADRAO, LIMITE_FALHAS_PADRAO, INTERVALO_REPROBE_PADRAO
+from delta import (SnapshotExecucao, calcular_delta, delta_para_linhas, resumo_delta, salvar_delta_json,
+                   ARQUIVO_SNAPSHOT_PADRAO, COLUNAS_VARIACAO_PADRAO)
+from config_store import (PlanoExtracao, montar_plano_extracao, acoes_da_execucao, colunas_da_execucao,
+                          normalizar_rotulo)
+from screener import tipar_dataframe, carregar_triagens, carregar_regras_formatacao
+from indicator_history import HistoricoIndicadores, MatrizIndicadores, ARQUIVO_HISTORICO_PADRAO, COLUNAS_LONGAS
+from network_capture import CapturaRede
+from series_store import SeriesStore, DIR_SERIES_PADRAO
+from browser_supervisor import SupervisorNavegador, erro_de_sessao
+from tab_pipeline import PipelineAbas
+from cdp_engine import MotorCDP
+from browser_backend import BackendSelenium
+from playwright_backend import BackendPlaywright, PAGINAS_SIMULTANEAS_PADRAO
 
 # Constantes
+BASE_URL = "https://investidor10.com.br"
 DEFAULT_WAIT_TIME = 10
+# No modo de abas, várias páginas carregam ao mesmo tempo: cada uma tem mais tempo para terminar
+TIMEOUT_CARREGAMENTO_ABA = 30
 MAX_RETRY_ATTEMPTS = 3
 RETRY_DELAY = 2
 WINDOW_SIZE = "1920,1080"
+# Nome da função da página com o script das colunas no motor CDP (ver cdp_engine.py)
+FUNCAO_COLUNAS_CDP = "__extratorColunas"
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
+# Extração em lote: um único execute_script por página para todas as colunas.
+# Colunas avançadas: primeiro elemento do seletor CSS (textContent).
+# Colunas simples: mesma semântica de find_elements(classe_busca) + find_element(classe_retorno).text,
+# ou seja, o primeiro texto visível não vazio entre os containers, na ordem do documento.
+# Colunas por rótulo: mapa rótulo -> valor montado em uma passada por #table-indicators
+# ("Vacância") e #indicators-history ("Patrimônio|2024", com o cabeçalho da coluna como ano).
+# A mesma passada devolve a tabela de histórico inteira (ver indicator_history.py).
+SCRIPT_COLUNAS_LOTE = """
+const seletores = arguments[0];
+const pares = arguments[1];
+const incluirIndicadores = arguments[2];
+const resultado = {seletores: {}, simples: [], indicadores: {}, historico: null};
+
+for (let i = 0; i < seletores.length; i++) {
+    try {
+        const elemento = document.querySelector(seletores[i]);
+        resultado.seletores[seletores[i]] = elemento ? elemento.textContent.trim() : 'N/A';
+    } catch (e) {
+        resultado.seletores[seletores[i]] = 'N/A';
+    }
+}
+
+for (let i = 0; i < pares.length; i++) {
+    let valor = 'N/A';
+    try {
+        const containers = document.querySelectorAll('.' + CSS.escape(pares[i][0]));
+        for (const container of containers) {
+            const filho = container.querySelector('.' + CSS.escape(pares[i][1]));
+            // Como o WebElement.text do Selenium: elementos não renderizados não têm texto
+            const texto = filho && filho.getClientRects().length ? (filho.innerText || '').trim() : '';
+            if (texto) {
+                valor = texto;
+                break;
+            }
+        }
+    } catch (e) {
+        valor = 'N/A';
+    }
+    resultado.simples.push(valor);
+}
+
+if (incluirIndicadores) {
+    const indicadores = resultado.indicadores;
+    document.querySelectorAll('#table-indicators .cell').forEach(function (celula) {
+        const nome = celula.querySelector('.name');
+        const valor = celula.querySelector('.desc .value') || celula.querySelector('.desc') || celula.querySelector('.value');
+        const rotulo = nome ? nome.textContent.trim() : '';
+        if (rotulo && valor && !(rotulo in indicadores)) {
+            indicadores[rotulo] = valor.textContent.trim();
+        }
+    });
+    document.querySelectorAll('#indicators-history table').forEach(function (tabela) {
+        const anos = Array.from(tabela.querySelectorAll('thead th')).map(function (th) { return th.textContent.trim(); });
+        const historico = resultado.historico || {periodos: anos.slice(1), linhas: []};
+        tabela.querySelectorAll('tbody tr').forEach(function (linha) {
+            const celulas = linha.querySelectorAll('td, th');
+            const rotulo = celulas.length ? celulas[0].textContent.trim() : '';
+            if (!rotulo) {
+                return;
+            }
+            if (!resultado.historico) {
+                historico.linhas.push([rotulo, Array.from(celulas).slice(1).map(function (td) { return td.textContent.trim(); })]);
+            }
+            for (let c = 1; c < celulas.length; c++) {
+                const chave = rotulo + '|' + (anos[c] || String(c));
+                if (!(chave in indicadores)) {
+                    indicadores[chave] = celulas[c].textContent.trim();
+                }
+            }
+        });
+        resultado.historico = historico;
+    });
+}
+
+return resultado;
+"""
+
+# Scripts das tabelas, no lugar de find_element(s) + WebElement.text: o texto visível de um
+# elemento (innerText), vazio para elementos não renderizados, como o `.text` do Selenium.
+# Texto de um elemento pelo seletor CSS, ou null se ele não existir ou não estiver renderizado.
+SCRIPT_TEXTO_ELEMENTO = """
+const elemento = document.querySelector(arguments[0]);
+return elemento && elemento.getClientRects().length ? (elemento.innerText || '').trim() : null;
+"""
+
+# Textos das células td de cada linha visível do seletor.
+SCRIPT_CELULAS_LINHAS = """
+const texto = el => el.getClientRects().length ? (el.innerText || '').trim() : '';
+return Array.from(document.querySelectorAll(arguments[0]))
+    .filter(linha => linha.getClientRects().length)
+    .map(linha => Array.from(linha.querySelectorAll('td'), texto));
+"""
+
+# Tabela inteira como lista de dicionários (cabeçalho -> texto), apenas com as linhas visíveis.
+# Tabela por id (arguments[0]), por seletor (arguments[1]) ou a primeira dos seletores comuns.
+SCRIPT_TABELA = """
+const texto = el => el.getClientRects().length ? (el.innerText || '').trim() : '';
+let tabela = null;
+if (arguments[0]) {
+    tabela = document.getElementById(arguments[0]);
+} else if (arguments[1]) {
+    tabela = document.querySelector(arguments[1]);
+} else {
+    for (const seletor of ['table', 'div.table', '.table-responsive table', '.dataTables_wrapper table', '#Ticker-tickers']) {
+        tabela = document.querySelector(seletor);
+        if (tabela) break;
+    }
+}
+if (!tabela) return [];
+
+let cabecalhos = Array.from(tabela.querySelectorAll('thead th'), texto).filter(t => t);
+if (!cabecalhos.length) {
+    const primeira = tabela.querySelector('tr:first-child');
+    if (primeira) {
+        const celulas = primeira.querySelectorAll('th');
+        cabecalhos = Array.from(celulas.length ? celulas : primeira.querySelectorAll('td'), texto).filter(t => t);
+    }
+}
+
+const corpo = tabela.querySelector('tbody');
+const linhas = corpo ? corpo.querySelectorAll('tr')
+    : tabela.querySelectorAll(cabecalhos.length ? 'tr:not(:first-child)' : 'tr');
+const resultado = [];
+for (const linha of linhas) {
+    if (!linha.getClientRects().length) continue;
+    const celulas = linha.querySelectorAll('td');
+    if (!celulas.length) continue;
+    const dados = {};
+    celulas.forEach((celula, i) => {
+        dados[i < cabecalhos.length ? cabecalhos[i] : 'Coluna ' + (i + 1)] = texto(celula);
+    });
+    resultado.push(dados);
+}
+return resultado;
+"""
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -46,16 +200,87 @@ class DataExtractor:
             cancelamento_event (threading.Event): Evento para controlar cancelamento
         """
         self.config = config
+        # Colunas pré-classificadas uma única vez (e não a cada ticker). Com listas
+        # nomeadas, cada ticker é visitado uma vez e a união das colunas é avaliada
+        # em cada página; os resultados são separados por lista na exportação.
+        self.plano = montar_plano_extracao(colunas_da_execucao(config))
+        self.acoes = acoes_da_execucao(config)
+        self.regras_formatacao = carregar_regras_formatacao(config)
+        self.capturar_historico = config.get("historico_indicadores", True)
+        # Ticker -> MatrizIndicadores da execução atual (aba "Historico Indicadores")
+        self.matrizes_indicadores = {}
+        self.captura_rede = self._criar_captura_rede(config)
+        # Ticker -> séries decodificadas das respostas JSON da página (ver network_capture.py)
+        self.series_capturadas = {}
         self.status_callback = status_callback or self._default_status_callback
         self.cancelamento_event = cancelamento_event or threading.Event()
         self.driver = None
+        # Operações de navegador usadas pela extração (ver browser_backend.py); no Selenium envolve `driver`
+        self.navegador = None
+        # Conexão direta com a aba pelo DevTools durante a extração das ações (`motor_extracao: "cdp"`)
+        self.motor_cdp = None
+        self.supervisor = SupervisorNavegador.de_config(config)
+        self.metrics = RunMetrics()
+        # Permite apontar o extrator para um servidor local (ex: benchmarks/servidor_local.py)
+        self.base_url = config.get("base_url", BASE_URL).rstrip("/")
+        self.miss_index = SelectorMissIndex(
+            caminho=config.get("indice_seletores", ARQUIVO_INDICE_PADRAO),
+            limite_falhas=config.get("seletores_limite_falhas", LIMITE_FALHAS_PADRAO),
+            intervalo_reprobe=config.get("seletores_intervalo_reprobe", INTERVALO_REPROBE_PADRAO),
+        )
+
+    @staticmethod
+    def _criar_captura_rede(config):
+        """Captura das respostas JSON da página, se habilitada (`captura_rede`)."""
+        if not config.get("captura_rede", False):
+            return None
+        if config.get("motor_extracao") == "playwright":
+            # A captura lê o log de performance do chromedriver
+            logger.info("Captura de rede não disponível com o Playwright")
+            return None
+        if config.get("abas_paralelas", 1) > 1:
+            # O log de performance é do navegador inteiro: as respostas das abas se misturariam
+            logger.info("Captura de rede não disponível no modo de abas")
+            return None
+        return CapturaRede(config.get("captura_rede_endpoints"))
 
     def _default_status_callback(self, msg, prog):
         """Callback padrão para status quando nenhum é fornecido."""
         logger.info(f"Status: {msg} (Progresso: {prog}%)")
 
     def setup_driver(self):
-        """Configura e inicia o WebDriver do Chrome."""
+        """Configura e inicia o WebDriver do Chrome, registrando o tempo da etapa."""
+        with self.metrics.etapa("setup_driver"):
+            return self._setup_driver()
+
+    @staticmethod
+    def _caminho_perfil():
+        """Diretório do perfil persistente do Chrome (login mantido entre execuções)."""
+        profile_path = os.path.join(os.getcwd(), "chrome_profile")
+        if not os.path.exists(profile_path):
+            os.makedirs(profile_path)
+        return profile_path
+
+    def _setup_playwright(self):
+        """Inicia o backend Playwright (ver playwright_backend.py) com o mesmo perfil do Selenium."""
+        self.status_callback("Iniciando navegador (Playwright)...", 10)
+        largura, altura = (int(medida) for medida in WINDOW_SIZE.split(","))
+        self.navegador = BackendPlaywright(
+            self._caminho_perfil(),
+            headless=self.config["headless"],
+            paginas=self.config.get("paginas_simultaneas", PAGINAS_SIMULTANEAS_PADRAO),
+            bloquear=self.config.get("bloquear_recursos"),
+            user_agent=USER_AGENT,
+            janela=(largura, altura),
+            argumentos=["--disable-blink-features=AutomationControlled"],
+        )
+        return self.navegador
+
+    def _setup_driver(self):
+        """Configura e inicia o navegador: WebDriver do Chrome ou, se configurado, o Playwright."""
+        if self.config.get("motor_extracao") == "playwright":
+            return self._setup_playwright()
+
         chrome_options = Options()
 
         # Configurações básicas
@@ -120,6 +345,9 @@ class DataExtractor:
         chrome_options.add_experimental_option('useAutomationExtension', False)
         chrome_options.add_argument(f'--user-agent={USER_AGENT}')
 
+        if self.captura_rede is not None:
+            CapturaRede.configurar_opcoes(chrome_options)
+
         # Configurações experimentais
         chrome_options.add_experimental_option("detach", False)
         chrome_options.add_experimental_option("prefs", {
@@ -129,10 +357,7 @@ class DataExtractor:
         })
 
         # Configuração do perfil
-        profile_path = os.path.join(os.getcwd(), "chrome_profile")
-        if not os.path.exists(profile_path):
-            os.makedirs(profile_path)
-        chrome_options.add_argument(f"user-data-dir={profile_path}")
+        chrome_options.add_argument(f"user-data-dir={self._caminho_perfil()}")
 
         self.status_callback("Iniciando navegador...", 10)
 
@@ -142,11 +367,13 @@ class DataExtractor:
             service.creation_flags = 0x08000000  # CREATE_NO_WINDOW para executáveis
 
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.metrics.instrumentar_driver(self.driver)
 
             # Scripts anti-detecção
             self._apply_anti_detection_scripts()
 
             self.driver.implicitly_wait(5)
+            self.navegador = BackendSelenium(self.driver)
             return self.driver
 
         except Exception as e:
@@ -158,8 +385,10 @@ class DataExtractor:
                 service = Service()
                 service.creation_flags = 0x08000000
                 self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                self.metrics.instrumentar_driver(self.driver)
                 self._apply_anti_detection_scripts()
                 self.driver.implicitly_wait(5)
+                self.navegador = BackendSelenium(self.driver)
                 return self.driver
             except Exception as e2:
                 logger.error(f"Fallback também falhou: {e2}")
@@ -175,17 +404,127 @@ class DataExtractor:
         except Exception as e:
             logger.warning(f"Erro ao aplicar scripts anti-detecção: {e}")
 
+    def preparar_execucao(self, config=None, acoes=None):
+        """
+        Prepara uma nova execução reaproveitando o navegador já aberto (usado pelo agendador).
+
+        Reinicia as métricas e recalcula o plano de extração.
+
+        Args:
+            config (dict): Nova configuração (None mantém a atual)
+            acoes (list): Tickers a extrair (None usa os da configuração)
+        """
+        if config is not None:
+            self.config = config
+            self.base_url = config.get("base_url", BASE_URL).rstrip("/")
+            self.plano = montar_plano_extracao(colunas_da_execucao(config))
+            self.regras_formatacao = carregar_regras_formatacao(config)
+            self.capturar_historico = config.get("historico_indicadores", True)
+            # O supervisor continua contando as páginas do navegador reaproveitado
+            self.supervisor.max_paginas = config.get("reciclar_apos_paginas", self.supervisor.max_paginas)
+            self.supervisor.max_rss_mb = config.get("reciclar_rss_mb", self.supervisor.max_rss_mb)
+            # O log de performance depende das opções do navegador: só muda em um navegador novo
+            if self.navegador is None:
+                self.captura_rede = self._criar_captura_rede(config)
+        self.acoes = acoes_da_execucao(self.config) if acoes is None else list(acoes)
+        self.matrizes_indicadores = {}
+        self.series_capturadas = {}
+        self.metrics = RunMetrics()
+        if self.driver is not None:
+            self.metrics.instrumentar_driver(self.driver)
+
+    def navegador_ativo(self):
+        """Indica se o navegador ainda responde (ex: não foi fechado manualmente)."""
+        return self.navegador is not None and self.navegador.ativo()
+
+    def _sessao_perdida(self, excecao):
+        """Indica se o erro veio de um navegador que não responde mais (erro de sessão ou sonda falhando)."""
+        return erro_de_sessao(excecao) or not self.navegador_ativo()
+
+    def _reciclar_navegador(self, motivo):
+        """
+        Fecha o navegador atual e abre um novo com o mesmo perfil (o login persiste no perfil).
+
+        Numa reciclagem preventiva os cookies também são copiados para o navegador novo,
+        para não perder os cookies de sessão, que não ficam gravados no perfil.
+
+        Returns:
+            bool: True se o novo navegador foi iniciado
+        """
+        with self.metrics.etapa("reciclagem_navegador"):
+            reconectar_cdp = self.motor_cdp is not None
+            self._desconectar_motor_cdp()
+            cookies = []
+            if self.navegador is not None:
+                if motivo != "sessao_perdida":
+                    try:
+                        cookies = self.navegador.cookies()
+                    except Exception as e:
+                        logger.debug(f"Cookies da sessão não copiados: {e}")
+                try:
+                    self.navegador.fechar()
+                except Exception as e:
+                    logger.debug(f"Erro ao fechar o navegador para reciclagem: {e}")
+            self.navegador = None
+            self.driver = None
+            self.supervisor.sessao_reiniciada(motivo)
+            try:
+                self._setup_driver()
+            except Exception as e:
+                logger.error(f"Erro ao reiniciar o navegador ({motivo}): {e}")
+                return False
+            if cookies:
+                try:
+                    self.navegador.adicionar_cookies(cookies)
+                except Exception as e:
+                    logger.debug(f"Erro ao restaurar os cookies da sessão: {e}")
+            if reconectar_cdp:
+                self._conectar_motor_cdp()
+            return True
+
+    def _conectar_motor_cdp(self):
+        """
+        Conecta o motor CDP à aba do navegador, se `motor_extracao` for "cdp".
+
+        Sem conexão (ex: websocket-client ausente ou porta de depuração inacessível),
+        a extração segue pelo Selenium.
+        """
+        if self.config.get("motor_extracao", "selenium") != "cdp" or self.driver is None:
+            return None
+        try:
+            self.motor_cdp = MotorCDP.conectar(
+                self.driver, ao_enviar=lambda metodo: self.metrics.contar_roundtrip(f"cdp:{metodo}"))
+            self.motor_cdp.registrar_funcao(FUNCAO_COLUNAS_CDP, SCRIPT_COLUNAS_LOTE)
+        except Exception as e:
+            logger.warning(f"Motor CDP indisponível, extraindo pelo Selenium: {e}")
+            self._desconectar_motor_cdp()
+        return self.motor_cdp
+
+    def _desconectar_motor_cdp(self):
+        if self.motor_cdp is not None:
+            self.motor_cdp.fechar()
+            self.motor_cdp = None
+
     def verificar_cancelamento(self):
         """Verifica se o cancelamento foi solicitado."""
         return self.cancelamento_event.is_set()
 
+    def _navegar(self, url):
+        """Abre a página no navegador (ou com `Page.navigate` no motor CDP) registrando o tempo de navegação."""
+        with self.metrics.etapa("navegacao"):
+            if self.motor_cdp is not None:
+                self.motor_cdp.navegar(url)
+            else:
+                self.navegador.navegar(url)
+
     def access_site_and_await_login(self):
         """Acessa o site Investidor10 e aguarda o login do usuário, se necessário."""
         self.status_callback("Acessando o site Investidor10...", 20)
-        self.driver.get("https://investidor10.com.br/")
-        if not self.config["headless"]:
-            messagebox.showinfo("Login Necessário",
-                              "Faça login no site Investidor10. Clique em OK quando estiver pronto para continuar com a extração.")
+        with self.metrics.etapa("login"):
+            self._navegar(f"{self.base_url}/")
+            if not self.config["headless"]:
+                messagebox.showinfo("Login Necessário",
+                                  "Faça login no site Investidor10. Clique em OK quando estiver pronto para continuar com a extração.")
         self.status_callback("Login confirmado, iniciando extrações...", 25)
 
     def extract_stock_data(self):
@@ -195,10 +534,14 @@ class DataExtractor:
         Returns:
             list: Lista de dicionários, cada um representando os dados de uma ação.
         """
+        with self.metrics.etapa("acoes"):
+            return self._extract_stock_data()
+
+    def _extract_stock_data(self):
+        """Laço de extração das ações configuradas (ver `extract_stock_data`)."""
         self.status_callback("Iniciando extração de dados de AÇÕES...", 30)
         dados_acoes = []
-        acoes = self.config["acoes"]
-        colunas_personalizadas = self.config["colunas_personalizadas"]
+        acoes = self.acoes
 
         if not acoes:
             self.status_callback("Nenhuma ação para processar na extração de ações.", 40)
@@ -208,6 +551,20 @@ class DataExtractor:
         progresso_por_acao = 30 / total_acoes if total_acoes > 0 else 0
         progresso_base_acoes = 30
 
+        if self.navegador.paginas_simultaneas > 1 and total_acoes > 1:
+            dados_acoes = self._extract_stock_data_paginas(acoes)
+            self.status_callback("Extração de dados de AÇÕES concluída.", 60)
+            return dados_acoes
+
+        # O modo de abas controla as janelas pelo WebDriver
+        abas = self.config.get("abas_paralelas", 1)
+        if abas > 1 and total_acoes > 1 and self.driver is not None:
+            dados_acoes = self._extract_stock_data_abas(acoes, min(abas, total_acoes))
+            self.metrics.extras["navegador"] = self.supervisor.estatisticas
+            self.status_callback("Extração de dados de AÇÕES concluída.", 60)
+            return dados_acoes
+
+        self._conectar_motor_cdp()
         for i, acao in enumerate(acoes):
             if self.verificar_cancelamento():
                 self.status_callback("Extração de ações cancelada pelo usuário.", 0)
@@ -216,23 +573,251 @@ class DataExtractor:
             progresso_atual = progresso_base_acoes + (i * progresso_por_acao)
             self.status_callback(f"Processando ação {acao} ({i+1}/{total_acoes})...", int(progresso_atual))
 
-            try:
-                url = f"https://investidor10.com.br/fiis/{acao}/"
-                self.driver.get(url)
-                WebDriverWait(self.driver, DEFAULT_WAIT_TIME).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
+            inicio_ticker = time.perf_counter()
+            # Uma sessão perdida no meio do ticker reinicia o navegador e repete o ticker uma vez
+            for tentativa in range(2):
+                etapa_ticker = "navegacao"
+                try:
+                    url = f"{self.base_url}/fiis/{acao}/"
+                    self._descartar_log_rede()
+                    self._navegar(url)
+                    etapa_ticker = "carregamento"
+                    if self.motor_cdp is None:
+                        # No motor CDP a navegação já esperou o evento load
+                        self.navegador.aguardar("body", DEFAULT_WAIT_TIME)
+                    etapa_ticker = "colunas"
+                    resultado_acao = {"Ticker": acao, "Origem": "Ação"}
+                    if self.plano:
+                        self.extrair_colunas_personalizadas_otimizado(self.plano, resultado_acao)
+                    self._coletar_series_rede(acao)
+                    dados_acoes.append(resultado_acao)
+                except Exception as e:
+                    if tentativa == 0 and self._sessao_perdida(e):
+                        logger.warning(f"Sessão do navegador perdida em {acao} ({etapa_ticker}), repetindo o ticker: {e}")
+                        self.status_callback(f"♻️ Navegador reiniciado, repetindo {acao}...", int(progresso_atual))
+                        if self._reciclar_navegador("sessao_perdida"):
+                            continue
+                    dados_acoes.append(self._linha_erro_acao(acao, etapa_ticker, e, time.perf_counter() - inicio_ticker,
+                                                             progresso_atual))
+                break
+            self.metrics.registrar_ticker(acao, time.perf_counter() - inicio_ticker)
+
+            # Reciclagem preventiva (páginas/memória), nunca depois do último ticker
+            motivo = self.supervisor.registrar_pagina(self.driver)
+            if motivo and i + 1 < total_acoes:
+                logger.info(f"Reciclando o navegador ({motivo}) após {acao}")
+                self._reciclar_navegador(motivo)
+
+        self._desconectar_motor_cdp()
+        self.metrics.extras["navegador"] = self.supervisor.estatisticas
+        self.status_callback("Extração de dados de AÇÕES concluída.", 60)
+        return dados_acoes
+
+    def _linha_erro_acao(self, acao, etapa, excecao, segundos, progresso):
+        """Registra a falha de um ticker e devolve a linha "Erro" correspondente."""
+        # Sem diálogo: a execução segue e as falhas são mostradas uma vez, no fim
+        erro = self.metrics.registrar_erro(acao, etapa, excecao, segundos)
+        logger.warning(f"Erro ao processar ação {acao} ({etapa}): {erro['tipo']}: {erro['mensagem']}")
+        self.status_callback(f"⚠️ Erro em {acao} ({etapa}): {erro['tipo']}", int(progresso))
+        return {"Ticker": acao, "Origem": "Ação", "Erro": f"{erro['tipo']}: {erro['mensagem']}"}
+
+    def _extract_stock_data_paginas(self, acoes):
+        """
+        Extração das ações em várias páginas simultâneas do backend (ver playwright_backend.py).
+
+        Cada página roda o script das colunas uma única vez e as linhas saem na ordem
+        de `acoes`. Os tickers são enviados em blocos que cabem no restante da sessão,
+        e o navegador é reciclado entre os blocos a cada `reciclar_apos_paginas`
+        páginas (a memória não é amostrada: os processos do Playwright não são filhos
+        do chromedriver). Os tickers que falharam por sessão perdida são repetidos
+        uma vez, em um navegador novo.
+        """
+        total_acoes = len(acoes)
+        urls = [f"{self.base_url}/fiis/{acao}/" for acao in acoes]
+        plano = self.plano
+        argumentos = (plano.seletores, plano.pares_simples, bool(plano.rotulos) or self.capturar_historico)
+        concluidos = []
+
+        def ao_concluir(indice):
+            concluidos.append(indice)
+            self.status_callback(f"Processando ações ({len(concluidos)}/{total_acoes})...",
+                                 int(30 + len(concluidos) * 30 / total_acoes))
+
+        def extrair(indices):
+            return self.navegador.extrair_paginas([urls[i] for i in indices], SCRIPT_COLUNAS_LOTE, *argumentos,
+                                                  cancelado=self.verificar_cancelamento, ao_concluir=ao_concluir)
+
+        self.status_callback(f"Processando ações em {self.navegador.paginas_simultaneas} páginas simultâneas...", 30)
+        with self.metrics.etapa("navegacao"):
+            resultados = [None] * total_acoes
+            pendentes = list(range(total_acoes))
+            while pendentes and not self.verificar_cancelamento():
+                restante = max(1, self.supervisor.max_paginas - self.supervisor.paginas_sessao)
+                bloco, pendentes = pendentes[:restante], pendentes[restante:]
+                motivo = None
+                for i, resultado in zip(bloco, extrair(bloco)):
+                    resultados[i] = resultado
+                    if resultado is not None:
+                        motivo = self.supervisor.registrar_pagina(None) or motivo
+                # Reciclagem preventiva entre os blocos, nunca depois do último
+                if motivo and pendentes and not self.verificar_cancelamento():
+                    logger.info(f"Reciclando o navegador ({motivo}) após {self.supervisor.paginas_sessao} páginas")
+                    if not self._reciclar_navegador(motivo):
+                        erro = RuntimeError("O navegador não pôde ser reiniciado")
+                        for i in pendentes:
+                            resultados[i] = (None, erro, 0.0)
+                        break
+
+            perdidos = [i for i, resultado in enumerate(resultados)
+                        if resultado is not None and resultado[1] is not None and erro_de_sessao(resultado[1])]
+            if perdidos and not self.verificar_cancelamento():
+                logger.warning(f"Sessão do navegador perdida, repetindo {len(perdidos)} ticker(s)")
+                self.status_callback(f"♻️ Navegador reiniciado, repetindo {len(perdidos)} ação(ões)...", 45)
+                if self._reciclar_navegador("sessao_perdida"):
+                    for i, resultado in zip(perdidos, extrair(perdidos)):
+                        resultados[i] = resultado
+
+        if self.verificar_cancelamento():
+            self.status_callback("Extração de ações cancelada pelo usuário.", 0)
+
+        dados_acoes = []
+        for acao, resultado in zip(acoes, resultados):
+            if resultado is None:  # Não visitado (cancelamento)
+                continue
+            valores, erro, segundos = resultado
+            if erro is not None:
+                dados_acoes.append(self._linha_erro_acao(acao, "pagina", erro, segundos, 60))
+            else:
                 resultado_acao = {"Ticker": acao, "Origem": "Ação"}
-                if colunas_personalizadas:
-                    self.extrair_colunas_personalizadas_otimizado(colunas_personalizadas, resultado_acao)
+                if plano:
+                    # O tempo do script não é medido à parte: a página inteira conta para o ticker
+                    self._aplicar_resultado_lote(plano, valores, resultado_acao, 0.0)
                 dados_acoes.append(resultado_acao)
-            except Exception as e:
-                messagebox.showwarning("Erro Ação", f"Erro ao processar ação {acao}: {str(e)}")
-                dados_acoes.append({"Ticker": acao, "Origem": "Ação", "Erro": str(e)})
+            self.metrics.registrar_ticker(acao, segundos)
 
-        self.status_callback("Extração de dados de AÇÕES concluída.", 60)
+        self.metrics.extras["navegador"] = {
+            "paginas_simultaneas": self.navegador.paginas_simultaneas,
+            "recursos_bloqueados": getattr(self.navegador, "recursos_bloqueados", 0),
+            "reciclagens": self.supervisor.estatisticas["reciclagens"],
+        }
         return dados_acoes
 
+    def _extract_stock_data_abas(self, acoes, quantidade_abas):
+        """
+        Extração das ações com várias abas do mesmo navegador (ver tab_pipeline.py).
+
+        Enquanto as colunas de uma aba são extraídas, os próximos tickers carregam
+        nas demais. As abas são atendidas em ordem, então os resultados saem na
+        ordem de `acoes`. Uma sessão perdida reinicia o navegador e repete os
+        tickers em andamento (uma vez cada); a reciclagem preventiva espera as
+        abas em andamento terminarem.
+        """
+        if self.captura_rede is not None:
+            # Só acontece num navegador reaproveitado de uma configuração sem abas (ver _criar_captura_rede)
+            logger.info("Captura de rede não disponível no modo de abas")
+            self.captura_rede = None
+
+        total_acoes = len(acoes)
+        resultados = [None] * total_acoes
+        pendentes = deque(enumerate(acoes))
+        em_andamento = deque()
+        repetidos = set()
+        reciclar_motivo = None
+        concluidos = 0
+        pipeline = PipelineAbas(self.driver, quantidade_abas).abrir()
+        livres = deque(pipeline.abas)
+
+        def abastecer():
+            while livres and pendentes and reciclar_motivo is None:
+                aba = livres.popleft()
+                indice, acao = pendentes.popleft()
+                em_andamento.append((indice, acao, aba, time.perf_counter()))
+                try:
+                    pipeline.iniciar(aba, f"{self.base_url}/fiis/{acao}/")
+                except Exception as e:
+                    # O ticker continua em andamento: a espera pela aba falha e cai no tratamento normal
+                    logger.debug(f"Falha ao iniciar o carregamento de {acao}: {e}")
+
+        try:
+            abastecer()
+            while em_andamento:
+                if self.verificar_cancelamento():
+                    self.status_callback("Extração de ações cancelada pelo usuário.", 0)
+                    break
+
+                indice, acao, aba, inicio_ticker = em_andamento.popleft()
+                progresso_atual = 30 + concluidos * 30 / total_acoes
+                self.status_callback(f"Processando ação {acao} ({concluidos + 1}/{total_acoes})...", int(progresso_atual))
+                etapa_ticker = "carregamento"
+                try:
+                    with self.metrics.etapa("navegacao"):
+                        pipeline.aguardar(aba, TIMEOUT_CARREGAMENTO_ABA)
+                    etapa_ticker = "colunas"
+                    resultado_acao = {"Ticker": acao, "Origem": "Ação"}
+                    if self.plano:
+                        self.extrair_colunas_personalizadas_otimizado(self.plano, resultado_acao)
+                    resultados[indice] = resultado_acao
+                except Exception as e:
+                    if indice not in repetidos and self._sessao_perdida(e):
+                        logger.warning(f"Sessão do navegador perdida em {acao} ({etapa_ticker}), repetindo as abas em andamento: {e}")
+                        self.status_callback(f"♻️ Navegador reiniciado, repetindo {acao}...", int(progresso_atual))
+                        em_voo = [(indice, acao)] + [(i, a) for i, a, _, _ in em_andamento]
+                        repetidos.update(i for i, _ in em_voo)
+                        if self._reciclar_navegador("sessao_perdida"):
+                            pendentes.extendleft(reversed(em_voo))
+                            em_andamento.clear()
+                            pipeline = PipelineAbas(self.driver, quantidade_abas).abrir()
+                            livres = deque(pipeline.abas)
+                            abastecer()
+                            continue
+                    resultados[indice] = self._linha_erro_acao(acao, etapa_ticker, e, time.perf_counter() - inicio_ticker,
+                                                               progresso_atual)
+
+                # Inclui o tempo em que a página carregou em paralelo com as anteriores
+                self.metrics.registrar_ticker(acao, time.perf_counter() - inicio_ticker)
+                concluidos += 1
+                livres.append(aba)
+
+                motivo = self.supervisor.registrar_pagina(self.driver)
+                if motivo and pendentes:
+                    reciclar_motivo = reciclar_motivo or motivo
+                if reciclar_motivo and not em_andamento:
+                    logger.info(f"Reciclando o navegador ({reciclar_motivo}) após {acao}")
+                    if self._reciclar_navegador(reciclar_motivo):
+                        pipeline = PipelineAbas(self.driver, quantidade_abas).abrir()
+                        livres = deque(pipeline.abas)
+                    reciclar_motivo = None
+                abastecer()
+        finally:
+            if self.driver is not None:
+                pipeline.fechar_extras()
+
+        return [resultado for resultado in resultados if resultado is not None]
+
+    def _descartar_log_rede(self):
+        """Esvazia o log de rede antes de navegar, para que só as respostas da próxima página sejam lidas."""
+        if self.captura_rede is None:
+            return
+        try:
+            self.captura_rede.descartar(self.driver)
+        except Exception as e:
+            logger.debug(f"Log de rede indisponível, captura desativada: {e}")
+            self.captura_rede = None
+
+    def _coletar_series_rede(self, acao):
+        """Decodifica as séries (dividendos, cotações) que a página carregou; nunca falha o ticker."""
+        if self.captura_rede is None:
+            return
+        inicio = time.perf_counter()
+        try:
+            series = self.captura_rede.coletar(self.driver)
+            if series:
+                self.series_capturadas[acao] = series
+        except Exception as e:
+            logger.debug(f"Erro ao capturar as séries de {acao}: {e}")
+        finally:
+            self.metrics.registrar_etapa("captura_rede", time.perf_counter() - inicio)
+
     def extract_portfolio_data(self):
         """
         Realiza a extração de dados para as carteiras configuradas.
@@ -242,6 +827,11 @@ class DataExtractor:
         Returns:
             list: Lista de dicionários, cada um representando os dados de uma carteira.
         """
+        with self.metrics.etapa("carteiras"):
+            return self._extract_portfolio_data()
+
+    def _extract_portfolio_data(self):
+        """Tentativas de extração da página de carteiras (ver `extract_portfolio_data`)."""
         if self.verificar_cancelamento():
             self.status_callback("Extração de carteiras cancelada pelo usuário.", 0)
             return []
@@ -250,12 +840,13 @@ class DataExtractor:
         dados_carteiras = []
 
         for tentativa in range(MAX_RETRY_ATTEMPTS):
+            self.metrics.extras["carteiras_tentativas"] = tentativa + 1
             try:
                 self.status_callback(f"Acessando página de carteiras (tentativa {tentativa + 1}/{MAX_RETRY_ATTEMPTS})...", 70)
 
                 # Navega para a página com retry
                 try:
-                    self.driver.get("https://investidor10.com.br/carteiras/resumo/")
+                    self._navegar(f"{self.base_url}/carteiras/resumo/")
                 except Exception as nav_error:
                     self.status_callback(f"Erro de navegação: {nav_error}", 70)
                     if tentativa < MAX_RETRY_ATTEMPTS - 1:
@@ -277,12 +868,11 @@ class DataExtractor:
                     #".table-responsive"
                 ]
 
-                elemento_encontrado = None
+                elemento_encontrado = False
                 for seletor in seletores_espera:
                     try:
-                        elemento_encontrado = WebDriverWait(self.driver, DEFAULT_WAIT_TIME).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, seletor))
-                        )
+                        self.navegador.aguardar(seletor, DEFAULT_WAIT_TIME)
+                        elemento_encontrado = True
                         break
                     except Exception as e:
                         logger.debug(f"Seletor {seletor} não encontrado: {e}")
@@ -306,7 +896,8 @@ class DataExtractor:
                 for i, estrategia in enumerate(estrategias):
                     try:
                         self.status_callback(f"Tentando estratégia de extração {i + 1}...", 82 + i)
-                        raw_data_carteiras = estrategia()
+                        with self.metrics.etapa(f"carteiras_estrategia_{i + 1}"):
+                            raw_data_carteiras = estrategia()
                         if raw_data_carteiras:
                             break
                     except Exception as e:
@@ -336,15 +927,13 @@ class DataExtractor:
 
                 if tentativa < MAX_RETRY_ATTEMPTS - 1:
                     # Tenta reinicializar o driver se necessário
-                    if "GetHandleVerifier" in error_msg or "chrome" in error_msg.lower():
-                        try:
-                            self.status_callback("Tentando reinicializar o navegador...", 76)
-                            self.cleanup()
-                            time.sleep(2)
-                            self.setup_driver()
-                            self.access_site_and_await_login()
-                        except Exception as reinit_error:
-                            logger.warning(f"Erro ao reinicializar driver: {reinit_error}")
+                    if self._sessao_perdida(e):
+                        self.status_callback("Tentando reinicializar o navegador...", 76)
+                        if self._reciclar_navegador("sessao_perdida"):
+                            try:
+                                self.access_site_and_await_login()
+                            except Exception as reinit_error:
+                                logger.warning(f"Erro ao reinicializar driver: {reinit_error}")
 
                     time.sleep(RETRY_DELAY)
                     continue
@@ -392,7 +981,7 @@ class DataExtractor:
             return [];
             """
 
-            resultado = self.driver.execute_script(script)
+            resultado = self.navegador.avaliar(script)
             return resultado if resultado else []
 
         except Exception as e:
@@ -403,96 +992,62 @@ class DataExtractor:
         """
         Otimiza a extração de múltiplas colunas personalizadas usando JavaScript
         e reduzindo o número de interações com o DOM
+
+        Args:
+            colunas_personalizadas (PlanoExtracao | list): Plano de extração ou lista de colunas
+            resultado_acao (dict): Dicionário do ticker que recebe os valores
         """
+        plano = colunas_personalizadas
+        if not isinstance(plano, PlanoExtracao):
+            plano = montar_plano_extracao(colunas_personalizadas)
+        colunas_personalizadas = plano.colunas
         try:
-            # Separar colunas por tipo para processamento em lote
-            colunas_simples = [col for col in colunas_personalizadas if col["tipo"] == "simples"]
-            colunas_avancadas = [col for col in colunas_personalizadas if col["tipo"] != "simples"]
-
-            # Processar colunas simples em lote
-            if colunas_simples:
-                classes_busca = set(col["classe_busca"] for col in colunas_simples if "classe_busca" in col)
-                elementos_por_classe = {}
-                for classe in classes_busca:
-                    elementos_por_classe[classe] = self.driver.find_elements(By.CLASS_NAME, classe)
-
-                for coluna in colunas_simples:
-                    try:
-                        valor = "N/A"
-                        if "classe_busca" in coluna and "classe_retorno" in coluna:
-                            elementos = elementos_por_classe.get(coluna["classe_busca"], [])
-                            if elementos:
-                                for elem in elementos:
-                                    try:
-                                        valor_elem = elem.find_element(By.CLASS_NAME, coluna["classe_retorno"]).text
-                                        if valor_elem:
-                                            valor = valor_elem
-                                            break
-                                    except:
-                                        continue
-                        resultado_acao[coluna["nome"]] = valor
-                    except Exception as e:
-                        logger.debug(f"Erro ao extrair coluna simples {coluna['nome']}: {e}")
-                        resultado_acao[coluna["nome"]] = "N/A"
-
-            # Processar colunas avançadas usando JavaScript quando possível
-            if colunas_avancadas:
-                seletores = [col["seletor_css"] for col in colunas_avancadas if col.get("seletor_css")]
-
-                if seletores:
-                    script = """
-                    const results = {};
-                    const seletores = arguments[0];
-
-                    for (let i = 0; i < seletores.length; i++) {
-                        try {
-                            const elemento = document.querySelector(seletores[i]);
-                            results[seletores[i]] = elemento ? elemento.textContent.trim() : 'N/A';
-                        } catch (e) {
-                            results[seletores[i]] = 'N/A';
-                        }
-                    }
-
-                    return results;
-                    """
-
-                    resultados_js = self.driver.execute_script(script, seletores)
+            seletores = plano.seletores
+            pares = plano.pares_simples
+            resultados_js = {"seletores": {}, "simples": [], "indicadores": {}}
+            tempo_por_item = 0.0
+
+            # Colunas simples, avançadas e por rótulo em um único round-trip (sem find_element por
+            # container, que esperaria o implicitly_wait em cada container sem a classe)
+            incluir_indicadores = bool(plano.rotulos) or self.capturar_historico
+            if seletores or pares or incluir_indicadores:
+                inicio_lote = time.perf_counter()
+                if self.motor_cdp is not None:
+                    resultados_js = self.motor_cdp.chamar(FUNCAO_COLUNAS_CDP, seletores, pares, incluir_indicadores)
+                else:
+                    resultados_js = self.navegador.avaliar(SCRIPT_COLUNAS_LOTE, seletores, pares, incluir_indicadores)
+                tempo_lote = time.perf_counter() - inicio_lote
+                self.metrics.registrar_etapa("script_colunas", tempo_lote)
+                tempo_por_item = tempo_lote / max(1, len(seletores) + len(pares) + len(plano.rotulos))
 
-                    for coluna in colunas_avancadas:
-                        if coluna.get("seletor_css") and coluna.get("seletor_css") in resultados_js:
-                            resultado_acao[coluna["nome"]] = resultados_js[coluna["seletor_css"]]
-                        else:
-                            try:
-                                if coluna.get("seletor_css"):
-                                    resultado_acao[coluna["nome"]] = self.extrair_seletor_complexo(coluna["seletor_css"])
-                                else:
-                                    resultado_acao[coluna["nome"]] = "N/A"
-                            except Exception as e:
-                                logger.debug(f"Erro ao extrair coluna avançada {coluna['nome']}: {e}")
-                                resultado_acao[coluna["nome"]] = "N/A"
+            self._aplicar_resultado_lote(plano, resultados_js, resultado_acao, tempo_por_item)
 
         except Exception as e:
+            if self._sessao_perdida(e):
+                # Coluna a coluna também falharia: o laço das ações reinicia o navegador e repete o ticker
+                raise
+            logger.debug(f"Extração em lote falhou, extraindo coluna a coluna: {e}")
             # Em caso de erro, extrair cada coluna individualmente
+            indicadores = None
             for coluna in colunas_personalizadas:
                 try:
                     valor = "N/A"
-                    if coluna["tipo"] == "simples":
+                    if coluna["tipo"] == "rotulo" and coluna.get("rotulo"):
+                        if indicadores is None:
+                            indicadores = self._mapa_indicadores(
+                                self.navegador.avaliar(SCRIPT_COLUNAS_LOTE, [], [], True)["indicadores"])
+                        valor = self._valor_por_rotulo(coluna, indicadores, {})
+                        if valor == "N/A" and coluna.get("seletor_css"):
+                            valor = self.extrair_seletor_complexo(coluna["seletor_css"], coluna["nome"])
+                    elif coluna["tipo"] == "simples":
                         if "classe_busca" in coluna and "classe_retorno" in coluna:
-                            elementos = self.driver.find_elements(By.CLASS_NAME, coluna["classe_busca"])
-                            if elementos:
-                                for elem in elementos:
-                                    try:
-                                        valor_elem = elem.find_element(By.CLASS_NAME, coluna["classe_retorno"]).text
-                                        if valor_elem:
-                                            valor = valor_elem
-                                            break
-                                    except:
-                                        continue
+                            par = [coluna["classe_busca"], coluna["classe_retorno"]]
+                            valor = self.navegador.avaliar(SCRIPT_COLUNAS_LOTE, [], [par])["simples"][0]
                         else:
                             valor = "Configuração de coluna simples incompleta"
                     else:
                         if coluna.get("seletor_css"):
-                            valor = self.extrair_seletor_complexo(coluna["seletor_css"])
+                            valor = self.extrair_seletor_complexo(coluna["seletor_css"], coluna["nome"])
                         else:
                             valor = "Seletor CSS não definido"
 
@@ -500,12 +1055,70 @@ class DataExtractor:
                 except Exception as e_col:
                     resultado_acao[coluna["nome"]] = f"Erro ao extrair coluna: {e_col}"
 
-    def extrair_seletor_complexo(self, seletor_css):
+    def _aplicar_resultado_lote(self, plano, resultados_js, resultado_acao, tempo_por_item):
+        """
+        Preenche as colunas do ticker com o resultado do SCRIPT_COLUNAS_LOTE de uma página.
+
+        Args:
+            plano (PlanoExtracao): Plano usado para montar os argumentos do script
+            resultados_js (dict): Retorno do script ({seletores, simples, indicadores, historico})
+            resultado_acao (dict): Dicionário do ticker que recebe os valores
+            tempo_por_item (float): Tempo do script atribuído a cada coluna nas métricas
+        """
+        if self.capturar_historico and resultados_js.get("historico") and resultado_acao.get("Ticker"):
+            self.matrizes_indicadores[resultado_acao["Ticker"]] = MatrizIndicadores.de_tabela(resultados_js["historico"])
+
+        valores_simples = {tuple(par): valor for par, valor in zip(plano.pares_simples, resultados_js["simples"])}
+        for coluna in plano.simples:
+            par = (coluna.get("classe_busca"), coluna.get("classe_retorno"))
+            resultado_acao[coluna["nome"]] = valores_simples.get(par, "N/A")
+            self.metrics.registrar_caminho_coluna(coluna["nome"], "js_lote", tempo_por_item)
+
+        valores_seletores = resultados_js["seletores"]
+        if plano.rotulos:
+            indicadores = self._mapa_indicadores(resultados_js.get("indicadores"))
+            for coluna in plano.rotulos:
+                resultado_acao[coluna["nome"]] = self._valor_por_rotulo(coluna, indicadores, valores_seletores)
+                self.metrics.registrar_caminho_coluna(coluna["nome"], "rotulo", tempo_por_item)
+
+        for coluna in plano.avancadas:
+            if coluna.get("seletor_css") and coluna.get("seletor_css") in valores_seletores:
+                resultado_acao[coluna["nome"]] = valores_seletores[coluna["seletor_css"]]
+                self.miss_index.registrar(coluna["seletor_css"], valores_seletores[coluna["seletor_css"]] != "N/A")
+                self.metrics.registrar_caminho_coluna(coluna["nome"], "js_lote", tempo_por_item)
+            else:
+                try:
+                    if coluna.get("seletor_css"):
+                        resultado_acao[coluna["nome"]] = self.extrair_seletor_complexo(coluna["seletor_css"], coluna["nome"])
+                    else:
+                        resultado_acao[coluna["nome"]] = "N/A"
+                except Exception as e:
+                    logger.debug(f"Erro ao extrair coluna avançada {coluna['nome']}: {e}")
+                    resultado_acao[coluna["nome"]] = "N/A"
+
+    @staticmethod
+    def _mapa_indicadores(indicadores):
+        """Indexa o mapa de indicadores da página pelo rótulo normalizado."""
+        return {normalizar_rotulo(rotulo): valor for rotulo, valor in (indicadores or {}).items()}
+
+    @staticmethod
+    def _valor_por_rotulo(coluna, indicadores, valores_seletores):
+        """
+        Valor de uma coluna por rótulo: busca no mapa de indicadores e, se o rótulo não
+        estiver na página, o seletor CSS alternativo (já resolvido no mesmo script).
+        """
+        valor = indicadores.get(normalizar_rotulo(coluna.get("rotulo")))
+        if valor:
+            return valor
+        return valores_seletores.get(coluna.get("seletor_css"), "N/A")
+
+    def extrair_seletor_complexo(self, seletor_css, nome_coluna=None):
         """
         Identifica e processa seletores complexos, particularmente aqueles relacionados a tabelas.
 
         Args:
             seletor_css (str): Seletor CSS para extrair dados
+            nome_coluna (str): Nome da coluna, usado para registrar o caminho nas métricas
 
         Returns:
             str: Valor extraído ou "N/A" se não encontrado
@@ -514,34 +1127,52 @@ class DataExtractor:
             logger.warning(f"Seletor CSS inválido: {seletor_css}")
             return "N/A"
 
+        nome_coluna = nome_coluna or seletor_css
+        if self.miss_index.deve_pular(seletor_css):
+            self.metrics.registrar_caminho_coluna(nome_coluna, "pulado_indice", 0.0)
+            return "N/A"
+
+        valor = self._extrair_seletor_complexo(seletor_css, nome_coluna)
+        self.miss_index.registrar(seletor_css, valor != "N/A")
+        return valor
+
+    def _extrair_seletor_complexo(self, seletor_css, nome_coluna):
+        """Cadeia de fallbacks de `extrair_seletor_complexo` (JS individual, espera CSS, tabela)."""
+        inicio = time.perf_counter()
         try:
-            script = f"""
-            try {{
-                const element = document.querySelector('{seletor_css.replace("'", "\\'")}');
+            script = """
+            try {
+                const element = document.querySelector(arguments[0]);
                 return element ? element.textContent.trim() : 'N/A';
-            }} catch (e) {{
+            } catch (e) {
                 return 'N/A';
-            }}
+            }
             """
-            resultado = self.driver.execute_script(script)
+            resultado = self.navegador.avaliar(script, seletor_css)
             if resultado and resultado != "N/A":
                 return resultado
         except Exception as e:
             logger.debug(f"Erro ao executar JavaScript para seletor {seletor_css}: {e}")
+        finally:
+            self.metrics.registrar_caminho_coluna(nome_coluna, "js_individual", time.perf_counter() - inicio)
 
+        inicio = time.perf_counter()
         try:
-            elemento = WebDriverWait(self.driver, 3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, seletor_css))
-            )
-            if elemento:
-                return elemento.text.strip() or "N/A"
+            self.navegador.aguardar(seletor_css, 3)
+            return self.navegador.avaliar(SCRIPT_TEXTO_ELEMENTO, seletor_css) or "N/A"
         except Exception as e:
             logger.debug(f"Erro ao encontrar elemento com seletor {seletor_css}: {e}")
+        finally:
+            self.metrics.registrar_caminho_coluna(nome_coluna, "espera_css", time.perf_counter() - inicio)
 
         # Processamento específico para seletores de tabela
         if ('tr' in seletor_css and 'td' in seletor_css) or \
            ('tr' in seletor_css and 'th' in seletor_css):
-            return self._processar_seletor_tabela(seletor_css)
+            inicio = time.perf_counter()
+            try:
+                return self._processar_seletor_tabela(seletor_css)
+            finally:
+                self.metrics.registrar_caminho_coluna(nome_coluna, "tabela", time.perf_counter() - inicio)
 
         return "N/A"
 
@@ -577,28 +1208,26 @@ class DataExtractor:
     def extrair_seletor_tr_visible_even(self, numero_linha, numero_coluna):
         """Função específica para tratar o seletor tr.visible-even:nth-child(X) > td:nth-child(Y)."""
         try:
-            xpath = f"//tbody/tr[{numero_linha}]/td[{numero_coluna}]"
+            # Equivalente CSS de //tbody/tr[X]/td[Y]
+            seletor = f"tbody > tr:nth-of-type({numero_linha}) > td:nth-of-type({numero_coluna})"
             try:
-                elemento = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, xpath))
-                )
-                if elemento.is_displayed():
-                    return elemento.text.strip() or "N/A"
+                self.navegador.aguardar(seletor, 5)
+                texto = self.navegador.avaliar(SCRIPT_TEXTO_ELEMENTO, seletor)
+                if texto is not None:
+                    return texto or "N/A"
             except:
                 pass
 
             try:
-                linhas = self.driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-                linhas_visiveis = [linha for linha in linhas if linha.is_displayed()]
+                linhas_visiveis = self.navegador.avaliar(SCRIPT_CELULAS_LINHAS, "table tbody tr")
                 linhas_pares = [linha for i, linha in enumerate(linhas_visiveis) if i % 2 == 1]
 
                 if len(linhas_pares) >= numero_linha // 2:
                     linha_index = (numero_linha // 2) - 1
                     if linha_index < len(linhas_pares):
-                        linha = linhas_pares[linha_index]
-                        celulas = linha.find_elements(By.TAG_NAME, "td")
+                        celulas = linhas_pares[linha_index]
                         if numero_coluna <= len(celulas):
-                            return celulas[numero_coluna-1].text.strip() or "N/A"
+                            return celulas[numero_coluna-1] or "N/A"
             except:
                 pass
 
@@ -610,15 +1239,13 @@ class DataExtractor:
     def extrair_celula_com_classe(self, linha, coluna, classe):
         """Extrai o texto de uma célula em uma linha com uma classe específica."""
         try:
-            linhas = self.driver.find_elements(By.CSS_SELECTOR, f"tr.{classe}")
-            linhas_visiveis = [l for l in linhas if l.is_displayed()]
+            linhas_visiveis = self.navegador.avaliar(SCRIPT_CELULAS_LINHAS, f"tr.{classe}")
 
             if len(linhas_visiveis) >= linha:
-                linha_alvo = linhas_visiveis[linha-1]
-                celulas = linha_alvo.find_elements(By.TAG_NAME, "td")
+                celulas = linhas_visiveis[linha-1]
 
                 if len(celulas) >= coluna:
-                    return celulas[coluna-1].text.strip() or "N/A"
+                    return celulas[coluna-1] or "N/A"
 
             return self.extrair_celula_tabela(linha-1, coluna-1)
 
@@ -628,16 +1255,15 @@ class DataExtractor:
     def extrair_celula_tabela(self, linha, coluna, id_tabela=None):
         """Extrai uma célula específica de uma tabela."""
         try:
-            seletor_xpath = f"//tbody/tr[{linha+1}]/td[{coluna+1}]"
+            # Equivalente CSS de //tbody/tr[linha+1]/td[coluna+1]
+            seletor = f"tbody > tr:nth-of-type({linha+1}) > td:nth-of-type({coluna+1})"
 
             if id_tabela:
-                seletor_xpath = f"//table[@id='{id_tabela}']{seletor_xpath}"
+                seletor = f'table[id="{id_tabela}"] {seletor}'
 
-            elemento = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, seletor_xpath))
-            )
+            self.navegador.aguardar(seletor, 5)
 
-            return elemento.text.strip()
+            return self.navegador.avaliar(SCRIPT_TEXTO_ELEMENTO, seletor) or ""
         except:
             try:
                 dados_tabela = self.extrair_dados_tabela(id_tabela)
@@ -652,97 +1278,16 @@ class DataExtractor:
             return "N/A"
 
     def extrair_dados_tabela(self, id_tabela=None, seletor_tabela=None):
-        """Extrai todos os dados de uma tabela com desempenho otimizado."""
-        return self._extrair_dados_tabela_selenium(id_tabela, seletor_tabela)
+        """
+        Extrai todos os dados de uma tabela em um único script (ver SCRIPT_TABELA).
 
-    def _extrair_dados_tabela_selenium(self, id_tabela=None, seletor_tabela=None):
-        """Método de fallback para extrair tabela usando Selenium puro."""
+        Returns:
+            list: Um dicionário por linha visível (cabeçalho -> texto)
+        """
         try:
-            # Localizar a tabela
-            tabela = None
-            if id_tabela:
-                tabela = self.driver.find_element(By.ID, id_tabela)
-            elif seletor_tabela:
-                tabela = self.driver.find_element(By.CSS_SELECTOR, seletor_tabela)
-            else:
-                seletores_comuns = [
-                    "table",
-                    "div.table",
-                    ".table-responsive table",
-                    ".dataTables_wrapper table",
-                    "#Ticker-tickers"
-                ]
-
-                for seletor in seletores_comuns:
-                    try:
-                        tabela = self.driver.find_element(By.CSS_SELECTOR, seletor)
-                        break
-                    except:
-                        continue
-
-                if tabela is None:
-                    try:
-                        tabela = self.driver.find_element(By.TAG_NAME, "table")
-                    except:
-                        return []
-
-            # Obter cabeçalhos
-            headers_text = []
-            try:
-                headers = tabela.find_elements(By.CSS_SELECTOR, "thead th")
-                if headers:
-                    headers_text = [h.text.strip() for h in headers if h.text.strip()]
-            except:
-                pass
-
-            if not headers_text:
-                try:
-                    primeira_linha = tabela.find_element(By.CSS_SELECTOR, "tr:first-child")
-                    headers = primeira_linha.find_elements(By.TAG_NAME, "th")
-                    if headers:
-                        headers_text = [h.text.strip() for h in headers if h.text.strip()]
-                    else:
-                        headers = primeira_linha.find_elements(By.TAG_NAME, "td")
-                        if headers:
-                            headers_text = [h.text.strip() for h in headers if h.text.strip()]
-                except:
-                    pass
-
-            # Obter linhas e dados
-            rows = []
-            try:
-                tbody = tabela.find_element(By.TAG_NAME, "tbody")
-                rows = tbody.find_elements(By.TAG_NAME, "tr")
-            except:
-                if headers_text:
-                    rows = tabela.find_elements(By.CSS_SELECTOR, "tr:not(:first-child)")
-                else:
-                    rows = tabela.find_elements(By.TAG_NAME, "tr")
-
-            rows = [row for row in rows if row.is_displayed()]
-
-            # Extrair dados
-            result = []
-            for row in rows:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if not cells:
-                    continue
-
-                row_data = {}
-                if headers_text:
-                    for i, cell in enumerate(cells):
-                        key = headers_text[i] if i < len(headers_text) else f"Coluna {i+1}"
-                        row_data[key] = cell.text.strip()
-                else:
-                    for i, cell in enumerate(cells):
-                        row_data[f"Coluna {i+1}"] = cell.text.strip()
-
-                result.append(row_data)
-
-            return result
-
+            return self.navegador.avaliar(SCRIPT_TABELA, id_tabela, seletor_tabela) or []
         except Exception as e:
-            logger.error(f"Erro no fallback de extração de tabela: {str(e)}")
+            logger.error(f"Erro na extração de tabela: {str(e)}")
             return []
 
     def export_to_excel(self, df_acoes, df_carteiras):
@@ -752,16 +1297,37 @@ class DataExtractor:
             return
 
         try:
-            # --- Salvamento Automático ---
-            # Cria o diretório 'Exports' se ele não existir
-            output_dir = 'Exports'
-            os.makedirs(output_dir, exist_ok=True)
-
-            # Gera o nome do arquivo dinâmico
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"FIIs_{timestamp}.xlsx"
-            filepath = os.path.join(output_dir, filename)
-            
+            abs_filepath = self.salvar_excel(df_acoes, df_carteiras)
+
+            # --- Mensagem de Confirmação ---
+            messagebox.showinfo("Exportação Concluída", f"Dados exportados para:\n{abs_filepath}")
+            return abs_filepath
+
+        except Exception as e:
+            messagebox.showerror("Erro de Exportação", f"Erro ao exportar os dados: {str(e)}")
+
+    def salvar_excel(self, df_acoes, df_carteiras, output_dir='Exports'):
+        """
+        Grava o Excel e o relatório da execução sem interação com o usuário.
+
+        Args:
+            df_acoes (pd.DataFrame): Dados das ações
+            df_carteiras (pd.DataFrame): Dados das carteiras
+            output_dir (str): Diretório de saída
+
+        Returns:
+            str: Caminho absoluto do arquivo gerado
+        """
+        # --- Salvamento Automático ---
+        # Cria o diretório de saída se ele não existir
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Gera o nome do arquivo dinâmico
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        filename = f"FIIs_{timestamp}.xlsx"
+        filepath = os.path.join(output_dir, filename)
+
+        with self.metrics.etapa("exportacao"):
             # --- Preparação dos Dados ---
             df_acoes_export = df_acoes.copy() if not df_acoes.empty else pd.DataFrame()
             df_carteiras_export = df_carteiras.copy() if not df_carteiras.empty else pd.DataFrame()
@@ -771,22 +1337,180 @@ class DataExtractor:
             if not df_carteiras_export.empty and "Origem" in df_carteiras_export.columns:
                 df_carteiras_export.drop(columns=["Origem"], inplace=True)
 
+            # --- Comparação com a execução anterior ---
+            delta, snapshot = self._calcular_delta(df_acoes_export)
+
             # --- Escrita no Excel ---
             with pd.ExcelWriter(filepath, engine='xlsxwriter') as writer:
-                if not df_acoes_export.empty:
-                    self._write_dataframe_to_excel_sheet(writer, df_acoes_export, 'Acoes')
+                abas_usadas = {'Acoes', 'Carteiras', 'Delta', 'Erros', 'Historico Indicadores'}
+                listas = self.config.get("listas", [])
+                df_acoes_geral = df_acoes_export
+                if listas and not df_acoes_export.empty:
+                    # A aba "Acoes" mantém apenas os tickers da lista geral
+                    df_acoes_geral = df_acoes_export[df_acoes_export["Ticker"].isin(self.config.get("acoes", []))]
+
+                if not df_acoes_geral.empty:
+                    self._write_dataframe_to_excel_sheet(writer, df_acoes_geral, 'Acoes')
+
+                for lista in listas:
+                    df_lista = self._filtrar_lista(df_acoes_export, lista)
+                    if not df_lista.empty:
+                        self._write_dataframe_to_excel_sheet(writer, df_lista, self._nome_aba(lista["nome"], abas_usadas))
+
+                self._escrever_triagens(writer, df_acoes_export, abas_usadas)
 
                 if not df_carteiras_export.empty:
                     self._write_dataframe_to_excel_sheet(writer, df_carteiras_export, 'Carteiras')
 
-            # --- Mensagem de Confirmação ---
-            abs_filepath = os.path.abspath(filepath)
-            messagebox.showinfo("Exportação Concluída")
+                linhas_historico = [linha for ticker, matriz in self.matrizes_indicadores.items()
+                                    for linha in matriz.linhas_longas(ticker)]
+                if linhas_historico:
+                    self._write_dataframe_to_excel_sheet(writer, pd.DataFrame(linhas_historico, columns=COLUNAS_LONGAS),
+                                                         'Historico Indicadores', formatos={"Valor": "Decimal"})
+
+                if self.metrics.erros:
+                    df_erros = pd.DataFrame(self.metrics.erros).rename(columns={
+                        "ticker": "Ticker", "etapa": "Etapa", "tipo": "Tipo", "mensagem": "Mensagem", "segundos": "Segundos"})
+                    # Segundos já são números: a coluna vai como está, mesmo sem nenhum tempo medido
+                    df_erros["Segundos"] = pd.to_numeric(df_erros["Segundos"], errors="coerce")
+                    self._write_dataframe_to_excel_sheet(writer, df_erros, 'Erros', formatos={"Segundos": "Decimal"})
+
+                if delta is not None:
+                    linhas_delta = delta_para_linhas(delta)
+                    if linhas_delta:
+                        self._write_dataframe_to_excel_sheet(writer, pd.DataFrame(linhas_delta), 'Delta',
+                                                             formatos={"Variação %": "Porcentagem"})
+
+            if delta is not None:
+                self._salvar_delta(delta, snapshot, filepath)
+            self._salvar_historico_indicadores()
+            self._salvar_series_capturadas()
 
+        # --- Relatório da Execução ---
+        self._salvar_relatorio_execucao(filepath)
+
+        return os.path.abspath(filepath)
+
+    def _calcular_delta(self, df_acoes):
+        """
+        Compara as ações exportadas com a execução anterior (ver delta.py).
+
+        Returns:
+            tuple: (delta, snapshot), ou (None, None) se a comparação estiver desativada ou falhar
+        """
+        if not self.config.get("comparar_execucoes", True) or df_acoes.empty or "Ticker" not in df_acoes.columns:
+            return None, None
+        try:
+            snapshot = SnapshotExecucao(self.config.get("snapshot_execucao", ARQUIVO_SNAPSHOT_PADRAO))
+            colunas_variacao = self.config.get("delta_colunas_variacao", COLUNAS_VARIACAO_PADRAO)
+            # Execução cancelada: os tickers sem linha não foram visitados, então nenhum conta como removido
+            solicitados = None if self.verificar_cancelamento() else self.acoes
+            delta = calcular_delta(snapshot, df_acoes.to_dict("records"), colunas_variacao, solicitados)
+            return delta, snapshot
         except Exception as e:
-            messagebox.showerror("Erro de Exportação", f"Erro ao exportar os dados: {str(e)}")
+            logger.warning(f"Erro ao comparar com a execução anterior: {e}")
+            return None, None
+
+    def _salvar_delta(self, delta, snapshot, filepath):
+        """Grava o JSON do delta ao lado do Excel e o snapshot para a próxima comparação."""
+        try:
+            resumo = resumo_delta(delta)
+            self.metrics.extras["delta"] = resumo
+            if delta["anterior"]["gerado_em"]:
+                caminho_delta = salvar_delta_json(delta, filepath)
+                logger.info(f"Delta em relação a {delta['anterior']['gerado_em']} salvo em {caminho_delta}")
+            snapshot.salvar(os.path.abspath(filepath))
+        except Exception as e:
+            logger.warning(f"Erro ao salvar o delta da execução: {e}")
+
+    def _salvar_historico_indicadores(self):
+        """Atualiza o histórico em disco com as matrizes de indicadores desta execução."""
+        if not self.matrizes_indicadores:
+            return
+        try:
+            historico = HistoricoIndicadores(self.config.get("arquivo_historico_indicadores", ARQUIVO_HISTORICO_PADRAO))
+            for ticker, matriz in self.matrizes_indicadores.items():
+                historico.registrar(ticker, matriz)
+            historico.salvar()
+        except Exception as e:
+            logger.warning(f"Erro ao salvar o histórico de indicadores: {e}")
+
+    def _salvar_series_capturadas(self):
+        """Acrescenta ao armazenamento de séries os pontos novos capturados nesta execução."""
+        if not self.series_capturadas:
+            return
+        try:
+            acrescentados = SeriesStore(self.config.get("dir_series", DIR_SERIES_PADRAO)).acrescentar_capturas(
+                self.series_capturadas)
+            self.metrics.extras["series_capturadas"] = {
+                "tickers": len(self.series_capturadas),
+                "pontos_novos": acrescentados,
+            }
+        except Exception as e:
+            logger.warning(f"Erro ao salvar as séries capturadas: {e}")
+
+    def _escrever_triagens(self, writer, df_acoes, abas_usadas):
+        """Escreve uma aba por triagem salva, com os fundos aprovados em ordem de ranking."""
+        triagens = carregar_triagens(self.config)
+        if not triagens or df_acoes.empty:
+            return
+        df_tipado = tipar_dataframe(df_acoes, self.plano.formatos)
+        resumo = {}
+        for triagem in triagens:
+            try:
+                df_triagem = triagem.resultado(df_acoes, df_tipado)
+            except Exception as e:
+                logger.warning(f"Triagem '{triagem.nome}' não aplicada: {e}")
+                continue
+            resumo[triagem.nome] = len(df_triagem)
+            if not df_triagem.empty:
+                formatos = dict(self.plano.formatos, **{"Posição": "Número"})
+                self._write_dataframe_to_excel_sheet(writer, df_triagem, self._nome_aba(f"Triagem {triagem.nome}", abas_usadas),
+                                                     formatos=formatos)
+        self.metrics.extras["triagens"] = resumo
+
+    @staticmethod
+    def _filtrar_lista(df_acoes, lista):
+        """Linhas e colunas de uma lista nomeada (Ticker, colunas da lista e Erro, se houver)."""
+        if df_acoes.empty:
+            return df_acoes
+        df_lista = df_acoes[df_acoes["Ticker"].isin(lista["acoes"])]
+        if lista.get("colunas"):
+            colunas = ["Ticker"] + [col for col in lista["colunas"] if col in df_lista.columns]
+            if "Erro" in df_lista.columns:
+                colunas.append("Erro")
+            df_lista = df_lista[colunas]
+        # Colunas vazias para todos os tickers da lista vêm de tickers de outras listas
+        return df_lista.dropna(axis=1, how='all')
+
+    @staticmethod
+    def _nome_aba(nome, abas_usadas):
+        """Nome de aba válido no Excel (sem []:*?/\\, até 31 caracteres e sem repetição)."""
+        base = re.sub(r'[\[\]:*?/\\]', '_', nome).strip("'")[:31] or "Lista"
+        candidato = base
+        sufixo = 2
+        while candidato.lower() in {aba.lower() for aba in abas_usadas}:
+            candidato = f"{base[:31 - len(str(sufixo)) - 1]}_{sufixo}"
+            sufixo += 1
+        abas_usadas.add(candidato)
+        return candidato
+
+    def _salvar_relatorio_execucao(self, filepath):
+        """Grava o relatório JSON de métricas ao lado do Excel e mostra o resumo na barra de status."""
+        try:
+            nomes_por_seletor = self.plano.nomes_por_seletor
+            seletores_ausentes = self.miss_index.seletores_ausentes()
+            for item in seletores_ausentes:
+                item["colunas"] = nomes_por_seletor.get(item["seletor"], [])
+            self.metrics.extras["seletores_ausentes"] = seletores_ausentes
+
+            caminho_relatorio = self.metrics.salvar_relatorio(filepath)
+            logger.info(f"Relatório da execução salvo em {caminho_relatorio}")
+            self.status_callback(self.metrics.resumo(), 100)
+        except Exception as e:
+            logger.warning(f"Erro ao salvar relatório da execução: {e}")
 
-    def _write_dataframe_to_excel_sheet(self, writer, df, sheet_name):
+    def _write_dataframe_to_excel_sheet(self, writer, df, sheet_name, formatos=None):
         """Escreve um DataFrame em uma aba específica do Excel com estilo de tabela e formatação condicional."""
         if df.empty:
             return
@@ -804,37 +1528,13 @@ class DataExtractor:
         format_percentage = workbook.add_format({'num_format': '0.00%', **align_props})
 
         # Formatos para Regras Condicionais
-        green_high_format = workbook.add_format({'bg_color': '#C00000', 'font_color': '#FFFFFF', **align_props}) # Vermelho, Letra Branca
-        red_low_format = workbook.add_format({'bg_color': '#228B22', 'font_color': '#FFFFFF', **align_props}) # Verde Claro, Letra Verde Escura
+        formato_ruim = workbook.add_format({'bg_color': '#C00000', 'font_color': '#FFFFFF', **align_props}) # Vermelho, Letra Branca
+        formato_bom = workbook.add_format({'bg_color': '#228B22', 'font_color': '#FFFFFF', **align_props}) # Verde, Letra Branca
 
-        coluna_configs = {col_conf["nome"]: col_conf for col_conf in self.config.get("colunas_personalizadas", [])}
-        df_processed = df.copy()
+        formatos_colunas = self.plano.formatos if formatos is None else formatos
 
         # --- 2. Processamento de Dados (Conversão para numérico) ---
-        for col_name in df_processed.columns:
-            col_conf = coluna_configs.get(col_name)
-            formato_excel = col_conf.get("formato_excel", "Texto") if col_conf else "Texto"
-
-            if formato_excel in ["Número", "Moeda", "Porcentagem", "Decimal"]:
-                original_series = df_processed[col_name].copy()
-                try:
-                    current_col_as_str = df_processed[col_name].astype(str)
-                    cleaned_col = current_col_as_str.str.replace('R$', '', regex=False).str.strip()
-                    cleaned_col = cleaned_col.str.replace('%', '', regex=False).str.strip()
-                    cleaned_col = cleaned_col.str.replace(r'\.(?=\d{3})', '', regex=True)
-                    cleaned_col = cleaned_col.str.replace(',', '.', regex=False)
-                
-                    numeric_series = pd.to_numeric(cleaned_col, errors='coerce')
-
-                    if formato_excel == "Porcentagem":
-                        df_processed[col_name] = numeric_series / 100.0
-                    else:
-                        df_processed[col_name] = numeric_series
-                
-                    if df_processed[col_name].isnull().all():
-                        df_processed[col_name] = original_series
-                except Exception:
-                    df_processed[col_name] = original_series
+        df_processed = tipar_dataframe(df, formatos_colunas)
 
         # --- 3. Escrita no Excel e Aplicação do Estilo de Tabela ---
         # Escreve os dados sem o cabeçalho do pandas, pois a tabela criará o seu próprio
@@ -854,7 +1554,8 @@ class DataExtractor:
             'style': 'Table Style Medium 15'
         })
 
-        # --- 4. Formatação de Colunas e Regras Condicionais ---
+        # --- 4. Formatação de Colunas ---
+        colunas_numericas = {}
         for col_num, column_title in enumerate(df_processed.columns):
             # Calcula a largura ideal baseada no conteúdo
             def calculate_column_width(column_title, column_data):
@@ -864,8 +1565,7 @@ class DataExtractor:
                 # Largura máxima do conteúdo da coluna
                 if not column_data.empty:
                     # Para colunas numéricas formatadas, considera o formato final
-                    col_conf = coluna_configs.get(column_title)
-                    formato_excel = col_conf.get("formato_excel", "Texto") if col_conf else "Texto"
+                    formato_excel = formatos_colunas.get(column_title, "Texto")
                     
                     if formato_excel == "Moeda":
                         # Considera o formato "R$ #,##0.00"
@@ -905,8 +1605,7 @@ class DataExtractor:
             worksheet.set_column(col_num, col_num, column_width)
 
             # Define o formato base da coluna (Moeda, %, etc.)
-            col_conf = coluna_configs.get(column_title)
-            formato_excel = col_conf.get("formato_excel", "Texto") if col_conf else "Texto"
+            formato_excel = formatos_colunas.get(column_title, "Texto")
             is_numeric_and_valid = pd.api.types.is_numeric_dtype(df_processed[column_title]) and not df_processed[column_title].isnull().all()
         
             cell_format = format_text
@@ -919,71 +1618,28 @@ class DataExtractor:
             # Aplica o formato base na coluna (começando da linha 2)
             worksheet.set_column(col_num, col_num, column_width, cell_format, {'level': 1})
 
-            # Define o range da coluna para as regras (excluindo o cabeçalho)
-            col_range = f'{xlsxwriter.utility.xl_col_to_name(col_num)}2:{xlsxwriter.utility.xl_col_to_name(col_num)}{num_rows + 1}'
-
-            # Aplica a regra para 'P/VP Atual'
-            if column_title == 'P/VP Atual' and is_numeric_and_valid:
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '<=', 'value': 1, 'format': red_low_format})
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '>', 'value': 1, 'format': green_high_format})
-
-            # Aplica as regras para 'DY ATUAL'
-            if column_title == 'DY ATUAL' and is_numeric_and_valid:
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '>', 'value': 0.01, 'format': red_low_format})
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '<', 'value': 0.01, 'format': green_high_format})
-
-            # Aplica a regra para 'DY (12M)'
-            if column_title == 'DY (12M)' and is_numeric_and_valid:
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '>=', 'value': 0.10, 'format': red_low_format})
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '<', 'value': 0.10, 'format': green_high_format})
-
-            # Aplica a regra para 'VALORIZAÇÃO 12M'
-            if column_title == 'VALORIZAÇÃO 12M' and is_numeric_and_valid:
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '>=', 'value': 0.10, 'format': red_low_format})
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '<', 'value': 0.10, 'format': green_high_format})
-
-            # Aplica a regra para 'Rentabilidade 1 mes'
-            if column_title == 'Rentabilidade 1 mes' and is_numeric_and_valid:
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '>=', 'value': 0.01, 'format': red_low_format})
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '<', 'value': 0.01, 'format': green_high_format})
-
-            # Aplica a regra para 'Rentabilidade 1 ano'
-            if column_title == 'Rentabilidade 1 ano' and is_numeric_and_valid:
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '>=', 'value': 0.10, 'format': red_low_format})
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '<', 'value': 0.10, 'format': green_high_format})
-
-            # Aplica a regra para 'Vacancia'
-            if column_title == 'Vacancia' and is_numeric_and_valid:
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '>=', 'value': 0.02, 'format': green_high_format})
-                worksheet.conditional_format(col_range, {'type': 'cell', 'criteria': '<', 'value': 0.02, 'format': red_low_format})
-
-            # Aplica a regra para 'DIVIDENDO EM 12M' comparando com 'Cotacao'
-            if column_title == 'DIVIDENDO EM 12M' and is_numeric_and_valid:
-                if 'Cotacao' in df_processed.columns:
-                    # Encontra o índice da coluna 'Cotacao'
-                    cotacao_col_num = df_processed.columns.get_loc('Cotacao')
-                    cotacao_col_letter = xlsxwriter.utility.xl_col_to_name(cotacao_col_num)
-                    
-                    for row_num in range(2, num_rows + 2):  # Começa da linha 2 (primeira linha de dados)
-                        cell_range = f'{xlsxwriter.utility.xl_col_to_name(col_num)}{row_num}'
-                        formula = f'={xlsxwriter.utility.xl_col_to_name(col_num)}{row_num}<={cotacao_col_letter}{row_num}*0.1'
-                        
-                        worksheet.conditional_format(cell_range, {
-                            'type': 'formula',
-                            'criteria': formula,
-                            'format': green_high_format
-                        })
-                        
-                        formula_else = f'={xlsxwriter.utility.xl_col_to_name(col_num)}{row_num}>{cotacao_col_letter}{row_num}*0.1'
-                        worksheet.conditional_format(cell_range, {
-                            'type': 'formula',
-                            'criteria': formula_else,
-                            'format': red_low_format
-                        })
-
+            if is_numeric_and_valid:
+                colunas_numericas[column_title] = xlsxwriter.utility.xl_col_to_name(col_num)
+
+        # --- 5. Formatação condicional (regras declarativas, ver screener.py) ---
+        # Uma regra por coluna inteira: as fórmulas são relativas à primeira linha de dados
+        for regra in self.regras_formatacao:
+            if regra.coluna not in colunas_numericas:
+                continue
+            formulas = regra.formulas_excel(colunas_numericas, 2)
+            if formulas is None:
+                continue
+            letra = colunas_numericas[regra.coluna]
+            col_range = f'{letra}2:{letra}{num_rows + 1}'
+            formula_bom, formula_ruim = formulas
+            worksheet.conditional_format(col_range, {'type': 'formula', 'criteria': formula_bom, 'format': formato_bom})
+            worksheet.conditional_format(col_range, {'type': 'formula', 'criteria': formula_ruim, 'format': formato_ruim})
 
     def cleanup(self):
         """Limpa recursos do extrator."""
-        if self.driver:
-            self.driver.quit()
+        self.miss_index.salvar()
+        self._desconectar_motor_cdp()
+        if self.navegador:
+            self.navegador.fechar()
+            self.navegador = None
             self.driver = None
\ No newline at end of file
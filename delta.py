@@ -0,0 +1,188 @@
+"""
+Detecção de mudanças entre execuções consecutivas.
+
+Cada exportação guarda um snapshot com os valores e um hash por ticker. Na
+execução seguinte, apenas os tickers cujo hash mudou são comparados coluna a
+coluna, o que mantém a comparação barata mesmo com milhares de tickers. O
+resultado (valores alterados, tickers novos e removidos e a variação
+percentual das colunas de preço/rendimento) vira a aba "Delta" do Excel e um
+JSON ao lado do arquivo exportado.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+from formatos import variacao_percentual
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_SNAPSHOT_PADRAO = os.path.join("cache", "ultima_execucao.json")
+# Colunas cuja variação percentual é calculada (comparação por trecho do nome, sem diferenciar maiúsculas)
+COLUNAS_VARIACAO_PADRAO = ["Cotacao", "DY", "P/VP"]
+COLUNAS_IGNORADAS = {"Ticker", "Origem", "Erro"}
+
+
+def hash_linha(valores):
+    """Hash estável dos valores de um ticker (independe da ordem das colunas)."""
+    conteudo = json.dumps(valores, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()
+
+
+def _valores(linha):
+    """Valores comparáveis de uma linha (sem colunas de controle e sem ausentes/NaN)."""
+    return {coluna: valor for coluna, valor in linha.items()
+            if coluna not in COLUNAS_IGNORADAS and valor is not None and valor == valor}
+
+
+class SnapshotExecucao:
+    """Valores e hashes por ticker da última execução exportada."""
+
+    def __init__(self, caminho=ARQUIVO_SNAPSHOT_PADRAO):
+        self.caminho = caminho
+        self.gerado_em = None
+        self.arquivo_excel = None
+        self.tickers = {}
+        self.carregar()
+
+    def carregar(self):
+        if not self.caminho or not os.path.exists(self.caminho):
+            return
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            self.gerado_em = dados.get("gerado_em")
+            self.arquivo_excel = dados.get("arquivo_excel")
+            self.tickers = dados.get("tickers", {})
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Snapshot da execução anterior ignorado ({self.caminho}): {e}")
+
+    def salvar(self, arquivo_excel=None):
+        """Persiste o snapshot de forma atômica."""
+        if not self.caminho:
+            return
+        self.gerado_em = datetime.now().isoformat(timespec="seconds")
+        self.arquivo_excel = arquivo_excel
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({"gerado_em": self.gerado_em, "arquivo_excel": self.arquivo_excel, "tickers": self.tickers},
+                      f, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+
+def calcular_delta(snapshot, linhas, colunas_variacao=None, solicitados=None):
+    """
+    Compara as linhas da execução atual com o snapshot e atualiza o snapshot.
+
+    Tickers com erro na execução atual não são comparados e mantêm os valores
+    anteriores no snapshot (não contam como removidos). Só conta como removido
+    um ticker solicitado nesta execução que ficou sem linha; os tickers que a
+    execução não visitou (regra do agendador restrita a algumas listas,
+    execução cancelada) continuam no snapshot como estavam.
+
+    Args:
+        snapshot (SnapshotExecucao): Snapshot da execução anterior (atualizado no lugar)
+        linhas (list): Linhas da execução atual (dicionários com "Ticker")
+        colunas_variacao (list): Trechos de nomes de colunas com variação percentual
+        solicitados (iterable): Tickers que a execução deveria visitar (None: apenas os das linhas)
+
+    Returns:
+        dict: {"anterior", "novos", "removidos", "alterados", "sem_alteracao"}
+    """
+    colunas_variacao = [c.lower() for c in (colunas_variacao or COLUNAS_VARIACAO_PADRAO)]
+    anteriores = snapshot.tickers
+    delta = {
+        "anterior": {"gerado_em": snapshot.gerado_em, "arquivo_excel": snapshot.arquivo_excel},
+        "novos": [],
+        "removidos": [],
+        "alterados": [],
+        "sem_alteracao": 0,
+    }
+    primeira_execucao = not anteriores
+    atuais = {}
+
+    for linha in linhas:
+        ticker = linha.get("Ticker")
+        if not ticker:
+            continue
+        # Em DataFrames, a coluna "Erro" vem como NaN nas linhas sem erro
+        if isinstance(linha.get("Erro"), str) and linha["Erro"]:
+            if ticker in anteriores:
+                atuais[ticker] = anteriores[ticker]
+            continue
+
+        valores = _valores(linha)
+        entrada = {"hash": hash_linha(valores), "valores": valores}
+        atuais[ticker] = entrada
+        anterior = anteriores.get(ticker)
+
+        if anterior is None:
+            if not primeira_execucao:
+                delta["novos"].append(ticker)
+            continue
+        if anterior["hash"] == entrada["hash"]:
+            delta["sem_alteracao"] += 1
+            continue
+
+        valores_anteriores = anterior.get("valores", {})
+        for coluna in sorted(set(valores_anteriores) | set(valores)):
+            antes = valores_anteriores.get(coluna)
+            depois = valores.get(coluna)
+            if antes == depois:
+                continue
+            alteracao = {"Ticker": ticker, "Coluna": coluna, "Anterior": antes, "Atual": depois}
+            if any(trecho in coluna.lower() for trecho in colunas_variacao):
+                variacao = variacao_percentual(antes, depois)
+                alteracao["Variacao_%"] = round(variacao, 2) if variacao is not None else None
+            delta["alterados"].append(alteracao)
+
+    solicitados = set(atuais) if solicitados is None else set(solicitados) | set(atuais)
+    delta["removidos"] = sorted(set(anteriores) & solicitados - set(atuais))
+    for ticker, entrada in anteriores.items():
+        if ticker not in solicitados:
+            atuais[ticker] = entrada
+    snapshot.tickers = atuais
+    return delta
+
+
+def delta_para_linhas(delta):
+    """
+    Linhas da aba "Delta" do Excel (uma por alteração, ticker novo ou removido).
+
+    A "Variação %" vai como fração (5,25% -> 0.0525), pronta para o formato de porcentagem do Excel.
+    """
+    linhas = [{"Ticker": t, "Tipo": "Novo", "Coluna": "", "Anterior": "", "Atual": "", "Variação %": None}
+              for t in delta["novos"]]
+    linhas += [{"Ticker": t, "Tipo": "Removido", "Coluna": "", "Anterior": "", "Atual": "", "Variação %": None}
+               for t in delta["removidos"]]
+    linhas += [{"Ticker": a["Ticker"], "Tipo": "Alterado", "Coluna": a["Coluna"],
+                "Anterior": "" if a["Anterior"] is None else str(a["Anterior"]),
+                "Atual": "" if a["Atual"] is None else str(a["Atual"]),
+                "Variação %": a["Variacao_%"] / 100 if a.get("Variacao_%") is not None else None}
+               for a in delta["alterados"]]
+    return linhas
+
+
+def resumo_delta(delta):
+    """Contagens para o relatório da execução e a barra de status."""
+    return {
+        "alterados": len({a["Ticker"] for a in delta["alterados"]}),
+        "valores_alterados": len(delta["alterados"]),
+        "novos": len(delta["novos"]),
+        "removidos": len(delta["removidos"]),
+        "sem_alteracao": delta["sem_alteracao"],
+    }
+
+
+def salvar_delta_json(delta, caminho_excel):
+    """Grava o delta em `<arquivo>_delta.json` ao lado do Excel exportado."""
+    base, _ = os.path.splitext(caminho_excel)
+    caminho = f"{base}_delta.json"
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({"resumo": resumo_delta(delta), **delta}, f, ensure_ascii=False, indent=4, default=str)
+    return caminho
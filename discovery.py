@@ -0,0 +1,330 @@
+"""
+Descoberta do universo de FIIs a partir das páginas de listagem do site.
+
+Em vez de digitar os tickers um a um, a descoberta percorre a listagem (ou
+ranking) de FIIs do Investidor10 — ou cópias salvas dessas páginas — e coleta
+todos os fundos com os atributos básicos exibidos na tabela (nome, segmento,
+tipo, cotação...). As páginas são buscadas em paralelo e com cache pelo
+`BuscadorHttp`, então o universo completo (~500 fundos) sai em poucos segundos.
+
+O universo fica salvo em `cache/universo_fiis.json` e pode ser filtrado para
+criar listas nomeadas no config.json, ex: "todos os FIIs de Papéis".
+
+Uso pela linha de comando:
+    python discovery.py                                        # atualiza o universo
+    python discovery.py --filtro "Segmento=Papéis"             # lista os fundos do segmento
+    python discovery.py --filtro "Segmento=Papéis" --lista Papel   # cria/atualiza a lista "Papel"
+    python discovery.py --atualizar-listas                     # reaplica os filtros salvos nas listas
+    python discovery.py --snapshot paginas_salvas/             # usa páginas HTML salvas
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import urllib.parse
+from datetime import datetime
+from html.parser import HTMLParser
+
+from config_store import obter_store, ARQUIVO_CONFIG_PADRAO
+from http_fetch import BuscadorHttp
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://investidor10.com.br"
+ARQUIVO_UNIVERSO_PADRAO = os.path.join("cache", "universo_fiis.json")
+# Link para a página de um FII: /fiis/<ticker>/
+PADRAO_LINK_FII = re.compile(r"/fiis/([A-Za-z]{4}11)/?$")
+PADRAO_PAGINA = re.compile(r"[?&]page=(\d+)")
+MAX_PAGINAS = 100
+
+
+class _LeitorListagem(HTMLParser):
+    """Lê tabelas com links para FIIs e os links de paginação de uma página."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cabecalho = []
+        self.fiis = {}
+        self.paginas = set()
+        self._em_th = False
+        self._em_celula = False
+        self._linha = None
+        self._celula = []
+        self._ticker_linha = None
+        self._link = None
+        self._texto_link = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "tr":
+            self._linha = []
+            self._ticker_linha = None
+        elif tag == "th":
+            self._em_th = True
+            self._celula = []
+        elif tag == "td" and self._linha is not None:
+            self._em_celula = True
+            self._celula = []
+        elif tag == "a":
+            href = attrs.get("href") or ""
+            pagina = PADRAO_PAGINA.search(href)
+            if pagina:
+                self.paginas.add(int(pagina.group(1)))
+            match = PADRAO_LINK_FII.search(urllib.parse.urlparse(href).path)
+            if match:
+                self._link = match.group(1).upper()
+                self._texto_link = []
+                if self._linha is not None and self._ticker_linha is None:
+                    self._ticker_linha = self._link
+
+    def handle_endtag(self, tag):
+        if tag == "th" and self._em_th:
+            self._em_th = False
+            self.cabecalho.append(_limpar(self._celula))
+        elif tag == "td" and self._em_celula:
+            self._em_celula = False
+            self._linha.append(_limpar(self._celula))
+        elif tag == "a" and self._link:
+            # Links soltos (cards, listas) também valem: ticker e nome do fundo
+            if self._link not in self.fiis:
+                texto = _limpar(self._texto_link)
+                self.fiis[self._link] = {"Nome": texto} if texto and texto.upper() != self._link else {}
+            self._link = None
+        elif tag == "tr" and self._linha is not None:
+            if self._ticker_linha:
+                self._registrar_linha()
+            self._linha = None
+
+    def handle_data(self, data):
+        if self._em_th or self._em_celula:
+            self._celula.append(data)
+        if self._link:
+            self._texto_link.append(data)
+
+    def _registrar_linha(self):
+        atributos = {}
+        for i, valor in enumerate(self._linha):
+            nome = self.cabecalho[i] if i < len(self.cabecalho) and self.cabecalho[i] else f"Coluna {i + 1}"
+            if valor and valor.upper() != self._ticker_linha:
+                atributos[nome] = valor
+        self.fiis[self._ticker_linha] = atributos
+
+
+def _limpar(partes):
+    return " ".join("".join(partes).split())
+
+
+def extrair_fiis_da_pagina(html):
+    """
+    Extrai os FIIs de uma página de listagem.
+
+    Returns:
+        tuple: (dict ticker -> atributos, set de números de página encontrados na paginação)
+    """
+    leitor = _LeitorListagem()
+    leitor.feed(html)
+    leitor.close()
+    return leitor.fiis, leitor.paginas
+
+
+def _url_pagina(url, pagina):
+    partes = urllib.parse.urlparse(url)
+    query = dict(urllib.parse.parse_qsl(partes.query))
+    query["page"] = str(pagina)
+    return urllib.parse.urlunparse(partes._replace(query=urllib.parse.urlencode(query)))
+
+
+def descobrir_de_urls(urls, buscador=None, usar_cache=True):
+    """
+    Percorre listagens do site, incluindo todas as páginas da paginação.
+
+    A primeira página de cada listagem é buscada para descobrir o total de
+    páginas; as demais são buscadas em paralelo.
+
+    Returns:
+        dict: ticker -> atributos
+    """
+    buscador = buscador or BuscadorHttp()
+    universo = {}
+    primeiras = buscador.buscar_varios(urls, usar_cache)
+    seguintes = []
+    for url, resposta in primeiras.items():
+        if not resposta.ok:
+            logger.warning(f"Listagem indisponível ({resposta.status}): {url}")
+            continue
+        fiis, paginas = extrair_fiis_da_pagina(resposta.texto)
+        universo.update(fiis)
+        ultima = min(max(paginas, default=1), MAX_PAGINAS)
+        seguintes.extend(_url_pagina(url, pagina) for pagina in range(2, ultima + 1))
+
+    for url, resposta in buscador.buscar_varios(seguintes, usar_cache).items():
+        if resposta.ok:
+            universo.update(extrair_fiis_da_pagina(resposta.texto)[0])
+        else:
+            logger.warning(f"Página da listagem indisponível ({resposta.status}): {url}")
+    return universo
+
+
+def descobrir_de_arquivos(caminhos):
+    """
+    Lê o universo de páginas HTML salvas (arquivos ou diretórios com arquivos .html).
+
+    Returns:
+        dict: ticker -> atributos
+    """
+    arquivos = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            arquivos.extend(os.path.join(caminho, nome) for nome in sorted(os.listdir(caminho))
+                            if nome.lower().endswith((".html", ".htm")))
+        else:
+            arquivos.append(caminho)
+
+    universo = {}
+    for arquivo in arquivos:
+        with open(arquivo, 'r', encoding='utf-8', errors='replace') as f:
+            universo.update(extrair_fiis_da_pagina(f.read())[0])
+    return universo
+
+
+def salvar_universo(universo, fonte, caminho=ARQUIVO_UNIVERSO_PADRAO):
+    """Grava o universo de forma atômica."""
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    dados = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "fonte": fonte,
+        "fiis": [{"Ticker": ticker, **atributos} for ticker, atributos in sorted(universo.items())],
+    }
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def carregar_universo(caminho=ARQUIVO_UNIVERSO_PADRAO):
+    """Carrega o universo salvo (dict vazio se ainda não foi descoberto)."""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        return {fii["Ticker"]: {k: v for k, v in fii.items() if k != "Ticker"} for fii in dados.get("fiis", [])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def interpretar_filtros(textos):
+    """Converte "Atributo=valor" em dicionário (mesmo atributo repetido = qualquer um dos valores)."""
+    filtros = {}
+    for texto in textos or []:
+        atributo, separador, valor = texto.partition("=")
+        if not separador or not atributo.strip():
+            raise ValueError(f"Filtro inválido: '{texto}' (use Atributo=valor)")
+        filtros.setdefault(atributo.strip(), []).append(valor.strip())
+    return filtros
+
+
+def filtrar(universo, filtros):
+    """
+    Filtra o universo por atributos.
+
+    A comparação é por trecho do valor, sem diferenciar maiúsculas; atributos
+    diferentes precisam ser todos atendidos, valores do mesmo atributo bastam um.
+
+    Args:
+        universo (dict): ticker -> atributos
+        filtros (dict): atributo -> lista de valores, ex: {"Segmento": ["Papéis"]}
+
+    Returns:
+        list: Tickers ordenados
+    """
+    def atende(atributos):
+        nomes = {nome.lower(): valor for nome, valor in atributos.items()}
+        for atributo, valores in filtros.items():
+            valor = str(nomes.get(atributo.lower(), "")).lower()
+            if not any(v.lower() in valor for v in valores):
+                return False
+        return True
+
+    return sorted(ticker for ticker, atributos in universo.items() if atende(atributos))
+
+
+def atualizar_lista(config, nome, tickers, filtros=None):
+    """Cria ou substitui os tickers de uma lista nomeada, guardando o filtro usado."""
+    listas = config.setdefault("listas", [])
+    lista = next((l for l in listas if l.get("nome") == nome), None)
+    if lista is None:
+        lista = {"nome": nome, "colunas": []}
+        listas.append(lista)
+    lista["acoes"] = list(tickers)
+    if filtros:
+        lista["filtro"] = filtros
+    return lista
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Descoberta do universo de FIIs do Investidor10")
+    parser.add_argument("--config", default=ARQUIVO_CONFIG_PADRAO)
+    parser.add_argument("--url", action="append", help="URL de listagem (pode repetir)")
+    parser.add_argument("--snapshot", action="append", help="Página HTML salva ou diretório com páginas (pode repetir)")
+    parser.add_argument("--universo", default=ARQUIVO_UNIVERSO_PADRAO, help="Arquivo do universo descoberto")
+    parser.add_argument("--filtro", action="append", help="Atributo=valor, ex: Segmento=Papéis (pode repetir)")
+    parser.add_argument("--lista", help="Grava os fundos filtrados na lista nomeada informada")
+    parser.add_argument("--atualizar-listas", action="store_true", help="Reaplica o filtro salvo de cada lista")
+    parser.add_argument("--usar-salvo", action="store_true", help="Não acessa o site: usa o universo já salvo")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache HTTP")
+    args = parser.parse_args()
+
+    store = obter_store(args.config)
+    config = store.carregar()
+
+    if args.usar_salvo:
+        universo = carregar_universo(args.universo)
+        if not universo:
+            parser.error(f"Universo ainda não descoberto: {args.universo}")
+    else:
+        if args.snapshot:
+            fonte = args.snapshot
+            universo = descobrir_de_arquivos(args.snapshot)
+        else:
+            base_url = config.get("base_url", BASE_URL).rstrip("/")
+            fonte = args.url or config.get("descoberta_urls") or [f"{base_url}/fiis/"]
+            buscador = BuscadorHttp()
+            universo = descobrir_de_urls(fonte, buscador, usar_cache=not args.sem_cache)
+            logger.info(f"Busca HTTP: {buscador.estatisticas}")
+        if not universo:
+            print("Nenhum FII encontrado nas listagens.")
+            return
+        salvar_universo(universo, fonte, args.universo)
+        print(f"{len(universo)} FIIs descobertos -> {args.universo}")
+
+    alterou = False
+    if args.filtro:
+        filtros = interpretar_filtros(args.filtro)
+        tickers = filtrar(universo, filtros)
+        print(f"{len(tickers)} FIIs atendem ao filtro: {', '.join(tickers)}")
+        if args.lista:
+            atualizar_lista(config, args.lista, tickers, filtros)
+            alterou = True
+            print(f"Lista '{args.lista}' atualizada com {len(tickers)} FIIs")
+    elif args.lista:
+        parser.error("--lista exige ao menos um --filtro")
+
+    if args.atualizar_listas:
+        for lista in config.get("listas", []):
+            if isinstance(lista.get("filtro"), dict):
+                tickers = filtrar(universo, lista["filtro"])
+                lista["acoes"] = tickers
+                alterou = True
+                print(f"Lista '{lista['nome']}': {len(tickers)} FIIs")
+
+    if alterou:
+        store.config = config
+        store.salvar(imediato=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    main()
@@ -0,0 +1,125 @@
+"""
+Processo de extração isolado da interface Tkinter.
+
+A extração (Selenium, conversões do pandas e escrita do Excel) roda em um
+processo separado para não disputar o GIL com o Tk. A comunicação é feita por
+mensagens em uma `multiprocessing.Queue`:
+
+    ("status", mensagem, progresso)          -> atualização da barra de status
+    ("resultado", dados_acoes, dados_carteiras) -> listas de dicionários extraídas
+    ("exportado", caminho_excel)             -> exportação concluída
+    ("erro", mensagem)                       -> erro geral da extração
+    ("erros_tickers", erros, caminho_excel)  -> falhas por ticker (ticker, etapa, tipo, mensagem, segundos)
+    ("fim",)                                 -> o processo terminou (sempre a última mensagem)
+
+O cancelamento é solicitado pela interface através de um `multiprocessing.Event`.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+MSG_STATUS = "status"
+MSG_RESULTADO = "resultado"
+MSG_EXPORTADO = "exportado"
+MSG_ERRO = "erro"
+MSG_ERROS_TICKERS = "erros_tickers"
+MSG_FIM = "fim"
+
+
+def contexto_multiprocessing():
+    """Contexto "spawn" em todas as plataformas: um fork do processo com Tk ativo não é seguro."""
+    import multiprocessing
+    return multiprocessing.get_context("spawn")
+
+
+def _criar_raiz_tk_oculta():
+    """Cria uma raiz Tk oculta no processo de trabalho para os diálogos do extrator (ex: login)."""
+    try:
+        import tkinter as tk
+        raiz = tk.Tk()
+        raiz.withdraw()
+        return raiz
+    except Exception as e:
+        logger.warning(f"Não foi possível criar a raiz Tk do processo de extração: {e}")
+        return None
+
+
+def executar_extracao(config, fila, evento_cancelamento):
+    """
+    Ponto de entrada do processo de extração.
+
+    Args:
+        config (dict): Configurações da aplicação (cópia serializável)
+        fila (multiprocessing.Queue): Fila de mensagens para a interface
+        evento_cancelamento (multiprocessing.Event): Evento de cancelamento
+    """
+    def status(mensagem, progresso=None):
+        fila.put((MSG_STATUS, mensagem, progresso))
+
+    extrator = None
+    raiz_tk = None
+    trava = None
+    try:
+        # A mesma trava do agendador: uma extração manual não se sobrepõe a uma agendada
+        from scheduler import TravaExecucao
+        trava = TravaExecucao()
+        if not trava.adquirir():
+            fila.put((MSG_ERRO, "Outra extração (agendada ou em outra janela) está em andamento. Tente novamente ao término dela."))
+            return
+
+        # Importações pesadas apenas dentro do processo de trabalho
+        import pandas as pd
+        from data_extractor import DataExtractor
+        from config_store import acoes_da_execucao
+
+        if not config.get("headless", True):
+            raiz_tk = _criar_raiz_tk_oculta()
+
+        extrator = DataExtractor(config=config, status_callback=status, cancelamento_event=evento_cancelamento)
+
+        extrator.setup_driver()
+        if evento_cancelamento.is_set():
+            status("Extração cancelada pelo usuário.", 0)
+            return
+
+        extrator.access_site_and_await_login()
+
+        dados_acoes = []
+        if acoes_da_execucao(config):
+            dados_acoes = extrator.extract_stock_data()
+        else:
+            status("Nenhuma ação configurada, pulando extração de dados de ações.", 60)
+
+        dados_carteiras = extrator.extract_portfolio_data()
+
+        if evento_cancelamento.is_set():
+            status("Extração cancelada pelo usuário. Dados parciais não serão processados.", 0)
+            return
+
+        status("Processando resultados...", 95)
+        fila.put((MSG_RESULTADO, dados_acoes, dados_carteiras))
+
+        caminho = None
+        if dados_acoes or dados_carteiras:
+            caminho = extrator.salvar_excel(pd.DataFrame(dados_acoes), pd.DataFrame(dados_carteiras))
+            fila.put((MSG_EXPORTADO, caminho))
+        if extrator.metrics.erros:
+            fila.put((MSG_ERROS_TICKERS, list(extrator.metrics.erros), caminho))
+    except Exception as e:
+        logger.exception("Erro no processo de extração")
+        fila.put((MSG_ERRO, str(e)))
+    finally:
+        if extrator:
+            try:
+                extrator.cleanup()
+            except Exception as e:
+                logger.warning(f"Erro ao finalizar o extrator: {e}")
+        if trava is not None:
+            trava.liberar()
+        if raiz_tk is not None:
+            try:
+                raiz_tk.destroy()
+            except Exception:
+                pass
+        fila.put((MSG_FIM,))
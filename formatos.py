@@ -0,0 +1,83 @@
+"""
+Conversão dos textos extraídos do site para números.
+
+Os valores chegam como texto no formato brasileiro ("R$ 1.234,56", "8,52%",
+"R$ 2,79 B"); estas funções os convertem para float para comparações e cálculos
+(e, no caminho inverso, escrevem números no mesmo formato).
+"""
+
+import math
+import re
+
+# Sufixos de escala usados no site (ex: "R$ 2,79 B", "1,2 Mil")
+MULTIPLICADORES = {
+    "mil": 1e3,
+    "k": 1e3,
+    "m": 1e6,
+    "mi": 1e6,
+    "milhões": 1e6,
+    "milhão": 1e6,
+    "b": 1e9,
+    "bi": 1e9,
+    "bilhões": 1e9,
+    "bilhão": 1e9,
+    "t": 1e12,
+    "tri": 1e12,
+}
+
+_PADRAO_NUMERO = re.compile(r"^([-+]?[\d.]*,?\d+)\s*([a-zA-Zõã]*)$")
+
+
+def para_numero(valor):
+    """
+    Converte um valor extraído para float.
+
+    Args:
+        valor: Texto no formato brasileiro (ou número)
+
+    Returns:
+        float | None: Valor numérico (percentuais sem divisão por 100), ou None se não for numérico
+
+    Exemplos:
+        "R$ 1.234,56" -> 1234.56 | "8,52%" -> 8.52 | "R$ 2,79 B" -> 2790000000.0 | "N/A" -> None
+    """
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return None if isinstance(valor, float) and math.isnan(valor) else float(valor)
+
+    texto = str(valor).replace("R$", "").replace("%", "").replace("\xa0", " ").strip()
+    correspondencia = _PADRAO_NUMERO.match(texto)
+    if not correspondencia:
+        return None
+    numero, sufixo = correspondencia.groups()
+    multiplicador = 1.0
+    if sufixo:
+        multiplicador = MULTIPLICADORES.get(sufixo.lower())
+        if multiplicador is None:
+            return None
+    try:
+        return float(numero.replace(".", "").replace(",", ".")) * multiplicador
+    except ValueError:
+        return None
+
+
+def para_texto(numero):
+    """
+    Escreve um número no formato brasileiro, sem separador de milhar, de modo que
+    `para_numero` o leia de volta com o mesmo valor.
+
+    Exemplos:
+        0.95 -> "0,95" | 1234.5 -> "1234,5" | 12.0 -> "12"
+    """
+    texto = f"{numero:.10f}".rstrip("0").rstrip(".")
+    return "0" if texto == "-0" else texto.replace(".", ",")
+
+
+def variacao_percentual(anterior, atual):
+    """Variação percentual entre dois valores (None se algum não for numérico ou o anterior for zero)."""
+    anterior = para_numero(anterior)
+    atual = para_numero(atual)
+    if anterior is None or atual is None or anterior == 0:
+        return None
+    return (atual - anterior) / abs(anterior) * 100
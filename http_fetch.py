@@ -0,0 +1,222 @@
+"""
+Busca HTTP direta (sem navegador), paralela e com cache em disco.
+
+Usada para páginas que não dependem de JavaScript nem de login, como as
+listagens de FIIs da descoberta e a verificação de existência de tickers.
+Cada resposta 200 é guardada em `cache/http/`; dentro da validade ela é
+reutilizada sem acessar o site, e depois dela é revalidada com ETag /
+Last-Modified quando o servidor os informa.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DIR_CACHE_PADRAO = os.path.join("cache", "http")
+VALIDADE_PADRAO_S = 6 * 3600
+MAX_PARALELO_PADRAO = 8
+TIMEOUT_PADRAO_S = 20
+TENTATIVAS_PADRAO = 2
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+
+class RespostaHttp:
+    """Resposta de uma busca: status, texto e se veio do cache."""
+
+    def __init__(self, url, status, texto="", do_cache=False, erro=None):
+        self.url = url
+        self.status = status
+        self.texto = texto
+        self.do_cache = do_cache
+        self.erro = erro
+
+    @property
+    def ok(self):
+        return self.status == 200
+
+    def __repr__(self):
+        return f"RespostaHttp({self.url!r}, status={self.status}, do_cache={self.do_cache})"
+
+
+class BuscadorHttp:
+    """Busca páginas com urllib em paralelo, com cache em disco e novas tentativas."""
+
+    def __init__(self, dir_cache=DIR_CACHE_PADRAO, validade_s=VALIDADE_PADRAO_S, max_paralelo=MAX_PARALELO_PADRAO,
+                 timeout=TIMEOUT_PADRAO_S, tentativas=TENTATIVAS_PADRAO):
+        """
+        Args:
+            dir_cache (str): Diretório do cache (None desativa o cache)
+            validade_s (int): Tempo em que uma resposta em cache é usada sem revalidar
+            max_paralelo (int): Requisições simultâneas em `buscar_varios`
+            timeout (int): Timeout de cada requisição em segundos
+            tentativas (int): Tentativas por URL em erros de rede ou 5xx
+        """
+        self.dir_cache = dir_cache
+        self.validade_s = validade_s
+        self.max_paralelo = max(1, max_paralelo)
+        self.timeout = timeout
+        self.tentativas = max(1, tentativas)
+        self.estatisticas = {"rede": 0, "cache": 0, "revalidadas": 0, "erros": 0}
+        self._lock = threading.Lock()
+
+    def _contar(self, chave):
+        with self._lock:
+            self.estatisticas[chave] += 1
+
+    def _caminhos_cache(self, url):
+        chave = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.dir_cache, chave[:2], chave)
+        return f"{base}.json", f"{base}.html"
+
+    def _ler_cache(self, url):
+        if not self.dir_cache:
+            return None, None
+        caminho_meta, caminho_corpo = self._caminhos_cache(url)
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(caminho_corpo, 'r', encoding='utf-8') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _gravar_cache(self, url, texto, cabecalhos):
+        if not self.dir_cache:
+            return
+        caminho_meta, caminho_corpo = self._caminhos_cache(url)
+        try:
+            os.makedirs(os.path.dirname(caminho_meta), exist_ok=True)
+            with open(caminho_corpo, 'w', encoding='utf-8') as f:
+                f.write(texto)
+            meta = {
+                "url": url,
+                "obtido_em": time.time(),
+                "etag": cabecalhos.get("ETag"),
+                "last_modified": cabecalhos.get("Last-Modified"),
+            }
+            with open(caminho_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            logger.debug(f"Erro ao gravar cache de {url}: {e}")
+
+    def _tocar_cache(self, url, meta):
+        meta["obtido_em"] = time.time()
+        caminho_meta, _ = self._caminhos_cache(url)
+        try:
+            with open(caminho_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError:
+            pass
+
+    def _requisicao(self, url, metodo="GET", cabecalhos_extra=None):
+        cabecalhos = {"User-Agent": USER_AGENT, "Accept-Language": "pt-BR,pt;q=0.9"}
+        cabecalhos.update(cabecalhos_extra or {})
+        requisicao = urllib.request.Request(url, headers=cabecalhos, method=metodo)
+        return urllib.request.urlopen(requisicao, timeout=self.timeout)
+
+    def buscar(self, url, usar_cache=True):
+        """
+        Busca uma URL.
+
+        Returns:
+            RespostaHttp: status 0 indica erro de rede (detalhe em `erro`)
+        """
+        meta, corpo = self._ler_cache(url) if usar_cache else (None, None)
+        if meta is not None and time.time() - meta.get("obtido_em", 0) < self.validade_s:
+            self._contar("cache")
+            return RespostaHttp(url, 200, corpo, do_cache=True)
+
+        condicionais = {}
+        if meta is not None:
+            if meta.get("etag"):
+                condicionais["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                condicionais["If-Modified-Since"] = meta["last_modified"]
+
+        ultimo_erro = None
+        for tentativa in range(self.tentativas):
+            try:
+                with self._requisicao(url, cabecalhos_extra=condicionais) as resposta:
+                    charset = resposta.headers.get_content_charset() or "utf-8"
+                    texto = resposta.read().decode(charset, errors="replace")
+                    self._contar("rede")
+                    self._gravar_cache(url, texto, resposta.headers)
+                    return RespostaHttp(url, resposta.status, texto)
+            except urllib.error.HTTPError as e:
+                if e.code == 304 and meta is not None:
+                    self._contar("revalidadas")
+                    self._tocar_cache(url, meta)
+                    return RespostaHttp(url, 200, corpo, do_cache=True)
+                if e.code < 500:
+                    self._contar("rede")
+                    return RespostaHttp(url, e.code, erro=str(e))
+                ultimo_erro = e
+            except (urllib.error.URLError, OSError) as e:
+                ultimo_erro = e
+            if tentativa + 1 < self.tentativas:
+                time.sleep(0.5 * (tentativa + 1))
+
+        self._contar("erros")
+        logger.debug(f"Falha ao buscar {url}: {ultimo_erro}")
+        return RespostaHttp(url, getattr(ultimo_erro, "code", 0), erro=str(ultimo_erro))
+
+    def buscar_varios(self, urls, usar_cache=True):
+        """
+        Busca várias URLs em paralelo (até `max_paralelo` simultâneas).
+
+        Returns:
+            dict: URL -> RespostaHttp, na ordem recebida
+        """
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=min(self.max_paralelo, max(1, len(urls)))) as executor:
+            respostas = executor.map(lambda url: self.buscar(url, usar_cache), urls)
+            return dict(zip(urls, respostas))
+
+    def existe(self, url):
+        """
+        Verifica se uma página existe sem baixá-la (HEAD, com GET como alternativa).
+
+        Returns:
+            bool | None: True/False, ou None se não foi possível verificar (rede, bloqueio)
+        """
+        meta, _ = self._ler_cache(url)
+        if meta is not None:
+            return True
+        for metodo in ("HEAD", "GET"):
+            try:
+                with self._requisicao(url, metodo=metodo) as resposta:
+                    # Páginas inexistentes podem redirecionar para outra página com status 200
+                    destino = urllib.parse.urlparse(resposta.geturl()).path.rstrip("/")
+                    return resposta.status == 200 and destino == urllib.parse.urlparse(url).path.rstrip("/")
+            except urllib.error.HTTPError as e:
+                if e.code in (404, 410):
+                    return False
+                if e.code in (405, 501) and metodo == "HEAD":
+                    continue
+                return None
+            except (urllib.error.URLError, OSError):
+                return None
+        return None
+
+    def existem(self, urls):
+        """
+        Verifica a existência de várias páginas em paralelo.
+
+        Returns:
+            dict: URL -> True/False/None (ver `existe`)
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_paralelo, len(urls))) as executor:
+            return dict(zip(urls, executor.map(self.existe, urls)))
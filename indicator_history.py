@@ -0,0 +1,154 @@
+"""
+Histórico de indicadores de cada fundo como matriz numérica (indicador × período).
+
+A tabela `#indicators-history` inteira é lida pelo mesmo script das colunas
+personalizadas (um único round-trip por página) e convertida em uma matriz de
+floats, em vez de uma coluna com seletor próprio para cada célula. As matrizes
+vão para a aba "Historico Indicadores" do Excel em formato longo (uma linha
+por ticker, indicador e período) e para o histórico em disco.
+
+O histórico (`cache/historico_indicadores.json`) guarda os eixos uma única vez
+(listas de indicadores e de períodos compartilhadas por todos os fundos) e, por
+fundo, apenas as células preenchidas como [indicador, período, valor]. Um ano
+novo no site é só mais um item no eixo de períodos.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+
+from config_store import normalizar_rotulo
+from formatos import para_numero
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_HISTORICO_PADRAO = os.path.join("cache", "historico_indicadores.json")
+COLUNAS_LONGAS = ["Ticker", "Indicador", "Período", "Valor"]
+
+
+class MatrizIndicadores:
+    """Matriz indicador × período de um fundo (None nas células ausentes ou não numéricas)."""
+
+    def __init__(self, indicadores, periodos, valores):
+        self.indicadores = list(indicadores)
+        self.periodos = list(periodos)
+        self.valores = [list(linha) for linha in valores]
+
+    @classmethod
+    def de_tabela(cls, tabela):
+        """
+        Monta a matriz a partir da tabela devolvida pelo script de extração.
+
+        Args:
+            tabela (dict): {"periodos": [...], "linhas": [[indicador, [textos...]], ...]}
+        """
+        periodos = list((tabela or {}).get("periodos") or [])
+        indicadores, valores = [], []
+        for indicador, textos in (tabela or {}).get("linhas") or []:
+            if indicador in indicadores:
+                continue
+            linha = [para_numero(texto) for texto in list(textos)[:len(periodos)]]
+            indicadores.append(indicador)
+            valores.append(linha + [None] * (len(periodos) - len(linha)))
+        return cls(indicadores, periodos, valores)
+
+    def valor(self, indicador, periodo):
+        """Valor de uma célula pelo rótulo (sem diferenciar acentos e maiúsculas), ou None."""
+        try:
+            i = [normalizar_rotulo(nome) for nome in self.indicadores].index(normalizar_rotulo(indicador))
+            j = [normalizar_rotulo(nome) for nome in self.periodos].index(normalizar_rotulo(periodo))
+        except ValueError:
+            return None
+        return self.valores[i][j]
+
+    def linhas_longas(self, ticker):
+        """Células preenchidas em formato longo (Ticker, Indicador, Período, Valor)."""
+        return [
+            {"Ticker": ticker, "Indicador": indicador, "Período": periodo, "Valor": valor}
+            for indicador, linha in zip(self.indicadores, self.valores)
+            for periodo, valor in zip(self.periodos, linha)
+            if valor is not None
+        ]
+
+    def __bool__(self):
+        return any(valor is not None for linha in self.valores for valor in linha)
+
+
+class HistoricoIndicadores:
+    """Matrizes de indicadores por ticker, com eixos compartilhados, persistidas em JSON."""
+
+    def __init__(self, caminho=ARQUIVO_HISTORICO_PADRAO):
+        self.caminho = caminho
+        self.indicadores = []
+        self.periodos = []
+        self.fundos = {}
+        self.carregar()
+
+    def carregar(self):
+        if not self.caminho or not os.path.exists(self.caminho):
+            return
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            self.indicadores = list(dados.get("indicadores", []))
+            self.periodos = list(dados.get("periodos", []))
+            self.fundos = dict(dados.get("fundos", {}))
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.warning(f"Histórico de indicadores ignorado ({self.caminho}): {e}")
+
+    @staticmethod
+    def _indice(eixo, nome):
+        try:
+            return eixo.index(nome)
+        except ValueError:
+            eixo.append(nome)
+            return len(eixo) - 1
+
+    def registrar(self, ticker, matriz):
+        """Substitui a matriz guardada de um ticker (matrizes vazias são ignoradas)."""
+        if not matriz:
+            return
+        celulas = []
+        for indicador, linha in zip(matriz.indicadores, matriz.valores):
+            i = self._indice(self.indicadores, indicador)
+            for periodo, valor in zip(matriz.periodos, linha):
+                if valor is not None:
+                    celulas.append([i, self._indice(self.periodos, periodo), valor])
+        self.fundos[ticker] = {"atualizado_em": datetime.now().isoformat(timespec="seconds"), "celulas": celulas}
+
+    def matriz(self, ticker):
+        """Matriz guardada de um ticker (apenas com os indicadores e períodos que ele tem), ou None."""
+        fundo = self.fundos.get(ticker)
+        if not fundo:
+            return None
+        linhas = sorted({i for i, _, _ in fundo["celulas"]})
+        colunas = sorted({j for _, j, _ in fundo["celulas"]})
+        posicao_linha = {i: n for n, i in enumerate(linhas)}
+        posicao_coluna = {j: n for n, j in enumerate(colunas)}
+        valores = [[None] * len(colunas) for _ in linhas]
+        for i, j, valor in fundo["celulas"]:
+            valores[posicao_linha[i]][posicao_coluna[j]] = valor
+        return MatrizIndicadores([self.indicadores[i] for i in linhas], [self.periodos[j] for j in colunas], valores)
+
+    def linhas_longas(self, tickers=None):
+        """Todas as células guardadas em formato longo (opcionalmente só dos tickers informados)."""
+        linhas = []
+        for ticker in (self.fundos if tickers is None else tickers):
+            matriz = self.matriz(ticker)
+            if matriz is not None:
+                linhas.extend(matriz.linhas_longas(ticker))
+        return linhas
+
+    def salvar(self):
+        """Persiste o histórico de forma atômica."""
+        if not self.caminho:
+            return
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({"indicadores": self.indicadores, "periodos": self.periodos, "fundos": self.fundos},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporario, self.caminho)
@@ -1,12 +1,18 @@
-import json
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 import os
 from tkinter import font as tkfont
 import threading
 import time
-from data_extractor import DataExtractor
+import queue
+from extraction_worker import (executar_extracao, contexto_multiprocessing,
+                               MSG_STATUS, MSG_RESULTADO, MSG_EXPORTADO, MSG_ERRO, MSG_ERROS_TICKERS, MSG_FIM)
+from status_channel import StatusChannel, INTERVALO_DRENAGEM_MS
+from config_store import obter_store, acoes_da_execucao, montar_plano_extracao
+from results_view import PainelResultados, linhas_de_registros, registros_de_planilha
+
+# Limite de mensagens do processo de extração lidas por ciclo da interface
+MAX_MENSAGENS_POR_CICLO = 200
 
 
 class ToolTip:
@@ -92,20 +98,38 @@ class InvestidorApp:
         self.cancelar_extracao = threading.Event()
         self.extracao_em_andamento = False
 
+        # Canal de status: threads de trabalho publicam, a UI drena em intervalo fixo
+        self.canal_status = StatusChannel()
+
         # Carregar configurações
         self.config_file = "config.json"
         self.config = self.carregar_config()
 
-        # Instanciar extrator de dados
-        self.data_extractor = None
+        # Processo de extração (criado a cada execução)
+        self.processo_extracao = None
+        self.fila_extracao = None
+        self.evento_cancelamento_processo = None
+
+        # Processo do agendador (iniciado pelo menu "Agendador")
+        self.processo_agendador = None
+        self.fila_agendador = None
+        self.evento_parada_agendador = None
+
+        # DataFrames para armazenar resultados (None até a primeira extração;
+        # o pandas só é importado quando há resultados, para não atrasar a abertura)
+        self.df_acoes = None
+        self.df_carteiras = None
+        # Falhas por ticker da última extração, mostradas ao fim: (erros, caminho_excel)
+        self.erros_extracao = None
 
-        # DataFrames para armazenar resultados
-        self.df_acoes = pd.DataFrame()
-        self.df_carteiras = pd.DataFrame()
+        # Tabelas exibidas na aba de resultados: nome -> (colunas, linhas)
+        self.tabelas_resultados = {}
 
         # Criar interface
         self.criar_interface()
         self.configurar_atalhos()
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar_aplicacao)
+        self.root.after(INTERVALO_DRENAGEM_MS, self._drenar_status)
 
     def centralizar_janela(self):
         """Centraliza a janela na tela."""
@@ -294,9 +318,10 @@ class InvestidorApp:
             "<Control-s>": lambda e: self.salvar_configuracoes(),
             "<Control-e>": lambda e: self.start_combined_extraction(),
             "<Control-t>": lambda e: self.alternar_tema(),
-            "<Control-q>": lambda e: self.root.destroy(),
+            "<Control-q>": lambda e: self.fechar_aplicacao(),
             "<Control-a>": lambda e: self.adicionar_acao(),
             "<Control-r>": lambda e: self.remover_acao(),
+            "<Control-i>": lambda e: self.importar_acoes(),
             "<Control-n>": lambda e: self.adicionar_coluna(),
             "<Delete>": lambda e: self.excluir_coluna()
         }
@@ -324,52 +349,16 @@ class InvestidorApp:
                 self.atualizar_status("⚠️ Atalhos desabilitados durante extração. Use o botão de cancelar se necessário.", None)
 
     def carregar_config(self):
-        """Carrega as configurações do arquivo JSON."""
-        default_config_values = {
-            "acoes": [],
-            "colunas_personalizadas": [],
-            "headless": False,
-            "tema": "escuro",
-            "mostrar_mensagem_inicial": True
-        }
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                if not isinstance(config_data, dict):
-                    raise ValueError("O conteúdo do arquivo de configuração não é um dicionário válido.")
-        except FileNotFoundError:
-            return default_config_values.copy()
-        except json.JSONDecodeError as e:
-            messagebox.showerror("Erro de Configuração", f"Erro ao ler o arquivo {self.config_file}: {e}. Usando configuração padrão.")
-            return default_config_values.copy()
-        except ValueError as e:
-            messagebox.showerror("Erro de Configuração", f"Erro no formato do arquivo {self.config_file}: {e}. Usando configuração padrão.")
-            return default_config_values.copy()
-
-        # Mesclar com padrões
-        final_config = default_config_values.copy()
-        final_config.update(config_data)
-
-        # Normalizar dados
-        if "acoes" in final_config and isinstance(final_config["acoes"], list):
-            acoes_normalizadas = []
-            for acao_item in final_config["acoes"]:
-                if isinstance(acao_item, str):
-                    acao_limpa = acao_item.strip().upper()
-                    if acao_limpa:
-                        acoes_normalizadas.append(acao_limpa)
-            final_config["acoes"] = acoes_normalizadas
-        else:
-            final_config["acoes"] = []
-
-        if not isinstance(final_config.get("colunas_personalizadas"), list):
-            final_config["colunas_personalizadas"] = []
-        else:
-            for coluna in final_config["colunas_personalizadas"]:
-                coluna.setdefault("formato_excel", "Texto")
+        """Carrega as configurações do arquivo JSON (validadas e normalizadas pelo ConfigStore)."""
+        self.config_store = obter_store(self.config_file)
+        # Gravações feitas pela interface são agrupadas no loop do Tk
+        self.config_store.agendador = self.root.after
+        final_config = self.config_store.carregar()
 
-        if final_config.get("tema") not in ["claro", "escuro"]:
-            final_config["tema"] = "escuro"
+        if self.config_store.erro_carregamento:
+            messagebox.showerror("Erro de Configuração",
+                                 f"Erro ao ler o arquivo {self.config_file}: {self.config_store.erro_carregamento}. "
+                                 "Usando configuração padrão.")
 
         self.tema_escuro = final_config["tema"] == "escuro"
         self.aplicar_tema()
@@ -379,10 +368,27 @@ class InvestidorApp:
 
         return final_config
 
-    def salvar_config(self):
+    def salvar_config(self, imediato=True):
         """Salva as configurações atuais no arquivo JSON."""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, ensure_ascii=False, indent=4)
+        self.config_store.config = self.config
+        self.config_store.salvar(imediato=imediato)
+
+    def fechar_aplicacao(self):
+        """Grava configurações pendentes, encerra a extração em andamento e o agendador e fecha a aplicação."""
+        try:
+            self.config_store.descarregar()
+            if self.processo_extracao is not None and self.processo_extracao.is_alive():
+                # Cancela e espera o processo liberar a trava e fechar o navegador antes de forçar o término
+                self.evento_cancelamento_processo.set()
+                self.processo_extracao.join(timeout=10)
+                if self.processo_extracao.is_alive():
+                    self.processo_extracao.terminate()
+                    self.processo_extracao.join(timeout=5)
+            if self.processo_agendador is not None and self.processo_agendador.is_alive():
+                self.evento_parada_agendador.set()
+                self.processo_agendador.join(timeout=10)
+        finally:
+            self.root.destroy()
 
     def criar_interface(self):
         """Cria a interface gráfica principal da aplicação com design moderno e elegante."""
@@ -390,21 +396,89 @@ class InvestidorApp:
         main_frame = tk.Frame(self.root, bg=self.cor_fundo)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
 
-        # Criar frame principal diretamente (sem notebook/abas)
-        self.tab_config = tk.Frame(main_frame, bg=self.cor_fundo_secundario)
-        self.tab_config.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        # Abas: configuração da extração e resultados
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+
+        self.tab_config = tk.Frame(self.notebook, bg=self.cor_fundo_secundario)
+        self.notebook.add(self.tab_config, text="⚙️ Configuração")
 
         # Configurar interface principal
         self.configurar_tab_config()
 
+        self.painel_resultados = PainelResultados(self.notebook, {
+            "fundo": self.cor_fundo_secundario,
+            "texto": self.cor_texto,
+            "texto_secundario": self.cor_texto_secundario,
+            "entrada": self.cor_entrada,
+            "botao": self.cor_botao,
+        }, abrir_arquivo=self.abrir_resultados_excel)
+        self.notebook.add(self.painel_resultados, text="📊 Resultados")
+        self._carregar_tabelas_resultados()
+
         # Adicionar menu de ajuda
         self.criar_menu_ajuda()
 
+    def _carregar_tabelas_resultados(self):
+        """Preenche a aba de resultados (na abertura, com os valores da última exportação)."""
+        if not self.tabelas_resultados:
+            from delta import SnapshotExecucao, ARQUIVO_SNAPSHOT_PADRAO
+            snapshot = SnapshotExecucao(self.config.get("snapshot_execucao", ARQUIVO_SNAPSHOT_PADRAO))
+            if snapshot.tickers:
+                registros = [{"Ticker": ticker, **entrada.get("valores", {})}
+                             for ticker, entrada in snapshot.tickers.items()]
+                nome = f"Última exportação ({snapshot.gerado_em or '?'})"
+                self.tabelas_resultados[nome] = linhas_de_registros(registros)
+        for nome, (colunas, linhas) in self.tabelas_resultados.items():
+            self.painel_resultados.definir_tabela(nome, colunas, linhas, mostrar=False)
+
+    def exibir_resultados(self, nome, registros, selecionar=True):
+        """Publica uma lista de registros (dicionários) como tabela na aba de resultados."""
+        colunas, linhas = linhas_de_registros(registros)
+        if not colunas:
+            return
+        self.tabelas_resultados[nome] = (colunas, linhas)
+        self.painel_resultados.definir_tabela(nome, colunas, linhas, mostrar=selecionar)
+
+    def abrir_resultados_excel(self):
+        """Abre um Excel exportado (ex: execuções anteriores) na aba de resultados, uma tabela por aba."""
+        caminho = filedialog.askopenfilename(title="Abrir Excel exportado",
+                                             filetypes=[("Excel", "*.xlsx"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        try:
+            import pandas as pd
+            # Sem dtype=str: números chegam como números (o texto "0.95" seria lido como 95 no formato brasileiro)
+            planilhas = pd.read_excel(caminho, sheet_name=None)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Não foi possível abrir o arquivo:\n{e}")
+            return
+
+        arquivo = os.path.basename(caminho)
+        for nome in [n for n in self.tabelas_resultados if n.startswith(f"{arquivo} · ")]:
+            del self.tabelas_resultados[nome]
+        self.painel_resultados.remover_tabelas(f"{arquivo} · ")
+        # Formatos das colunas configuradas, mais a variação da aba Delta
+        formatos = dict(montar_plano_extracao(self.config.get("colunas_personalizadas")).formatos,
+                        **{"Variação %": "Porcentagem"})
+        primeira = True
+        for aba, df in planilhas.items():
+            self.exibir_resultados(f"{arquivo} · {aba}", registros_de_planilha(df, formatos), selecionar=primeira)
+            primeira = False
+        self.atualizar_status(f"📂 {arquivo} aberto na aba Resultados ({len(planilhas)} abas)", 100)
+
     def criar_menu_ajuda(self):
         """Cria o menu de ajuda com informações sobre atalhos e uso."""
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
 
+        agendador_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Agendador", menu=agendador_menu)
+        agendador_menu.add_command(label="⏰ Iniciar agendador", command=self.iniciar_agendador)
+        agendador_menu.add_command(label="⏹️ Parar agendador", command=self.parar_agendador)
+        agendador_menu.add_separator()
+        agendador_menu.add_command(label="Próximas execuções", command=self.mostrar_proximas_execucoes)
+
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Ajuda", menu=help_menu)
         help_menu.add_command(label="Atalhos de Teclado", command=self.mostrar_atalhos)
@@ -415,6 +489,90 @@ class InvestidorApp:
         help_menu.add_separator()
         help_menu.add_command(label="Sobre", command=self.mostrar_sobre)
 
+    def iniciar_agendador(self):
+        """Inicia o agendador de extrações (regras de "agendamentos") em um processo separado."""
+        if self.processo_agendador is not None and self.processo_agendador.is_alive():
+            messagebox.showinfo("Agendador", "O agendador já está em execução.")
+            return
+        from scheduler import executar_agendador
+
+        # O agendador relê o config.json; gravações pendentes são feitas antes
+        self.salvar_configuracoes(mostrar_mensagem=False)
+        self.config_store.descarregar()
+        try:
+            contexto = contexto_multiprocessing()
+            self.fila_agendador = contexto.Queue()
+            self.evento_parada_agendador = contexto.Event()
+            self.processo_agendador = contexto.Process(
+                target=executar_agendador,
+                args=(self.config_file, self.fila_agendador, self.evento_parada_agendador),
+                daemon=True
+            )
+            self.processo_agendador.start()
+        except Exception as e:
+            messagebox.showerror("Agendador", f"Não foi possível iniciar o agendador: {str(e)}")
+            self.processo_agendador = None
+            return
+        self.root.after(INTERVALO_DRENAGEM_MS, self._acompanhar_agendador)
+
+    def parar_agendador(self):
+        """Solicita o encerramento do agendador (a extração em andamento é cancelada)."""
+        if self.processo_agendador is None or not self.processo_agendador.is_alive():
+            self.atualizar_status("⏰ O agendador não está em execução.", None)
+            return
+        self.evento_parada_agendador.set()
+        self.atualizar_status("⏳ Encerrando o agendador...", None)
+
+    def _acompanhar_agendador(self):
+        """Repassa as mensagens do agendador para a barra de status até o processo terminar."""
+        if self.processo_agendador is None:
+            return
+        finalizado = False
+        for _ in range(MAX_MENSAGENS_POR_CICLO):
+            try:
+                mensagem = self.fila_agendador.get_nowait()
+            except queue.Empty:
+                break
+            tipo = mensagem[0]
+            if tipo == MSG_STATUS:
+                self.canal_status.publicar(mensagem[1], mensagem[2])
+            elif tipo == MSG_EXPORTADO:
+                self.canal_status.publicar(f"⏰ Execução agendada exportada: {mensagem[1]}", 100)
+            elif tipo == MSG_ERRO:
+                self.canal_status.publicar(f"❌ Erro no agendador: {mensagem[1]}", 0)
+            elif tipo == MSG_FIM:
+                finalizado = True
+                break
+
+        if finalizado or (not self.processo_agendador.is_alive() and self.fila_agendador.empty()):
+            self.processo_agendador.join(timeout=1)
+            self.processo_agendador = None
+        else:
+            self.root.after(INTERVALO_DRENAGEM_MS * 4, self._acompanhar_agendador)
+
+    def mostrar_proximas_execucoes(self):
+        """Mostra os próximos disparos das regras de "agendamentos"."""
+        from scheduler import Agendador
+        from calendario_b3 import agora_b3
+
+        self.config_store.descarregar()
+        agendador = Agendador(self.config_file)
+        linhas = []
+        momento = agora_b3()
+        for _ in range(5):
+            momento, regra = agendador.proximo_disparo(momento)
+            if momento is None:
+                break
+            linhas.append(f"{momento:%d/%m/%Y %H:%M}  —  {regra.get('nome', regra['cron'])}")
+
+        if not linhas:
+            messagebox.showinfo("Agendador", "Nenhum agendamento configurado.\n\n"
+                                "Adicione regras em \"agendamentos\" no config.json (ver README).")
+            return
+        em_execucao = self.processo_agendador is not None and self.processo_agendador.is_alive()
+        situacao = "em execução" if em_execucao else "parado"
+        messagebox.showinfo("Agendador", f"Agendador {situacao}.\n\nPróximas execuções:\n" + "\n".join(linhas))
+
     def mostrar_atalhos(self):
         """Mostra uma janela com os atalhos de teclado disponíveis."""
         atalhos = """
@@ -425,7 +583,8 @@ class InvestidorApp:
         Ctrl + T: Alternar Tema
         Ctrl + Q: Sair
         Ctrl + A: Adicionar Ação
-        Ctrl + R: Remover Ação
+        Ctrl + R: Remover Ações Selecionadas
+        Ctrl + I: Importar Ações em Lote
         Ctrl + N: Nova Coluna
         Delete: Excluir Coluna Selecionada
 
@@ -605,11 +764,6 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
 
     def mostrar_configuracao_inicial(self):
         """Mostra a mensagem de configuração inicial e permite reativar as notificações."""
-        import json
-        import os
-
-        # Carregar configurações atuais do config.json
-        arquivo_config = "config.json"
         config_atual = self.config.copy()  # Usar configuração já carregada pela aplicação
 
         # Garantir que a chave existe
@@ -714,8 +868,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
                 self.config["mostrar_mensagem_inicial"] = True
 
                 # Salvar no arquivo config.json
-                with open(arquivo_config, 'w', encoding='utf-8') as f:
-                    json.dump(self.config, f, ensure_ascii=False, indent=4)
+                self.salvar_config()
 
                 messagebox.showinfo("Sucesso", "Mensagem inicial reativada! Será exibida na próxima inicialização do programa.")
                 janela_config.destroy()
@@ -817,16 +970,17 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
                                          highlightthickness=1,
                                          highlightcolor=self.cor_borda_foco,
                                          font=self.default_font,
-                                         activestyle='none')
+                                         activestyle='none',
+                                         selectmode=tk.EXTENDED)
         self.listbox_acoes.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.listbox_acoes.yview)
 
         # Adicionar tooltip para a lista de ações
-        ToolTip(self.listbox_acoes, "Lista de ações para extração de dados\nClique para selecionar")
-        self.listbox_acoes.tooltip_shortcut = "Ctrl+A para adicionar, Ctrl+R para remover"
+        ToolTip(self.listbox_acoes, "Lista de ações para extração de dados\nClique para selecionar (Shift/Ctrl para vários)")
+        self.listbox_acoes.tooltip_shortcut = "Ctrl+A para adicionar, Ctrl+R para remover, Ctrl+I para importar"
 
-        for acao in self.config["acoes"]:
-            self.listbox_acoes.insert(tk.END, acao)
+        if self.config["acoes"]:
+            self.listbox_acoes.insert(tk.END, *self.config["acoes"])
 
         # Frame contador com estilo moderno
         frame_contador_acoes = tk.Frame(frame_acoes, bg=self.cor_fundo_secundario)
@@ -891,9 +1045,26 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
                                      activeforeground=self.cor_texto,
                                      cursor="hand2")
         btn_remover_acao.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(6, 0))
-        ToolTip(btn_remover_acao, "Remove a ação selecionada da lista")
+        ToolTip(btn_remover_acao, "Remove as ações selecionadas da lista")
         btn_remover_acao.tooltip_shortcut = "Ctrl+R"
 
+        btn_importar_acoes = tk.Button(frame_controle_acoes,
+                                       text="📥  Importar em lote",
+                                       command=self.importar_acoes,
+                                       bg=self.cor_botao,
+                                       fg=self.cor_texto,
+                                       font=self.button_font,
+                                       relief=tk.FLAT,
+                                       bd=0,
+                                       padx=15,
+                                       pady=6,
+                                       activebackground=self.cor_botao_hover,
+                                       activeforeground=self.cor_texto,
+                                       cursor="hand2")
+        btn_importar_acoes.pack(fill=tk.X, pady=(8, 0))
+        ToolTip(btn_importar_acoes, "Importa vários tickers de um texto, da área de transferência ou de um CSV")
+        btn_importar_acoes.tooltip_shortcut = "Ctrl+I"
+
         return frame_acoes
 
     def _criar_frame_colunas_ui(self, parent_frame):
@@ -943,7 +1114,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
 
         for coluna in self.config["colunas_personalizadas"]:
             self.tree_colunas.insert("", tk.END, values=(coluna["nome"], coluna["tipo"],
-                                                        coluna.get("seletor_css", ""),
+                                                        self._descricao_origem_coluna(coluna),
                                                         coluna.get("formato_excel", "Texto")))
 
         # Frame para botões com design moderno
@@ -1240,61 +1411,77 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
         ToolTip(self.btn_cancelar_extracao, "Cancela a extração de dados em andamento")
 
     def atualizar_status(self, mensagem, progresso=None):
-        """Atualiza a mensagem de status e a barra de progresso de forma thread-safe com feedback visual melhorado."""
-        def _atualizar():
-            try:
-                self.lbl_status.config(text=mensagem)
-
-                if progresso is not None:
-                    self.barra_progresso["value"] = progresso
-                    self.lbl_porcentagem.config(text=f"{int(progresso)}%")
-
-                    # Atualizar a cor da barra de progresso e ícone baseado no valor
-                    if progresso == 0:
-                        self.barra_progresso["style"] = "red.Horizontal.TProgressbar"
-                        self.lbl_icone_status.config(text="⏸️")
-                    elif progresso < 30:
-                        self.barra_progresso["style"] = "red.Horizontal.TProgressbar"
-                        self.lbl_icone_status.config(text="🔄")
-                    elif progresso < 70:
-                        self.barra_progresso["style"] = "yellow.Horizontal.TProgressbar"
-                        self.lbl_icone_status.config(text="⚡")
-                    elif progresso < 100:
-                        self.barra_progresso["style"] = "green.Horizontal.TProgressbar"
-                        self.lbl_icone_status.config(text="🚀")
-                    else:
-                        self.barra_progresso["style"] = "green.Horizontal.TProgressbar"
-                        self.lbl_icone_status.config(text="✅")
-                else:
-                    # Definir ícone baseado no tipo de mensagem quando não há progresso
-                    if "erro" in mensagem.lower() or "❌" in mensagem:
-                        self.lbl_icone_status.config(text="❌")
-                    elif "sucesso" in mensagem.lower() or "✅" in mensagem:
-                        self.lbl_icone_status.config(text="✅")
-                    elif "cancelado" in mensagem.lower() or "⏳" in mensagem:
-                        self.lbl_icone_status.config(text="⏹️")
-                    elif "pronto" in mensagem.lower() or "✨" in mensagem:
-                        self.lbl_icone_status.config(text="✨")
-                    else:
-                        self.lbl_icone_status.config(text="ℹ️")
-
-                self.root.update_idletasks()
-            except Exception as e:
-                # Log do erro sem usar print
-                import logging
-                logging.error(f"Erro ao atualizar status: {e}")
+        """
+        Atualiza a mensagem de status e a barra de progresso de forma thread-safe.
 
-        # Se estamos na thread principal, executar diretamente
+        Chamadas de threads secundárias apenas publicam no canal de status, que guarda
+        somente a última mensagem; a interface aplica o valor em `_drenar_status`.
+        """
         if threading.current_thread() == threading.main_thread():
-            _atualizar()
+            # Status pendente das threads é mais antigo que este: descarta para não sobrescrevê-lo
+            self.canal_status.consumir()
+            self._aplicar_status(mensagem, progresso)
+            self.root.update_idletasks()
         else:
-            # Se estamos em uma thread secundária, usar after para thread safety
-            self.root.after(0, _atualizar)
+            self.canal_status.publicar(mensagem, progresso)
+
+    def _drenar_status(self):
+        """Aplica o último status publicado pelas threads de trabalho e reagenda a drenagem (~20 Hz)."""
+        try:
+            item = self.canal_status.consumir()
+            if item is not None:
+                self._aplicar_status(*item)
+        finally:
+            self.root.after(INTERVALO_DRENAGEM_MS, self._drenar_status)
+
+    def _aplicar_status(self, mensagem, progresso=None):
+        """Aplica mensagem, progresso e ícone na barra de status com feedback visual."""
+        try:
+            self.lbl_status.config(text=mensagem)
+
+            if progresso is not None:
+                self.barra_progresso["value"] = progresso
+                self.lbl_porcentagem.config(text=f"{int(progresso)}%")
+
+                # Atualizar a cor da barra de progresso e ícone baseado no valor
+                if progresso == 0:
+                    self.barra_progresso["style"] = "red.Horizontal.TProgressbar"
+                    self.lbl_icone_status.config(text="⏸️")
+                elif progresso < 30:
+                    self.barra_progresso["style"] = "red.Horizontal.TProgressbar"
+                    self.lbl_icone_status.config(text="🔄")
+                elif progresso < 70:
+                    self.barra_progresso["style"] = "yellow.Horizontal.TProgressbar"
+                    self.lbl_icone_status.config(text="⚡")
+                elif progresso < 100:
+                    self.barra_progresso["style"] = "green.Horizontal.TProgressbar"
+                    self.lbl_icone_status.config(text="🚀")
+                else:
+                    self.barra_progresso["style"] = "green.Horizontal.TProgressbar"
+                    self.lbl_icone_status.config(text="✅")
+            else:
+                # Definir ícone baseado no tipo de mensagem quando não há progresso
+                if "erro" in mensagem.lower() or "❌" in mensagem:
+                    self.lbl_icone_status.config(text="❌")
+                elif "sucesso" in mensagem.lower() or "✅" in mensagem:
+                    self.lbl_icone_status.config(text="✅")
+                elif "cancelado" in mensagem.lower() or "⏳" in mensagem:
+                    self.lbl_icone_status.config(text="⏹️")
+                elif "pronto" in mensagem.lower() or "✨" in mensagem:
+                    self.lbl_icone_status.config(text="✨")
+                else:
+                    self.lbl_icone_status.config(text="ℹ️")
+        except Exception as e:
+            # Log do erro sem usar print
+            import logging
+            logging.error(f"Erro ao atualizar status: {e}")
 
     def cancelar_extracao_atual(self):
         """Cancela a extração de dados em andamento."""
         if self.extracao_em_andamento:
             self.cancelar_extracao.set()
+            if self.evento_cancelamento_processo is not None:
+                self.evento_cancelamento_processo.set()
             self.atualizar_status("Cancelamento solicitado... Aguardando finalização segura.", 0)
             self.btn_cancelar_extracao.config(state='disabled', text="⏳  Cancelando...")
 
@@ -1332,27 +1519,147 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             messagebox.showinfo("Informação", f"A ação '{acao}' já existe na lista.")
 
     def remover_acao(self):
-        """Remove a ação selecionada da lista de ações e da configuração."""
-        try:
-            indice_selecionado = self.listbox_acoes.curselection()[0]
-            acao = self.listbox_acoes.get(indice_selecionado)
+        """Remove as ações selecionadas da lista de ações e da configuração."""
+        selecionadas = [self.listbox_acoes.get(i) for i in self.listbox_acoes.curselection()]
+        if not selecionadas:
+            messagebox.showwarning("Aviso", "Selecione uma ou mais ações para remover.")
+            return
 
-            # Solicitar confirmação antes de remover
-            confirmacao = messagebox.askyesno(
-                "Confirmar Remoção",
-                f"Tem certeza que deseja remover a ação '{acao}'?\n\nEsta ação não pode ser desfeita.",
-                icon='warning'
-            )
+        descricao = f"a ação '{selecionadas[0]}'" if len(selecionadas) == 1 else f"{len(selecionadas)} ações"
+        # Solicitar confirmação antes de remover
+        confirmacao = messagebox.askyesno(
+            "Confirmar Remoção",
+            f"Tem certeza que deseja remover {descricao}?\n\nEsta ação não pode ser desfeita.",
+            icon='warning'
+        )
+        if not confirmacao:
+            return
 
-            if not confirmacao:
-                return
+        removidas = set(selecionadas)
+        self.config["acoes"] = [acao for acao in self.config["acoes"] if acao not in removidas]
+        self._recarregar_listbox_acoes()
+        self.atualizar_contador_acoes()
+        self.atualizar_status(f"🗑️ {descricao[0].upper()}{descricao[1:]} removida(s) com sucesso!", 100)
+
+    def _recarregar_listbox_acoes(self):
+        """Recria o conteúdo da lista de ações em uma única operação."""
+        self.listbox_acoes.delete(0, tk.END)
+        if self.config["acoes"]:
+            self.listbox_acoes.insert(tk.END, *self.config["acoes"])
 
-            self.listbox_acoes.delete(indice_selecionado)
-            self.config["acoes"].remove(acao)
+    def importar_acoes(self):
+        """Abre o diálogo de importação de tickers em lote (texto, área de transferência ou CSV)."""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Importar Ações em Lote")
+        dialog.configure(bg=self.cor_fundo)
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        dialog_width, dialog_height = 520, 420
+        position_x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (dialog_width // 2)
+        position_y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (dialog_height // 2)
+        dialog.geometry(f'{dialog_width}x{dialog_height}+{position_x}+{position_y}')
+
+        frame = tk.Frame(dialog, bg=self.cor_fundo)
+        frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        tk.Label(frame, text="Cole os tickers (separados por vírgula, espaço ou linha) ou abra um CSV:",
+                 bg=self.cor_fundo, fg=self.cor_texto, font=self.default_font, anchor="w").pack(fill=tk.X)
+
+        texto = tk.Text(frame, height=12, bg=self.cor_entrada, fg=self.cor_texto, relief=tk.FLAT,
+                        insertbackground=self.cor_texto, font=self.default_font, wrap=tk.WORD)
+        texto.pack(fill=tk.BOTH, expand=True, pady=(8, 8))
+
+        def colar():
+            try:
+                texto.insert(tk.END, self.root.clipboard_get() + "\n")
+            except tk.TclError:
+                messagebox.showinfo("Informação", "A área de transferência está vazia.", parent=dialog)
+
+        def abrir_csv():
+            caminho = filedialog.askopenfilename(parent=dialog, title="Abrir CSV de tickers",
+                                                 filetypes=[("CSV", "*.csv"), ("Texto", "*.txt"), ("Todos", "*.*")])
+            if caminho:
+                from ticker_import import ler_arquivo_csv
+                texto.insert(tk.END, "\n".join(ler_arquivo_csv(caminho)) + "\n")
+
+        frame_fontes = tk.Frame(frame, bg=self.cor_fundo)
+        frame_fontes.pack(fill=tk.X)
+        tk.Button(frame_fontes, text="📋 Colar", command=colar,
+                  bg=self.cor_botao, fg=self.cor_texto).pack(side=tk.LEFT, padx=(0, 5))
+        tk.Button(frame_fontes, text="📂 Abrir CSV...", command=abrir_csv,
+                  bg=self.cor_botao, fg=self.cor_texto).pack(side=tk.LEFT)
+
+        verificar = tk.BooleanVar(value=False)
+        chk_verificar = tk.Checkbutton(frame, text="Verificar se os fundos existem no site", variable=verificar,
+                                       bg=self.cor_fundo, fg=self.cor_texto, selectcolor=self.cor_entrada,
+                                       activebackground=self.cor_fundo, activeforeground=self.cor_texto)
+        chk_verificar.pack(anchor="w", pady=(8, 0))
+        ToolTip(chk_verificar, "Consulta rapidamente a página de cada ticker novo (sem abrir o navegador)")
+
+        frame_botoes = tk.Frame(frame, bg=self.cor_fundo)
+        frame_botoes.pack(pady=(12, 0))
+        tk.Button(frame_botoes, text="Cancelar", command=dialog.destroy,
+                  bg=self.cor_botao, fg=self.cor_texto).pack(side=tk.LEFT, padx=5)
+        btn_importar = tk.Button(frame_botoes, text="Importar", bg=self.cor_botao, fg=self.cor_texto)
+        btn_importar.config(command=lambda: self._processar_importacao(
+            texto.get("1.0", tk.END), verificar.get(), dialog, btn_importar))
+        btn_importar.pack(side=tk.LEFT, padx=5)
+
+        texto.focus_set()
+
+    def _processar_importacao(self, texto, verificar, dialog, btn_importar):
+        """Classifica os tickers informados e, se pedido, confere a existência em segundo plano."""
+        from ticker_import import candidatos_do_texto, classificar, verificar_existencia
+
+        resultado = classificar(candidatos_do_texto(texto), self.config["acoes"])
+        if not verificar or not resultado.novos:
+            dialog.destroy()
+            self._concluir_importacao(resultado)
+            return
+
+        btn_importar.config(state=tk.DISABLED, text="Verificando...")
+        self.atualizar_status(f"🔎 Verificando {len(resultado.novos)} tickers no site...", None)
+        concluido = queue.Queue()
+
+        def verificar_em_segundo_plano():
+            from discovery import BASE_URL, carregar_universo
+            try:
+                verificar_existencia(resultado, self.config.get("base_url", BASE_URL), carregar_universo())
+            except Exception:
+                # Sem verificação, os tickers com formato válido são incluídos e sinalizados
+                resultado.nao_verificados = list(resultado.novos)
+            concluido.put(True)
+
+        def acompanhar():
+            if concluido.empty():
+                self.root.after(INTERVALO_DRENAGEM_MS, acompanhar)
+                return
+            if dialog.winfo_exists():
+                dialog.destroy()
+            self._concluir_importacao(resultado)
+
+        threading.Thread(target=verificar_em_segundo_plano, daemon=True).start()
+        acompanhar()
+
+    def _concluir_importacao(self, resultado):
+        """Acrescenta os tickers aceitos de uma vez e informa os descartados."""
+        if resultado.novos:
+            self.config["acoes"].extend(resultado.novos)
+            self.listbox_acoes.insert(tk.END, *resultado.novos)
+            self.listbox_acoes.see(tk.END)
             self.atualizar_contador_acoes()
-            self.atualizar_status(f"🗑️ Ação {acao} removida com sucesso!", 100)
-        except (IndexError, ValueError):
-            messagebox.showwarning("Aviso", "Selecione uma ação para remover ou ação não encontrada na configuração.")
+        self.atualizar_status(f"📥 Importação: {resultado.resumo()}", 100)
+
+        detalhes = []
+        for titulo, tickers in (("Formato inválido", resultado.invalidos),
+                                ("Não encontrados no site", resultado.inexistentes),
+                                ("Não verificados (incluídos)", resultado.nao_verificados)):
+            if tickers:
+                exibidos = ", ".join(tickers[:20]) + (f" e mais {len(tickers) - 20}" if len(tickers) > 20 else "")
+                detalhes.append(f"{titulo}: {exibidos}")
+        if detalhes:
+            messagebox.showinfo("Importação de Ações", f"{resultado.resumo()}.\n\n" + "\n\n".join(detalhes))
 
     def atualizar_contador_acoes(self):
         num_acoes = len(self.config.get("acoes", []))
@@ -1378,8 +1685,8 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             self.config["headless"] = self.var_headless.get()
             self.config["tema"] = "escuro" if self.tema_escuro else "claro"
 
-            # Salvar no arquivo
-            self.salvar_config()
+            # Salvar no arquivo (gravação explícita é imediata; as demais são agrupadas)
+            self.salvar_config(imediato=mostrar_mensagem)
 
             if mostrar_mensagem:
                 self.atualizar_status("💾 Configurações salvas com sucesso!", 100)
@@ -1390,7 +1697,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
 
     def start_combined_extraction(self):
         """Inicia a extração combinada de dados de ações e carteiras."""
-        if not self.config["acoes"]:
+        if not acoes_da_execucao(self.config):
             messagebox.showwarning("Aviso", "Nenhuma ação configurada para a extração de dados de ações. A extração de carteiras prosseguirá se possível.")
 
         self.salvar_configuracoes(mostrar_mensagem=False)
@@ -1407,9 +1714,8 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
         # Atualizar ícone de status para indicar processamento
         self.lbl_icone_status.config(text="⏳")
 
-        # Executar a extração em uma thread separada
-        extraction_thread = threading.Thread(target=self.perform_combined_extraction_logic, daemon=True)
-        extraction_thread.start()
+        # Executar a extração em um processo separado
+        self.perform_combined_extraction_logic()
 
     def desabilitar_interface_durante_extracao(self, desabilitar=True):
         """Desabilita ou habilita elementos da interface durante a extração."""
@@ -1428,6 +1734,9 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
 
     def _toggle_widgets_recursively(self, widget, enabled):
         """Recursivamente habilita/desabilita widgets."""
+        # A aba de resultados continua navegável durante a extração
+        if isinstance(widget, PainelResultados):
+            return
         try:
             if hasattr(widget, 'configure'):
                 if isinstance(widget, (tk.Button, ttk.Button)):
@@ -1443,69 +1752,113 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
 
     def perform_combined_extraction_logic(self):
         """
-        Orquestra a lógica principal para a extração combinada de dados,
-        incluindo configuração do WebDriver, login (se necessário),
-        extração de dados de ações e carteiras, e processamento/exportação dos resultados.
+        Inicia a extração combinada (WebDriver, login, ações, carteiras e exportação)
+        em um processo de trabalho separado e passa a acompanhar suas mensagens.
+
+        A interface atua apenas como cliente: recebe status, resultados e erros pela
+        fila e repassa o cancelamento pelo evento compartilhado.
         """
-        data_acoes_list = []
-        data_carteiras_list = []
+        # Verificar se o cancelamento foi solicitado antes de começar
+        if self.verificar_cancelamento():
+            self.atualizar_status("Extração cancelada pelo usuário antes de iniciar.", 0)
+            self._finalizar_extracao()
+            return
 
         try:
-            # Verificar se o cancelamento foi solicitado antes de começar
-            if self.verificar_cancelamento():
-                self.atualizar_status("Extração cancelada pelo usuário antes de iniciar.", 0)
-                return
-
-            # Criar instância do extrator de dados
-            self.data_extractor = DataExtractor(
-                config=self.config,
-                status_callback=self.atualizar_status,
-                cancelamento_event=self.cancelar_extracao
+            contexto = contexto_multiprocessing()
+            self.fila_extracao = contexto.Queue()
+            self.evento_cancelamento_processo = contexto.Event()
+            self.processo_extracao = contexto.Process(
+                target=executar_extracao,
+                args=(dict(self.config), self.fila_extracao, self.evento_cancelamento_processo),
+                daemon=True
             )
+            self.processo_extracao.start()
+        except Exception as e:
+            messagebox.showerror("Erro na Extração Combinada", f"Não foi possível iniciar o processo de extração: {str(e)}")
+            self.atualizar_status(f"Erro geral na extração: {e}", 0)
+            self._finalizar_extracao()
+            return
 
-            # Configurar driver
-            self.data_extractor.setup_driver()
-
-            # Verificar cancelamento após configurar o driver
-            if self.verificar_cancelamento():
-                self.atualizar_status("Extração cancelada pelo usuário.", 0)
-                return
-
-            # Acessar site e aguardar login
-            self.data_extractor.access_site_and_await_login()
-
-            # Extrair Dados de Ações
-            if self.config.get("acoes"):
-                data_acoes_list = self.data_extractor.extract_stock_data()
-            else:
-                self.atualizar_status("Nenhuma ação configurada, pulando extração de dados de ações.", 60)
-
-            # Extrair Dados de Carteiras
-            data_carteiras_list = self.data_extractor.extract_portfolio_data()
-
-            # Processar e Exportar Resultados
-            self._process_and_export_data(data_acoes_list, data_carteiras_list)
+        self.root.after(INTERVALO_DRENAGEM_MS, self._acompanhar_extracao)
 
+    def _acompanhar_extracao(self):
+        """Lê as mensagens do processo de extração e reagenda até receber a mensagem de fim."""
+        finalizado = False
+        try:
+            for _ in range(MAX_MENSAGENS_POR_CICLO):
+                try:
+                    mensagem = self.fila_extracao.get_nowait()
+                except queue.Empty:
+                    break
+
+                tipo = mensagem[0]
+                if tipo == MSG_STATUS:
+                    self.canal_status.publicar(mensagem[1], mensagem[2])
+                elif tipo == MSG_RESULTADO:
+                    self._process_and_export_data(mensagem[1], mensagem[2])
+                elif tipo == MSG_EXPORTADO:
+                    messagebox.showinfo("Exportação Concluída", f"Dados exportados para:\n{mensagem[1]}")
+                elif tipo == MSG_ERRO:
+                    messagebox.showerror("Erro na Extração Combinada", f"Ocorreu um erro geral: {mensagem[1]}")
+                    self.canal_status.publicar(f"Erro geral na extração: {mensagem[1]}", 0)
+                elif tipo == MSG_ERROS_TICKERS:
+                    self.erros_extracao = (mensagem[1], mensagem[2])
+                elif tipo == MSG_FIM:
+                    finalizado = True
+                    break
+
+            if not finalizado and not self.processo_extracao.is_alive() and self.fila_extracao.empty():
+                # Processo terminou sem enviar a mensagem de fim (ex: falha do interpretador)
+                codigo = self.processo_extracao.exitcode
+                self.canal_status.publicar(f"Erro geral na extração: processo finalizado inesperadamente (código {codigo})", 0)
+                finalizado = True
         except Exception as e:
-            # Usar after para mostrar messagebox de forma thread-safe
-            self.root.after(0, lambda: messagebox.showerror("Erro na Extração Combinada", f"Ocorreu um erro geral: {str(e)}"))
-            self.atualizar_status(f"Erro geral na extração: {e}", 0)
-        finally:
-            if self.data_extractor:
-                self.data_extractor.cleanup()
-            # Ocultar botão de cancelamento
-            self.root.after(0, self.ocultar_botao_cancelar)
-            # Reabilitar interface de forma thread-safe
-            self.root.after(0, lambda: self.desabilitar_interface_durante_extracao(False))
-            # Reabilitar atalhos de teclado
-            self.root.after(0, self.habilitar_atalhos)
-            # Restaurar ícone de status
-            self.root.after(0, lambda: self.lbl_icone_status.config(text="ℹ️"))
+            import logging
+            logging.error(f"Erro ao acompanhar a extração: {e}")
+            finalizado = not self.processo_extracao.is_alive()
+
+        if finalizado:
+            self.processo_extracao.join(timeout=1)
+            cancelada = self.verificar_cancelamento()
+            self._finalizar_extracao()
+            if cancelada:
+                # Confirma que o processo de extração realmente parou
+                messagebox.showinfo("Extração Cancelada", "A extração foi cancelada pelo usuário.")
+            if self.erros_extracao:
+                erros, caminho = self.erros_extracao
+                self.erros_extracao = None
+                self._mostrar_erros_extracao(erros, caminho)
+        else:
+            self.root.after(INTERVALO_DRENAGEM_MS, self._acompanhar_extracao)
+
+    def _mostrar_erros_extracao(self, erros, caminho_excel=None):
+        """Mostra, uma única vez ao fim da execução, os tickers que falharam."""
+        linhas = [f"• {e['ticker']} ({e['etapa']}, {e['segundos']:.1f}s): {e['tipo']} - {e['mensagem'][:80]}"
+                  for e in erros[:15]]
+        if len(erros) > 15:
+            linhas.append(f"... e mais {len(erros) - 15}")
+        detalhe = ""
+        if caminho_excel:
+            detalhe = f"\n\nDetalhes na aba \"Erros\" e no relatório da execução:\n{os.path.splitext(caminho_excel)[0]}_relatorio.json"
+        messagebox.showwarning("Tickers com Erro",
+                               f"{len(erros)} ticker(s) não puderam ser extraídos:\n\n" + "\n".join(linhas) + detalhe)
+
+    def _finalizar_extracao(self):
+        """Restaura a interface ao término da extração."""
+        # Ocultar botão de cancelamento
+        self.ocultar_botao_cancelar()
+        # Reabilitar interface
+        self.desabilitar_interface_durante_extracao(False)
+        # Reabilitar atalhos de teclado
+        self.habilitar_atalhos()
+        # Restaurar ícone de status
+        self.lbl_icone_status.config(text="ℹ️")
 
     def _process_and_export_data(self, data_acoes_list, data_carteiras_list):
         """
-        Processa os dados extraídos de ações e carteiras, atualiza os DataFrames internos
-        e chama a função para exportar para Excel.
+        Processa os dados extraídos de ações e carteiras e atualiza os DataFrames internos.
+        A exportação para Excel é feita pelo processo de extração.
 
         Args:
             data_acoes_list (list): Lista de dados de ações.
@@ -1516,7 +1869,14 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             self.atualizar_status("Extração cancelada pelo usuário. Dados parciais não serão processados.", 0)
             return
 
-        self.atualizar_status("Processando resultados...", 95)
+        import pandas as pd
+
+        if data_carteiras_list:
+            self.exibir_resultados("Carteiras", data_carteiras_list)
+        if data_acoes_list:
+            self.exibir_resultados("Ações", data_acoes_list)
+        if data_acoes_list or data_carteiras_list:
+            self.notebook.select(self.painel_resultados)
 
         if data_acoes_list:
             self.df_acoes = pd.DataFrame(data_acoes_list)
@@ -1528,27 +1888,10 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
         else:
             self.df_carteiras = pd.DataFrame()
 
-        if self.verificar_cancelamento():
-            self.atualizar_status("Extração foi cancelada durante o processamento.", 0)
-        else:
-            self.atualizar_status("Extração combinada concluída!", 100)
-
-        if (data_acoes_list or data_carteiras_list) and not self.verificar_cancelamento():
-            # Executar exportação na thread principal
-            self.root.after(0, self.exportar_excel)
-        elif self.verificar_cancelamento():
-            # Usar after para mostrar messagebox de forma thread-safe
-            self.root.after(0, lambda: messagebox.showinfo("Extração Cancelada", "A extração foi cancelada pelo usuário."))
-        else:
-            # Usar after para mostrar messagebox de forma thread-safe
-            self.root.after(0, lambda: messagebox.showinfo("Extração Concluída", "Nenhum dado foi extraído (nem de ações, nem de carteiras)."))
+        self.canal_status.publicar("Extração combinada concluída!", 100)
 
-    def exportar_excel(self):
-        """Exporta os dados para Excel usando o DataExtractor."""
-        if self.data_extractor:
-            self.data_extractor.export_to_excel(self.df_acoes, self.df_carteiras)
-        else:
-            messagebox.showwarning("Aviso", "Extrator de dados não disponível para exportação.")
+        if not data_acoes_list and not data_carteiras_list:
+            messagebox.showinfo("Extração Concluída", "Nenhum dado foi extraído (nem de ações, nem de carteiras).")
 
     # Métodos para gerenciamento de colunas personalizadas
     def _criar_e_configurar_dialogo_coluna_ui(self, titulo_dialogo, coluna_existente=None):
@@ -1571,7 +1914,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
 
         # Centralizar a janela de diálogo
         dialog_width = 600
-        dialog_height = 280
+        dialog_height = 320
         root_x = self.root.winfo_x()
         root_y = self.root.winfo_y()
         root_width = self.root.winfo_width()
@@ -1583,7 +1926,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
         frame = tk.Frame(dialog, bg=self.cor_fundo)
         frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-        labels_texts = ["Nome:", "Tipo:", "Classe Busca:", "Classe Retorno:", "Seletor CSS:", "Formato Excel:"]
+        labels_texts = ["Nome:", "Tipo:", "Classe Busca:", "Classe Retorno:", "Seletor CSS:", "Rótulo:", "Formato Excel:"]
         entries = {}
         combos = {}
 
@@ -1592,13 +1935,14 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             "Nome:": "nome",
             "Classe Busca:": "classe_busca",
             "Classe Retorno:": "classe_retorno",
-            "Seletor CSS:": "seletor_css"
+            "Seletor CSS:": "seletor_css",
+            "Rótulo:": "rotulo"
         }
 
         for i, text in enumerate(labels_texts):
             tk.Label(frame, text=text, bg=self.cor_fundo, fg=self.cor_texto).grid(row=i, column=0, sticky=tk.W, pady=5)
             if text == "Tipo:":
-                combo_tipo = ttk.Combobox(frame, values=["simples", "avancado"], width=38)
+                combo_tipo = ttk.Combobox(frame, values=["simples", "avancado", "rotulo"], width=38)
                 combo_tipo.set(coluna_existente.get("tipo", "avancado") if coluna_existente else "avancado")
                 combo_tipo.grid(row=i, column=1, sticky=tk.EW, pady=5)
                 combos["tipo"] = combo_tipo
@@ -1622,7 +1966,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
         dialog, entries, combos = self._criar_e_configurar_dialogo_coluna_ui("Adicionar Coluna")
 
         frame_botoes = tk.Frame(dialog.winfo_children()[0], bg=self.cor_fundo)
-        frame_botoes.grid(row=6, column=0, columnspan=2, pady=15)
+        frame_botoes.grid(row=7, column=0, columnspan=2, pady=15)
 
         btn_cancelar = tk.Button(frame_botoes, text="Cancelar", command=dialog.destroy,
                                bg=self.cor_botao, fg=self.cor_texto)
@@ -1632,7 +1976,8 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
                              command=lambda: self.confirmar_adicionar_coluna(
                                  entries["nome"].get(), combos["tipo"].get(),
                                  entries["classe_busca"].get(), entries["classe_retorno"].get(),
-                                 entries["seletor_css"].get(), combos["formato_excel"].get(), dialog),
+                                 entries["seletor_css"].get(), combos["formato_excel"].get(), dialog,
+                                 entries["rotulo"].get()),
                              bg=self.cor_botao, fg=self.cor_texto)
         btn_salvar.pack(side=tk.LEFT, padx=5)
 
@@ -1640,7 +1985,8 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
         ToolTip(btn_cancelar, "Cancela a adição da coluna")
         ToolTip(btn_salvar, "Adiciona a nova coluna")
 
-    def confirmar_adicionar_coluna(self, nome, tipo, classe_busca, classe_retorno, seletor, formato_excel, dialog):
+    def confirmar_adicionar_coluna(self, nome, tipo, classe_busca, classe_retorno, seletor, formato_excel, dialog,
+                                   rotulo=""):
         """Confirma e adiciona a nova coluna à configuração e à Treeview."""
         if not nome:
             messagebox.showwarning("Aviso", "O nome da coluna é obrigatório", parent=dialog)
@@ -1652,11 +1998,13 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             "classe_busca": classe_busca,
             "classe_retorno": classe_retorno,
             "seletor_css": seletor,
+            "rotulo": rotulo,
             "formato_excel": formato_excel
         }
 
         self.config["colunas_personalizadas"].append(nova_coluna)
-        self.tree_colunas.insert("", tk.END, values=(nome, tipo, seletor, formato_excel))
+        self.tree_colunas.insert("", tk.END, values=(nome, tipo, self._descricao_origem_coluna(nova_coluna),
+                                                     formato_excel))
         dialog.destroy()
         self.atualizar_status(f"Coluna '{nome}' adicionada com sucesso!", 100)
 
@@ -1733,7 +2081,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             self.tree_colunas.insert("", tk.END, values=(
                 coluna["nome"],
                 coluna["tipo"],
-                coluna.get("seletor_css", ""),
+                self._descricao_origem_coluna(coluna),
                 coluna.get("formato_excel", "Texto")
             ))
 
@@ -1754,7 +2102,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             dialog, entries, combos = self._criar_e_configurar_dialogo_coluna_ui("Editar Coluna", coluna_para_editar)
 
             frame_botoes = tk.Frame(dialog.winfo_children()[0], bg=self.cor_fundo)
-            frame_botoes.grid(row=6, column=0, columnspan=2, pady=15)
+            frame_botoes.grid(row=7, column=0, columnspan=2, pady=15)
 
             btn_cancelar = tk.Button(frame_botoes, text="Cancelar", command=dialog.destroy,
                                    bg=self.cor_botao, fg=self.cor_texto)
@@ -1765,7 +2113,7 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
                                      indice_coluna, entries["nome"].get(), combos["tipo"].get(),
                                      entries["classe_busca"].get(), entries["classe_retorno"].get(),
                                      entries["seletor_css"].get(), combos["formato_excel"].get(),
-                                     item_selecionado, dialog),
+                                     item_selecionado, dialog, entries["rotulo"].get()),
                                  bg=self.cor_botao, fg=self.cor_texto)
             btn_salvar_edicao.pack(side=tk.LEFT, padx=5)
 
@@ -1776,7 +2124,8 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
         except IndexError:
             messagebox.showwarning("Aviso", "Selecione uma coluna para editar")
 
-    def confirmar_editar_coluna(self, indice, nome, tipo, classe_busca, classe_retorno, seletor, formato_excel, item, dialog):
+    def confirmar_editar_coluna(self, indice, nome, tipo, classe_busca, classe_retorno, seletor, formato_excel, item, dialog,
+                                rotulo=""):
         """Confirma e salva as alterações da coluna editada na configuração e na Treeview."""
         if not nome:
             messagebox.showwarning("Aviso", "O nome da coluna é obrigatório", parent=dialog)
@@ -1788,13 +2137,22 @@ Sua contribuição ajuda a manter o projeto ativo e a desenvolver novas funciona
             "classe_busca": classe_busca,
             "classe_retorno": classe_retorno,
             "seletor_css": seletor,
+            "rotulo": rotulo,
             "formato_excel": formato_excel
         })
 
-        self.tree_colunas.item(item, values=(nome, tipo, seletor, formato_excel))
+        coluna = self.config["colunas_personalizadas"][indice]
+        self.tree_colunas.item(item, values=(nome, tipo, self._descricao_origem_coluna(coluna), formato_excel))
         dialog.destroy()
         self.atualizar_status(f"Coluna '{nome}' editada com sucesso!", 100)
 
+    @staticmethod
+    def _descricao_origem_coluna(coluna):
+        """Texto da coluna "Seletor CSS" da lista: o rótulo para colunas por rótulo, senão o seletor."""
+        if coluna.get("tipo") == "rotulo" and coluna.get("rotulo"):
+            return f"🏷 {coluna['rotulo']}"
+        return coluna.get("seletor_css", "")
+
     def obter_indice_coluna(self, nome_coluna):
         """Obtém o índice de uma coluna na lista de configuração pelo nome."""
         for i, coluna in enumerate(self.config["colunas_personalizadas"]):
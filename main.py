@@ -10,41 +10,25 @@ importando as classes da interface e do extrator de dados.
 
 import tkinter as tk
 from tkinter import messagebox
-import json
 import os
+from config_store import obter_store
 from interface_app import InvestidorApp
 
+# Usado pelos benchmarks de inicialização: fecha a aplicação assim que a janela principal é exibida
+SAIR_APOS_INICIO = os.environ.get("INVESTIDOR10_SAIR_APOS_INICIO") == "1"
 
-def carregar_config():
-    """Carrega as configurações do arquivo config.json."""
-    arquivo_config = "config.json"
-    config_padrao = {
-        "acoes": [],
-        "colunas_personalizadas": [],
-        "headless": True,
-        "tema": "escuro",
-        "mostrar_mensagem_inicial": True
-    }
 
-    try:
-        if os.path.exists(arquivo_config):
-            with open(arquivo_config, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                # Adicionar chave mostrar_mensagem_inicial se não existir
-                if "mostrar_mensagem_inicial" not in config:
-                    config["mostrar_mensagem_inicial"] = True
-                return config
-        return config_padrao
-    except (json.JSONDecodeError, Exception):
-        return config_padrao
+def carregar_config():
+    """Carrega as configurações do arquivo config.json (leitura compartilhada com a interface)."""
+    return obter_store().carregar()
 
 
 def salvar_config(config):
     """Salva as configurações no arquivo config.json."""
-    arquivo_config = "config.json"
+    store = obter_store()
+    store.config = config
     try:
-        with open(arquivo_config, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=4)
+        store.salvar(imediato=True)
     except Exception as e:
         print(f"Erro ao salvar configurações: {e}")
 
@@ -215,7 +199,8 @@ def main():
 
         # Mostrar mensagem inicial antes de criar a aplicação
         root.withdraw()  # Ocultar janela principal temporariamente
-        mostrar_mensagem_inicial()
+        if not SAIR_APOS_INICIO:
+            mostrar_mensagem_inicial()
 
         # Inicializar aplicação (que configurará a geometria)
         app = InvestidorApp(root)
@@ -229,6 +214,9 @@ def main():
         # Garantir que a janela seja centralizada após ser mostrada
         root.after(100, app.centralizar_janela)
 
+        if SAIR_APOS_INICIO:
+            root.after_idle(root.destroy)
+
         # Iniciar loop principal da interface
         root.mainloop()
 
@@ -244,4 +232,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necessário para o processo de extração no executável gerado pelo PyInstaller
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
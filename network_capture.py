@@ -0,0 +1,194 @@
+"""
+Captura das respostas JSON que a própria página do FII carrega (gráficos).
+
+Os gráficos de dividendos e de cotação da página de cada fundo são
+alimentados por chamadas XHR que o navegador faz de qualquer forma durante o
+`driver.get`. Com o log de performance do Chrome habilitado, os eventos CDP
+`Network.responseReceived`/`Network.loadingFinished` dessas chamadas são lidos
+depois da extração das colunas e o corpo é obtido com
+`Network.getResponseBody` — séries completas sem nenhuma página a mais.
+
+Os endpoints são reconhecidos por expressões regulares na URL (configuráveis
+em `captura_rede_endpoints`) e cada payload é decodificado de forma tolerante:
+a primeira lista de objetos com um campo de data e um campo numérico vira a
+série [[data ISO, valor], ...], guardada depois pelo `SeriesStore`
+(series_store.py).
+"""
+
+import base64
+import json
+import logging
+import re
+import time
+from datetime import date, datetime, timezone
+
+from formatos import para_numero
+
+logger = logging.getLogger(__name__)
+
+# Nome da série -> expressão regular aplicada à URL da resposta
+ENDPOINTS_PADRAO = {
+    "dividendos": r"/api/fii/dividendos/",
+    "cotacoes": r"/api/fii/cotacoes/",
+}
+# Tempo máximo de espera pelo fim do download das respostas já iniciadas
+ESPERA_PADRAO_S = 2.0
+INTERVALO_POLLING_S = 0.1
+
+# Campos reconhecidos nos objetos das séries, em ordem de preferência
+CAMPOS_DATA = ("payment_date", "data_pagamento", "data_com", "date", "data", "created_at", "dt", "x")
+CAMPOS_VALOR = ("price", "valor", "value", "dividendo", "close", "preco", "y")
+
+_PADRAO_DATA_BR = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+_PADRAO_MES_BR = re.compile(r"^(\d{1,2})/(\d{4})$")
+
+
+def interpretar_data(valor):
+    """
+    Converte as datas encontradas nos payloads para `date`.
+
+    Aceita ISO ("2024-05-31", "2024-05-31T00:00:00Z"), "31/05/2024", "05/2024"
+    (primeiro dia do mês) e timestamps em segundos ou milissegundos.
+    """
+    if isinstance(valor, bool) or valor is None:
+        return None
+    if isinstance(valor, (int, float)):
+        segundos = valor / 1000 if valor > 1e11 else valor
+        try:
+            return datetime.fromtimestamp(segundos, tz=timezone.utc).date()
+        except (OverflowError, OSError, ValueError):
+            return None
+    texto = str(valor).strip()
+    try:
+        if _PADRAO_DATA_BR.match(texto):
+            dia, mes, ano = map(int, _PADRAO_DATA_BR.match(texto).groups())
+            return date(ano, mes, dia)
+        if _PADRAO_MES_BR.match(texto):
+            mes, ano = map(int, _PADRAO_MES_BR.match(texto).groups())
+            return date(ano, mes, 1)
+        return datetime.fromisoformat(texto[:10]).date()
+    except ValueError:
+        return None
+
+
+def _campo(objeto, candidatos):
+    for nome in candidatos:
+        if nome in objeto:
+            return nome
+    return None
+
+
+def _pontos_da_lista(itens):
+    """Pontos [data, valor] de uma lista de objetos, ou None se a lista não tiver o formato de série."""
+    if not itens or not all(isinstance(item, dict) for item in itens):
+        return None
+    campo_data = _campo(itens[0], CAMPOS_DATA)
+    campo_valor = _campo(itens[0], CAMPOS_VALOR)
+    if campo_data is None or campo_valor is None:
+        return None
+    pontos = {}
+    for item in itens:
+        dia = interpretar_data(item.get(campo_data))
+        valor = para_numero(item.get(campo_valor))
+        if dia is not None and valor is not None:
+            pontos[dia.isoformat()] = valor
+    return sorted([dia, valor] for dia, valor in pontos.items()) or None
+
+
+def decodificar_serie(payload):
+    """
+    Extrai a série de um payload JSON: a primeira lista de objetos (em largura,
+    na ordem das chaves) que tenha um campo de data e um numérico.
+
+    Returns:
+        list: [[data ISO, valor], ...] ordenados por data (vazia se nada for reconhecido)
+    """
+    fila = [payload]
+    while fila:
+        atual = fila.pop(0)
+        if isinstance(atual, list):
+            pontos = _pontos_da_lista(atual)
+            if pontos:
+                return pontos
+            fila.extend(item for item in atual if isinstance(item, (dict, list)))
+        elif isinstance(atual, dict):
+            fila.extend(valor for valor in atual.values() if isinstance(valor, (dict, list)))
+    return []
+
+
+class CapturaRede:
+    """Lê do log de performance do Chrome as respostas dos endpoints de séries."""
+
+    def __init__(self, endpoints=None, espera_s=ESPERA_PADRAO_S):
+        """
+        Args:
+            endpoints (dict): Nome da série -> regex da URL (padrão: ENDPOINTS_PADRAO)
+            espera_s (float): Espera máxima pelas respostas já recebidas mas ainda em download
+        """
+        self.endpoints = {nome: re.compile(padrao) for nome, padrao in (endpoints or ENDPOINTS_PADRAO).items()}
+        self.espera_s = espera_s
+
+    @staticmethod
+    def configurar_opcoes(chrome_options):
+        """Habilita o log de performance (eventos CDP de rede) nas opções do Chrome."""
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def _serie_da_url(self, url):
+        for nome, padrao in self.endpoints.items():
+            if padrao.search(url):
+                return nome
+        return None
+
+    def descartar(self, driver):
+        """Esvazia o log de performance (antes de navegar, para não misturar páginas)."""
+        driver.get_log("performance")
+
+    def coletar(self, driver):
+        """
+        Decodifica as séries das respostas registradas desde o último `coletar`/`descartar`.
+
+        Returns:
+            dict: Nome da série -> [[data ISO, valor], ...]
+        """
+        pendentes = {}
+        concluidas = set()
+        series = {}
+        prazo = time.monotonic() + self.espera_s
+        while True:
+            for entrada in driver.get_log("performance"):
+                try:
+                    mensagem = json.loads(entrada["message"])["message"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                metodo = mensagem.get("method")
+                parametros = mensagem.get("params", {})
+                if metodo == "Network.responseReceived":
+                    serie = self._serie_da_url(parametros.get("response", {}).get("url", ""))
+                    if serie:
+                        pendentes[parametros.get("requestId")] = serie
+                elif metodo in ("Network.loadingFinished", "Network.loadingFailed"):
+                    concluidas.add(parametros.get("requestId"))
+
+            for request_id in [r for r in pendentes if r in concluidas]:
+                serie = pendentes.pop(request_id)
+                pontos = self._decodificar_resposta(driver, request_id)
+                if pontos:
+                    series[serie] = pontos
+
+            if not pendentes or time.monotonic() >= prazo:
+                break
+            time.sleep(INTERVALO_POLLING_S)
+        return series
+
+    @staticmethod
+    def _decodificar_resposta(driver, request_id):
+        try:
+            corpo = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            texto = corpo.get("body", "")
+            if corpo.get("base64Encoded"):
+                texto = base64.b64decode(texto).decode("utf-8", errors="replace")
+            return decodificar_serie(json.loads(texto))
+        except Exception as e:
+            logger.debug(f"Resposta {request_id} ignorada: {e}")
+            return []
+
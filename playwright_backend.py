@@ -0,0 +1,195 @@
+"""
+Backend de navegador com o Playwright assíncrono (`motor_extracao: "playwright"`).
+
+O Playwright roda em um event loop próprio, em uma thread dedicada: as
+operações da interface (`BackendNavegador`) são síncronas para o extrator e
+cada uma é enviada ao loop. A extração das ações usa `extrair_paginas`, que
+carrega até `paginas_simultaneas` páginas ao mesmo tempo no mesmo contexto
+(mesmos cookies e login), cada uma com a sua própria fila de URLs.
+
+Requisições de recursos que não afetam o texto extraído (imagens, mídia,
+fontes, por padrão) são abortadas por uma rota do contexto antes de sair do
+navegador. As folhas de estilo não são bloqueadas: sem elas, elementos
+escondidos pelo CSS passariam a ser considerados visíveis.
+
+O contexto é persistente, no mesmo diretório de perfil do Selenium, e usa o
+Chrome instalado (canal "chrome") quando disponível, então o login feito em
+uma execução anterior continua valendo. O Playwright é opcional:
+    pip install playwright
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:  # Playwright é opcional: sem ele o extrator usa o Selenium
+    async_playwright = None
+    PlaywrightTimeoutError = None
+
+from browser_backend import BackendNavegador, TIMEOUT_NAVEGACAO_S, normalizar_cookie
+
+logger = logging.getLogger(__name__)
+
+PAGINAS_SIMULTANEAS_PADRAO = 4
+RECURSOS_BLOQUEADOS_PADRAO = ["image", "media", "font"]
+# Margem sobre os timeouts do Playwright para a espera do resultado na thread do extrator
+MARGEM_TIMEOUT_S = 10
+# Scripts no estilo do execute_script viram uma função chamada com a lista de argumentos
+FUNCAO_SCRIPT = "(args) => (function() {\n%s\n}).apply(null, args)"
+
+
+class BackendPlaywright(BackendNavegador):
+    """Contexto persistente do Playwright com várias páginas simultâneas e bloqueio de recursos."""
+
+    def __init__(self, perfil, headless=True, paginas=PAGINAS_SIMULTANEAS_PADRAO,
+                 bloquear=None, user_agent=None, janela=(1920, 1080), argumentos=()):
+        """
+        Args:
+            perfil (str): Diretório do perfil persistente (cookies e login)
+            headless (bool): Sem janela visível
+            paginas (int): Páginas carregando ao mesmo tempo em `extrair_paginas`
+            bloquear (list): Tipos de recurso abortados (resource_type do Playwright)
+            user_agent (str): User agent das páginas (None mantém o do navegador)
+            janela (tuple): Largura e altura da área da página
+            argumentos (iterable): Argumentos extras de linha de comando do Chrome
+        """
+        if async_playwright is None:
+            raise ImportError("O backend Playwright precisa do pacote playwright (pip install playwright)")
+        self.paginas_simultaneas = max(1, paginas)
+        self.bloquear = set(RECURSOS_BLOQUEADOS_PADRAO if bloquear is None else bloquear)
+        self.recursos_bloqueados = 0
+        self._playwright = None
+        self.contexto = None
+        self.pagina = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="playwright", daemon=True)
+        self._thread.start()
+        try:
+            self._executar(self._iniciar(perfil, headless, user_agent, janela, list(argumentos)))
+        except Exception:
+            self.fechar()
+            raise
+
+    def _executar(self, corrotina, timeout=TIMEOUT_NAVEGACAO_S + MARGEM_TIMEOUT_S):
+        """Executa uma corrotina no loop do Playwright e espera o resultado."""
+        futuro = asyncio.run_coroutine_threadsafe(corrotina, self._loop)
+        try:
+            return futuro.result(timeout)
+        except concurrent.futures.TimeoutError:
+            futuro.cancel()
+            raise
+
+    async def _iniciar(self, perfil, headless, user_agent, janela, argumentos):
+        self._playwright = await async_playwright().start()
+        opcoes = {
+            "headless": headless,
+            "args": argumentos,
+            "viewport": {"width": janela[0], "height": janela[1]},
+        }
+        if user_agent:
+            opcoes["user_agent"] = user_agent
+        try:
+            self.contexto = await self._playwright.chromium.launch_persistent_context(perfil, channel="chrome", **opcoes)
+        except Exception as e:
+            logger.warning(f"Chrome instalado indisponível para o Playwright, usando o Chromium dele: {e}")
+            self.contexto = await self._playwright.chromium.launch_persistent_context(perfil, **opcoes)
+        if self.bloquear:
+            await self.contexto.route("**/*", self._rotear)
+        self.pagina = self.contexto.pages[0] if self.contexto.pages else await self.contexto.new_page()
+
+    async def _rotear(self, rota):
+        if rota.request.resource_type in self.bloquear:
+            self.recursos_bloqueados += 1
+            await rota.abort()
+        else:
+            await rota.continue_()
+
+    @staticmethod
+    async def _navegar(pagina, url, timeout):
+        await pagina.goto(url, wait_until="load", timeout=timeout * 1000)
+
+    def navegar(self, url, timeout=TIMEOUT_NAVEGACAO_S):
+        self._executar(self._navegar(self.pagina, url, timeout), timeout + MARGEM_TIMEOUT_S)
+
+    async def _aguardar(self, seletor_css, timeout):
+        try:
+            await self.pagina.wait_for_selector(seletor_css, state="attached", timeout=timeout * 1000)
+        except PlaywrightTimeoutError:
+            raise TimeoutError(f"Elemento '{seletor_css}' não apareceu em {timeout}s") from None
+
+    def aguardar(self, seletor_css, timeout):
+        self._executar(self._aguardar(seletor_css, timeout), timeout + MARGEM_TIMEOUT_S)
+
+    def avaliar(self, script, *args):
+        return self._executar(self.pagina.evaluate(FUNCAO_SCRIPT % script, list(args)))
+
+    def cookies(self):
+        return [normalizar_cookie(cookie) for cookie in self._executar(self.contexto.cookies())]
+
+    def adicionar_cookies(self, cookies):
+        self._executar(self.contexto.add_cookies([normalizar_cookie(cookie) for cookie in cookies]))
+
+    def ativo(self):
+        try:
+            self._executar(self.pagina.evaluate("1"), MARGEM_TIMEOUT_S)
+            return True
+        except Exception:
+            return False
+
+    def extrair_paginas(self, urls, script, *args, cancelado=None, ao_concluir=None):
+        """Como em `BackendNavegador`, com até `paginas_simultaneas` páginas carregando ao mesmo tempo."""
+        tempo_maximo = (len(urls) / self.paginas_simultaneas + 1) * (TIMEOUT_NAVEGACAO_S + MARGEM_TIMEOUT_S)
+        corrotina = self._extrair_paginas(urls, FUNCAO_SCRIPT % script, list(args), cancelado, ao_concluir)
+        return self._executar(corrotina, tempo_maximo)
+
+    async def _extrair_paginas(self, urls, funcao, args, cancelado, ao_concluir):
+        resultados = [None] * len(urls)
+        fila = list(enumerate(urls))
+        fila.reverse()
+
+        async def trabalhador():
+            pagina = await self.contexto.new_page()
+            try:
+                while fila and not (cancelado and cancelado()):
+                    indice, url = fila.pop()
+                    inicio = time.perf_counter()
+                    try:
+                        await self._navegar(pagina, url, TIMEOUT_NAVEGACAO_S)
+                        valor = await pagina.evaluate(funcao, args)
+                        resultados[indice] = (valor, None, time.perf_counter() - inicio)
+                    except Exception as e:
+                        resultados[indice] = (None, e, time.perf_counter() - inicio)
+                    if ao_concluir:
+                        ao_concluir(indice)
+            finally:
+                try:
+                    await pagina.close()
+                except Exception as e:
+                    logger.debug(f"Erro ao fechar página: {e}")
+
+        await asyncio.gather(*(trabalhador() for _ in range(min(self.paginas_simultaneas, len(urls)))))
+        return resultados
+
+    async def _fechar(self):
+        try:
+            if self.contexto is not None:
+                await self.contexto.close()
+        finally:
+            if self._playwright is not None:
+                await self._playwright.stop()
+
+    def fechar(self):
+        try:
+            self._executar(self._fechar())
+        finally:
+            self._parar_loop()
+
+    def _parar_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=MARGEM_TIMEOUT_S)
+        if not self._thread.is_alive():
+            self._loop.close()
@@ -0,0 +1,427 @@
+"""
+Visualização dos resultados dentro da aplicação.
+
+A tabela é virtualizada: o `ttk.Treeview` tem apenas as linhas que cabem na
+tela, e rolar a tabela só troca os valores dessas linhas. Ordenação e filtros
+trabalham sobre índices em memória, então milhares de linhas (ou vários
+arquivos exportados) são navegados sem criar um item de widget por linha.
+
+Colunas em que a maioria dos valores é numérica ("R$ 10,50", "8,5%",
+"R$ 2,79 B") são ordenadas e filtradas pelo valor numérico. Números (ex: de
+um Excel exportado) são escritos no mesmo formato brasileiro dos valores
+extraídos, e os percentuais do Excel (frações) voltam para a escala do site
+("8,5%"), para que uma faixa de filtro signifique o mesmo em qualquer tabela.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from formatos import para_numero, para_texto
+
+# Fração mínima de valores numéricos para uma coluna ser tratada como numérica
+LIMIAR_COLUNA_NUMERICA = 0.8
+TAMANHO_AMOSTRA = 200
+ALTURA_LINHA_PADRAO = 20
+ALTURA_CABECALHO = 28
+ATRASO_FILTRO_MS = 150
+LARGURA_COLUNA = 110
+
+
+def linhas_de_registros(registros):
+    """
+    Converte uma lista de dicionários em (colunas, linhas).
+
+    As colunas seguem a ordem em que aparecem pela primeira vez; valores
+    ausentes (None/NaN) viram texto vazio.
+    """
+    colunas = list(dict.fromkeys(chave for registro in registros for chave in registro))
+    linhas = [[_texto(registro.get(coluna)) for coluna in colunas] for registro in registros]
+    return colunas, linhas
+
+
+def registros_de_planilha(df, formatos):
+    """
+    Registros de uma aba de Excel exportado (lida sem `dtype=str`).
+
+    As colunas numéricas com formato "Porcentagem" guardam frações (0.085);
+    voltam para o texto do site ("8,5%").
+
+    Args:
+        df (pd.DataFrame): Aba lida com `pd.read_excel`
+        formatos (dict): Coluna -> formato Excel
+    """
+    df = df.copy()
+    for coluna in df.columns:
+        # dtype.kind evita importar o pandas aqui (a interface o carrega só quando precisa)
+        if formatos.get(coluna) == "Porcentagem" and df[coluna].dtype.kind in "iuf":
+            df[coluna] = [None if valor != valor else f"{para_texto(valor * 100)}%" for valor in df[coluna]]
+    return df.to_dict("records")
+
+
+def _texto(valor):
+    if valor is None or (isinstance(valor, float) and valor != valor):
+        return ""
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return para_texto(valor)
+    return str(valor)
+
+
+class ModeloTabela:
+    """Linhas de uma tabela com a visão atual (ordem e filtros) como lista de índices."""
+
+    def __init__(self, colunas, linhas):
+        self.colunas = list(colunas)
+        self.linhas = linhas
+        self._numeros = {}
+        self._busca = None
+        self.colunas_numericas = [c for i, c in enumerate(self.colunas) if self._eh_numerica(i)]
+        self.ordenacao = None
+        self.decrescente = False
+        self.texto_filtro = ""
+        self.filtro_numerico = None
+        self._ordem = list(range(len(linhas)))
+        self.visao = list(self._ordem)
+
+    def __len__(self):
+        return len(self.visao)
+
+    def _valores_numericos(self, indice_coluna):
+        if indice_coluna not in self._numeros:
+            self._numeros[indice_coluna] = [para_numero(linha[indice_coluna]) for linha in self.linhas]
+        return self._numeros[indice_coluna]
+
+    def _eh_numerica(self, indice_coluna):
+        # Decide por uma amostra; a conversão da coluna inteira só acontece ao ordenar/filtrar
+        amostra = []
+        for linha in self.linhas:
+            if linha[indice_coluna] != "":
+                amostra.append(linha[indice_coluna])
+                if len(amostra) >= TAMANHO_AMOSTRA:
+                    break
+        if not amostra:
+            return False
+        numericos = sum(1 for valor in amostra if para_numero(valor) is not None)
+        return numericos >= LIMIAR_COLUNA_NUMERICA * len(amostra)
+
+    def linha(self, posicao):
+        """Valores da linha na posição `posicao` da visão atual."""
+        return self.linhas[self.visao[posicao]]
+
+    def ordenar(self, coluna, decrescente=False):
+        """Ordena pela coluna (numericamente nas colunas numéricas; vazios sempre no fim)."""
+        i = self.colunas.index(coluna)
+        if coluna in self.colunas_numericas:
+            valores = self._valores_numericos(i)
+            preenchidos = [n for n in range(len(self.linhas)) if valores[n] is not None]
+            vazios = [n for n in range(len(self.linhas)) if valores[n] is None]
+            preenchidos.sort(key=valores.__getitem__, reverse=decrescente)
+        else:
+            preenchidos = [n for n in range(len(self.linhas)) if self.linhas[n][i] != ""]
+            vazios = [n for n in range(len(self.linhas)) if self.linhas[n][i] == ""]
+            preenchidos.sort(key=lambda n: self.linhas[n][i].casefold(), reverse=decrescente)
+        self.ordenacao = coluna
+        self.decrescente = decrescente
+        self._ordem = preenchidos + vazios
+        self._aplicar_filtros()
+
+    def filtrar(self, texto="", coluna_numerica=None, minimo=None, maximo=None):
+        """
+        Filtra a visão por texto (em qualquer coluna) e por faixa de uma coluna numérica.
+
+        Args:
+            texto (str): Trecho procurado, sem diferenciar maiúsculas
+            coluna_numerica (str): Coluna do filtro de faixa (None desativa)
+            minimo (float): Limite inferior inclusivo (None = sem limite)
+            maximo (float): Limite superior inclusivo (None = sem limite)
+        """
+        self.texto_filtro = (texto or "").strip().casefold()
+        ativo = coluna_numerica in self.colunas_numericas and (minimo is not None or maximo is not None)
+        self.filtro_numerico = (coluna_numerica, minimo, maximo) if ativo else None
+        self._aplicar_filtros()
+
+    def _aplicar_filtros(self):
+        indices = self._ordem
+        if self.texto_filtro:
+            if self._busca is None:
+                self._busca = ["\t".join(linha).casefold() for linha in self.linhas]
+            indices = [n for n in indices if self.texto_filtro in self._busca[n]]
+        if self.filtro_numerico:
+            coluna, minimo, maximo = self.filtro_numerico
+            valores = self._valores_numericos(self.colunas.index(coluna))
+            indices = [n for n in indices if valores[n] is not None
+                       and (minimo is None or valores[n] >= minimo)
+                       and (maximo is None or valores[n] <= maximo)]
+        self.visao = list(indices)
+
+
+class TabelaVirtual(tk.Frame):
+    """Treeview com um número fixo de itens reaproveitados conforme a rolagem."""
+
+    def __init__(self, parent, estilo="Custom.Treeview", **kwargs):
+        super().__init__(parent, **kwargs)
+        self.modelo = None
+        self.inicio = 0
+        self._itens = []
+        self._selecionada = None
+        self._atualizando = False
+        self.ao_ordenar = None
+
+        # Altura mínima: a área visível vem do gerenciador de layout, não da quantidade de itens
+        self.tree = ttk.Treeview(self, show="headings", selectmode="browse", style=estilo, height=1)
+        self.barra = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._rolar)
+        self.barra_horizontal = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.barra_horizontal.set)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.barra.grid(row=0, column=1, sticky="ns")
+        self.barra_horizontal.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        try:
+            self.altura_linha = int(ttk.Style().lookup(estilo, "rowheight") or ALTURA_LINHA_PADRAO)
+        except (tk.TclError, ValueError):
+            self.altura_linha = ALTURA_LINHA_PADRAO
+
+        self.tree.bind("<Configure>", self._ao_redimensionar)
+        self.tree.bind("<MouseWheel>", self._ao_rodar_mouse)
+        self.tree.bind("<Button-4>", lambda e: self._rolar_linhas(-3))
+        self.tree.bind("<Button-5>", lambda e: self._rolar_linhas(3))
+        self.tree.bind("<Prior>", lambda e: self._rolar_linhas(-len(self._itens)))
+        self.tree.bind("<Next>", lambda e: self._rolar_linhas(len(self._itens)))
+        self.tree.bind("<Home>", lambda e: self._ir_para(0))
+        self.tree.bind("<End>", lambda e: self._ir_para(len(self.modelo or [])))
+        self.tree.bind("<Up>", lambda e: self._mover_selecao(-1))
+        self.tree.bind("<Down>", lambda e: self._mover_selecao(1))
+        self.tree.bind("<<TreeviewSelect>>", self._ao_selecionar)
+
+    def definir_modelo(self, modelo):
+        """Exibe um novo modelo (recria as colunas e volta ao topo)."""
+        self.modelo = modelo
+        self.inicio = 0
+        self._selecionada = None
+        self.tree.delete(*self._itens)
+        self._itens = []
+        self.tree.configure(columns=modelo.colunas)
+        for coluna in modelo.colunas:
+            numerica = coluna in modelo.colunas_numericas
+            self.tree.heading(coluna, text=coluna, command=lambda c=coluna: self._ao_clicar_cabecalho(c))
+            self.tree.column(coluna, width=LARGURA_COLUNA, minwidth=60, stretch=False,
+                             anchor=tk.E if numerica else tk.W)
+        self._ajustar_itens(self.tree.winfo_height())
+        self._atualizar_cabecalhos()
+        self.atualizar()
+
+    def atualizar(self):
+        """Redesenha as linhas visíveis a partir da visão atual do modelo."""
+        if self.modelo is None:
+            return
+        total = len(self.modelo)
+        self.inicio = max(0, min(self.inicio, total - len(self._itens)))
+        self._atualizando = True
+        try:
+            self.tree.selection_remove(self.tree.selection())
+            for deslocamento, item in enumerate(self._itens):
+                posicao = self.inicio + deslocamento
+                if posicao < total:
+                    self.tree.item(item, values=self.modelo.linha(posicao))
+                    if posicao == self._selecionada:
+                        self.tree.selection_set(item)
+                else:
+                    self.tree.item(item, values=())
+        finally:
+            self._atualizando = False
+        if total:
+            self.barra.set(self.inicio / total, min(1.0, (self.inicio + len(self._itens)) / total))
+        else:
+            self.barra.set(0.0, 1.0)
+
+    def _atualizar_cabecalhos(self):
+        for coluna in self.modelo.colunas:
+            seta = ""
+            if coluna == self.modelo.ordenacao:
+                seta = " ▼" if self.modelo.decrescente else " ▲"
+            self.tree.heading(coluna, text=f"{coluna}{seta}")
+
+    def _ao_clicar_cabecalho(self, coluna):
+        decrescente = coluna == self.modelo.ordenacao and not self.modelo.decrescente
+        self.modelo.ordenar(coluna, decrescente)
+        self._selecionada = None
+        self.inicio = 0
+        self._atualizar_cabecalhos()
+        self.atualizar()
+        if self.ao_ordenar:
+            self.ao_ordenar()
+
+    def _ajustar_itens(self, altura):
+        """Mantém exatamente um item por linha que cabe na área visível."""
+        quantidade = max(1, (altura - ALTURA_CABECALHO) // self.altura_linha)
+        if quantidade == len(self._itens):
+            return False
+        if quantidade > len(self._itens):
+            self._itens += [self.tree.insert("", tk.END, values=()) for _ in range(quantidade - len(self._itens))]
+        else:
+            self.tree.delete(*self._itens[quantidade:])
+            del self._itens[quantidade:]
+        return True
+
+    def _ao_redimensionar(self, event):
+        if self._ajustar_itens(event.height):
+            self.atualizar()
+
+    def _rolar(self, acao, quantidade, unidade=None):
+        """Comando da barra de rolagem (mesmo protocolo do yview dos widgets Tk)."""
+        if self.modelo is None:
+            return
+        if acao == "moveto":
+            self._ir_para(int(float(quantidade) * len(self.modelo)))
+        elif acao == "scroll":
+            passo = int(quantidade) * (len(self._itens) if unidade == "pages" else 1)
+            self._rolar_linhas(passo)
+
+    def _rolar_linhas(self, quantidade):
+        if self.modelo is not None:
+            self._ir_para(self.inicio + quantidade)
+        return "break"
+
+    def _ir_para(self, inicio):
+        self.inicio = inicio
+        self.atualizar()
+        return "break"
+
+    def _ao_rodar_mouse(self, event):
+        return self._rolar_linhas(-3 if event.delta > 0 else 3)
+
+    def _ao_selecionar(self, event=None):
+        if self._atualizando:
+            return
+        selecao = self.tree.selection()
+        if selecao and selecao[0] in self._itens:
+            posicao = self.inicio + self._itens.index(selecao[0])
+            self._selecionada = posicao if posicao < len(self.modelo or []) else None
+
+    def _mover_selecao(self, passo):
+        if self.modelo is None or not len(self.modelo):
+            return "break"
+        atual = self._selecionada if self._selecionada is not None else self.inicio - passo
+        self._selecionada = max(0, min(len(self.modelo) - 1, atual + passo))
+        if self._selecionada < self.inicio:
+            self.inicio = self._selecionada
+        elif self._selecionada >= self.inicio + len(self._itens):
+            self.inicio = self._selecionada - len(self._itens) + 1
+        self.atualizar()
+        return "break"
+
+
+class PainelResultados(tk.Frame):
+    """Aba de resultados: seleção da tabela, filtros e a tabela virtualizada."""
+
+    def __init__(self, parent, cores, abrir_arquivo=None, **kwargs):
+        """
+        Args:
+            parent: Widget pai
+            cores (dict): Cores da interface ("fundo", "texto", "texto_secundario", "entrada", "botao")
+            abrir_arquivo (callable): Chamado pelo botão "Abrir Excel..." (None oculta o botão)
+        """
+        super().__init__(parent, bg=cores["fundo"], **kwargs)
+        self.cores = cores
+        self.tabelas = {}
+        self._filtro_agendado = None
+
+        barra = tk.Frame(self, bg=cores["fundo"])
+        barra.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        self._label(barra, "Tabela:").pack(side=tk.LEFT)
+        self.combo_tabela = ttk.Combobox(barra, state="readonly", width=24, style="Custom.TCombobox")
+        self.combo_tabela.pack(side=tk.LEFT, padx=(5, 15))
+        self.combo_tabela.bind("<<ComboboxSelected>>", lambda e: self.mostrar(self.combo_tabela.get()))
+
+        self._label(barra, "Buscar:").pack(side=tk.LEFT)
+        self.entry_busca = self._entry(barra, 18)
+        self.entry_busca.pack(side=tk.LEFT, padx=(5, 15))
+
+        self._label(barra, "Faixa:").pack(side=tk.LEFT)
+        self.combo_coluna = ttk.Combobox(barra, state="readonly", width=16, style="Custom.TCombobox")
+        self.combo_coluna.pack(side=tk.LEFT, padx=(5, 5))
+        self.combo_coluna.bind("<<ComboboxSelected>>", lambda e: self._agendar_filtro())
+        self.entry_minimo = self._entry(barra, 8)
+        self.entry_minimo.pack(side=tk.LEFT)
+        self._label(barra, "a").pack(side=tk.LEFT, padx=3)
+        self.entry_maximo = self._entry(barra, 8)
+        self.entry_maximo.pack(side=tk.LEFT)
+
+        if abrir_arquivo is not None:
+            tk.Button(barra, text="📂 Abrir Excel...", command=abrir_arquivo,
+                      bg=cores["botao"], fg=cores["texto"], relief=tk.FLAT, padx=10).pack(side=tk.RIGHT)
+
+        for entry in (self.entry_busca, self.entry_minimo, self.entry_maximo):
+            entry.bind("<KeyRelease>", lambda e: self._agendar_filtro())
+
+        self.tabela = TabelaVirtual(self, bg=cores["fundo"])
+        self.tabela.pack(fill=tk.BOTH, expand=True, padx=10)
+        self.tabela.ao_ordenar = self._atualizar_contagem
+
+        self.lbl_contagem = tk.Label(self, text="Nenhum resultado ainda. Execute uma extração ou abra um Excel exportado.",
+                                     bg=cores["fundo"], fg=cores["texto_secundario"], anchor="w")
+        self.lbl_contagem.pack(fill=tk.X, padx=10, pady=(5, 10))
+
+    def _label(self, parent, texto):
+        return tk.Label(parent, text=texto, bg=self.cores["fundo"], fg=self.cores["texto"])
+
+    def _entry(self, parent, largura):
+        return tk.Entry(parent, width=largura, bg=self.cores["entrada"], fg=self.cores["texto"],
+                        relief=tk.FLAT, insertbackground=self.cores["texto"])
+
+    def definir_tabela(self, nome, colunas, linhas, mostrar=True):
+        """Adiciona ou substitui uma tabela disponível no seletor."""
+        if not colunas:
+            return
+        self.tabelas[nome] = ModeloTabela(colunas, linhas)
+        self.combo_tabela.configure(values=list(self.tabelas))
+        if mostrar or self.tabela.modelo is None:
+            self.mostrar(nome)
+
+    def remover_tabelas(self, prefixo):
+        """Remove as tabelas cujo nome começa com `prefixo` (ex: ao reabrir um arquivo)."""
+        for nome in [n for n in self.tabelas if n.startswith(prefixo)]:
+            del self.tabelas[nome]
+        self.combo_tabela.configure(values=list(self.tabelas))
+
+    def mostrar(self, nome):
+        modelo = self.tabelas.get(nome)
+        if modelo is None:
+            return
+        self.combo_tabela.set(nome)
+        self.combo_coluna.configure(values=[""] + modelo.colunas_numericas)
+        if self.combo_coluna.get() not in modelo.colunas_numericas:
+            self.combo_coluna.set("")
+        self._aplicar_filtro(modelo)
+        self.tabela.definir_modelo(modelo)
+        self._atualizar_contagem()
+
+    def _agendar_filtro(self):
+        # Filtra só quando a digitação pausa, em vez de a cada tecla
+        if self._filtro_agendado is not None:
+            self.after_cancel(self._filtro_agendado)
+        self._filtro_agendado = self.after(ATRASO_FILTRO_MS, self._filtrar_agora)
+
+    def _filtrar_agora(self):
+        self._filtro_agendado = None
+        if self.tabela.modelo is None:
+            return
+        self._aplicar_filtro(self.tabela.modelo)
+        self.tabela.inicio = 0
+        self.tabela.atualizar()
+        self._atualizar_contagem()
+
+    def _aplicar_filtro(self, modelo):
+        modelo.filtrar(self.entry_busca.get(), self.combo_coluna.get() or None,
+                       para_numero(self.entry_minimo.get().strip()), para_numero(self.entry_maximo.get().strip()))
+
+    def _atualizar_contagem(self):
+        modelo = self.tabela.modelo
+        if modelo is None:
+            return
+        texto = f"{len(modelo)} de {len(modelo.linhas)} linhas"
+        if modelo.ordenacao:
+            texto += f" · ordenado por {modelo.ordenacao} ({'decrescente' if modelo.decrescente else 'crescente'})"
+        self.lbl_contagem.config(text=texto)
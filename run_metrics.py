@@ -0,0 +1,189 @@
+"""
+Instrumentação de tempo das execuções do extrator.
+
+Registra o tempo de parede por etapa (inicialização do navegador, login,
+extração de ações, carteiras, exportação), por ticker e por caminho de
+fallback de cada coluna, além da contagem de round-trips ao WebDriver.
+Ao final da execução o relatório é gravado em JSON ao lado do Excel exportado.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class RunMetrics:
+    """Acumula as métricas de uma execução do DataExtractor."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.inicio = time.perf_counter()
+        self.iniciado_em = datetime.now().isoformat(timespec="seconds")
+        self.etapas = {}
+        self.tickers = {}
+        self.caminhos_colunas = {}
+        self.roundtrips = {}
+        self.erros = []
+        self.extras = {}
+
+    @contextmanager
+    def etapa(self, nome):
+        """Mede o tempo de parede de um bloco e acumula na etapa informada."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_etapa(nome, time.perf_counter() - inicio)
+
+    def registrar_etapa(self, nome, segundos):
+        """Acumula o tempo de uma etapa (etapas repetidas somam e contam chamadas)."""
+        with self._lock:
+            entrada = self.etapas.setdefault(nome, {"segundos": 0.0, "chamadas": 0})
+            entrada["segundos"] += segundos
+            entrada["chamadas"] += 1
+
+    def registrar_ticker(self, ticker, segundos):
+        """Registra o tempo total gasto em um ticker."""
+        with self._lock:
+            self.tickers[ticker] = self.tickers.get(ticker, 0.0) + segundos
+
+    def registrar_caminho_coluna(self, nome_coluna, caminho, segundos):
+        """
+        Registra por qual caminho uma coluna foi resolvida e quanto tempo levou.
+
+        Args:
+            nome_coluna (str): Nome da coluna personalizada
+            caminho (str): Caminho usado (ex: "js_lote", "js_individual", "espera_css", "tabela")
+            segundos (float): Tempo gasto no caminho
+        """
+        with self._lock:
+            por_caminho = self.caminhos_colunas.setdefault(nome_coluna, {})
+            entrada = por_caminho.setdefault(caminho, {"segundos": 0.0, "chamadas": 0})
+            entrada["segundos"] += segundos
+            entrada["chamadas"] += 1
+
+    def registrar_erro(self, ticker, etapa, excecao, segundos):
+        """
+        Registra a falha de um ticker sem interromper a execução.
+
+        Args:
+            ticker (str): Ticker que falhou
+            etapa (str): Etapa em que a falha ocorreu (ex: "navegacao", "carregamento", "colunas")
+            excecao (Exception): Exceção capturada
+            segundos (float): Tempo gasto no ticker até a falha
+
+        Returns:
+            dict: Entrada registrada
+        """
+        # Mensagens do Selenium trazem o stacktrace do chromedriver nas linhas seguintes
+        linhas = str(excecao).strip().splitlines()
+        mensagem = linhas[0].strip() if linhas else ""
+        if mensagem.startswith("Message:"):
+            mensagem = mensagem[len("Message:"):].strip()
+        entrada = {
+            "ticker": ticker,
+            "etapa": etapa,
+            "tipo": type(excecao).__name__,
+            "mensagem": mensagem[:300] or type(excecao).__name__,
+            "segundos": round(segundos, 3),
+        }
+        with self._lock:
+            self.erros.append(entrada)
+        return entrada
+
+    def contar_roundtrip(self, comando):
+        """Conta um round-trip ao WebDriver pelo nome do comando."""
+        with self._lock:
+            self.roundtrips[comando] = self.roundtrips.get(comando, 0) + 1
+
+    def instrumentar_driver(self, driver):
+        """
+        Envolve `driver.execute` para contar todos os comandos enviados ao chromedriver.
+
+        Todos os métodos do WebDriver e dos WebElements passam por `execute`,
+        então esse é o único ponto necessário para contar os round-trips.
+        """
+        # Um navegador reaproveitado entre execuções (agendador) é reinstrumentado
+        # a partir do execute original, para não contar os comandos em duplicidade
+        execute_original = getattr(driver, "_execute_sem_metricas", driver.execute)
+        driver._execute_sem_metricas = execute_original
+
+        def execute_contado(driver_command, params=None):
+            self.contar_roundtrip(driver_command)
+            return execute_original(driver_command, params)
+
+        driver.execute = execute_contado
+        return driver
+
+    def total_roundtrips(self):
+        with self._lock:
+            return sum(self.roundtrips.values())
+
+    def to_dict(self):
+        """Retorna o relatório da execução como dicionário serializável."""
+        with self._lock:
+            tempos_tickers = sorted(self.tickers.values())
+            relatorio = {
+                "iniciado_em": self.iniciado_em,
+                "duracao_total_s": round(time.perf_counter() - self.inicio, 3),
+                "etapas": {nome: {"segundos": round(e["segundos"], 3), "chamadas": e["chamadas"]}
+                           for nome, e in self.etapas.items()},
+                "tickers": {ticker: round(segundos, 3) for ticker, segundos in self.tickers.items()},
+                "tickers_resumo": {
+                    "quantidade": len(tempos_tickers),
+                    "media_s": round(sum(tempos_tickers) / len(tempos_tickers), 3) if tempos_tickers else 0.0,
+                    "max_s": round(tempos_tickers[-1], 3) if tempos_tickers else 0.0,
+                },
+                "caminhos_colunas": {
+                    coluna: {caminho: {"segundos": round(e["segundos"], 3), "chamadas": e["chamadas"]}
+                             for caminho, e in caminhos.items()}
+                    for coluna, caminhos in self.caminhos_colunas.items()
+                },
+                "roundtrips_webdriver": {
+                    "total": sum(self.roundtrips.values()),
+                    "por_comando": dict(sorted(self.roundtrips.items(), key=lambda item: -item[1])),
+                },
+                "erros": [dict(erro) for erro in self.erros],
+            }
+            relatorio.update(self.extras)
+        return relatorio
+
+    def salvar_relatorio(self, caminho_excel):
+        """
+        Grava o relatório em JSON ao lado do arquivo exportado.
+
+        Args:
+            caminho_excel (str): Caminho do Excel exportado (o JSON usa o mesmo nome com sufixo)
+
+        Returns:
+            str: Caminho do relatório gravado
+        """
+        base, _ = os.path.splitext(caminho_excel)
+        caminho_relatorio = f"{base}_relatorio.json"
+        with open(caminho_relatorio, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
+        return caminho_relatorio
+
+    def resumo(self):
+        """Resumo curto para a barra de status."""
+        relatorio = self.to_dict()
+        etapas = relatorio["etapas"]
+        partes = [f"⏱️ {relatorio['duracao_total_s']:.1f}s"]
+        qtd = relatorio["tickers_resumo"]["quantidade"]
+        if qtd:
+            partes.append(f"{qtd} tickers ({relatorio['tickers_resumo']['media_s']:.2f}s/ticker)")
+        for nome in ("setup_driver", "login", "acoes", "carteiras", "exportacao"):
+            if nome in etapas:
+                partes.append(f"{nome} {etapas[nome]['segundos']:.1f}s")
+        partes.append(f"{relatorio['roundtrips_webdriver']['total']} round-trips")
+        if relatorio.get("delta"):
+            delta = relatorio["delta"]
+            partes.append(f"Δ {delta['alterados']} alterados, {delta['novos']} novos, {delta['removidos']} removidos")
+        if relatorio["erros"]:
+            partes.append(f"❌ {len(relatorio['erros'])} tickers com erro")
+        if relatorio.get("seletores_ausentes"):
+            partes.append(f"⚠️ {len(relatorio['seletores_ausentes'])} seletores ausentes (ver relatório)")
+        return " | ".join(partes)
@@ -0,0 +1,473 @@
+"""
+Agendador de extrações periódicas.
+
+Executa o DataExtractor segundo regras no estilo cron definidas em
+"agendamentos" no config.json:
+
+    "agendamentos": [
+        {"nome": "Pregão", "cron": "0 10-17 * * 1-5", "apenas_pregao": true, "validade_min": 60}
+    ]
+
+- Regras com "apenas_pregao" (padrão) são puladas fora dos dias e horários de pregão da B3.
+- O navegador é mantido aberto entre execuções (sem nova inicialização e login a cada disparo).
+- Tickers coletados há menos de "validade_min" minutos, ou depois do último fechamento
+  com o mercado ainda fechado, não são extraídos de novo: o Excel usa os valores guardados.
+- Uma execução nunca se sobrepõe a outra: disparos que ocorrem durante uma execução são
+  descartados, e uma trava do sistema operacional sobre um arquivo impede execuções simultâneas
+  em processos diferentes (liberada automaticamente se o processo morrer).
+
+Uso pela linha de comando:
+    python scheduler.py                 # executa continuamente
+    python scheduler.py --agora         # executa a primeira regra uma vez e sai
+    python scheduler.py --proximas 5    # lista os próximos disparos
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from calendario_b3 import agora_b3, pregao_aberto, ultimo_fechamento
+from config_store import obter_store, acoes_da_execucao, ARQUIVO_CONFIG_PADRAO
+from extraction_worker import MSG_STATUS, MSG_EXPORTADO, MSG_ERRO, MSG_FIM, _criar_raiz_tk_oculta
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_ESTADO_PADRAO = os.path.join("cache", "agendador_estado.json")
+ARQUIVO_TRAVA_PADRAO = os.path.join("cache", "agendador.lock")
+VALIDADE_PADRAO_MIN = 60
+INTERVALO_VERIFICACAO_S = 30
+
+# Limites de cada campo do cron: minuto, hora, dia do mês, mês, dia da semana (0 = domingo)
+LIMITES_CRON = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+class RegraCron:
+    """Expressão cron de 5 campos (suporta *, listas, intervalos e passos)."""
+
+    def __init__(self, expressao):
+        campos = expressao.split()
+        if len(campos) != 5:
+            raise ValueError(f"Expressão cron deve ter 5 campos: '{expressao}'")
+        self.expressao = expressao
+        self.minutos, self.horas, self.dias, self.meses, self.dias_semana = (
+            self._interpretar_campo(campo, minimo, maximo if i != 4 else 7)
+            for i, (campo, (minimo, maximo)) in enumerate(zip(campos, LIMITES_CRON))
+        )
+        # 7 também representa o domingo
+        if 7 in self.dias_semana:
+            self.dias_semana = (self.dias_semana - {7}) | {0}
+        self.dia_restrito = campos[2] != "*"
+        self.semana_restrita = campos[4] != "*"
+
+    @staticmethod
+    def _interpretar_campo(campo, minimo, maximo):
+        valores = set()
+        for parte in campo.split(","):
+            intervalo, _, passo = parte.partition("/")
+            passo = int(passo) if passo else 1
+            if intervalo == "*":
+                inicio, fim = minimo, maximo
+            elif "-" in intervalo:
+                inicio, fim = (int(v) for v in intervalo.split("-", 1))
+            else:
+                inicio = int(intervalo)
+                fim = maximo if passo > 1 else inicio
+            if passo < 1 or inicio < minimo or fim > maximo or inicio > fim:
+                raise ValueError(f"Campo cron inválido: '{campo}'")
+            valores.update(range(inicio, fim + 1, passo))
+        return valores
+
+    def _dia_valido(self, momento):
+        dia_mes = momento.day in self.dias
+        dia_semana = (momento.weekday() + 1) % 7 in self.dias_semana
+        # Como no cron: com os dois campos restritos basta um deles coincidir
+        if self.dia_restrito and self.semana_restrita:
+            return dia_mes or dia_semana
+        return dia_mes and dia_semana
+
+    def proxima(self, apos):
+        """Próximo disparo estritamente depois de `apos` (resolução de minutos)."""
+        momento = apos.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limite = momento + timedelta(days=366 * 4)
+        while momento < limite:
+            if momento.month not in self.meses:
+                ano, mes = (momento.year + 1, 1) if momento.month == 12 else (momento.year, momento.month + 1)
+                momento = momento.replace(year=ano, month=mes, day=1, hour=0, minute=0)
+            elif not self._dia_valido(momento):
+                momento = (momento + timedelta(days=1)).replace(hour=0, minute=0)
+            elif momento.hour not in self.horas:
+                momento = (momento + timedelta(hours=1)).replace(minute=0)
+            elif momento.minute not in self.minutos:
+                momento += timedelta(minutes=1)
+            else:
+                return momento
+        raise ValueError(f"A expressão cron '{self.expressao}' não tem disparos")
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _travar_arquivo(arquivo):
+        # Trava o primeiro byte do arquivo (a região pode estar além do fim)
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _destravar_arquivo(arquivo):
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _travar_arquivo(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _destravar_arquivo(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+
+
+class TravaExecucao:
+    """
+    Trava que impede duas execuções simultâneas (mesmo em processos diferentes).
+
+    É uma trava do sistema operacional (fcntl.flock / msvcrt.locking) sobre o
+    arquivo aberto: se o processo morrer sem liberá-la (ex: aplicação fechada no
+    meio de uma extração), o sistema a libera junto com o processo.
+    """
+
+    def __init__(self, caminho=ARQUIVO_TRAVA_PADRAO):
+        self.caminho = caminho
+        self._arquivo = None
+
+    def adquirir(self):
+        """Tenta adquirir a trava sem bloquear. Retorna True em caso de sucesso."""
+        if self._arquivo is not None:
+            return True
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        arquivo = os.fdopen(os.open(self.caminho, os.O_RDWR | os.O_CREAT), 'r+', encoding='utf-8')
+        try:
+            _travar_arquivo(arquivo)
+        except OSError:
+            arquivo.close()
+            return False
+        # Apenas informativo: quem está com a trava
+        arquivo.truncate()
+        json.dump({"pid": os.getpid(), "criada_em": time.time()}, arquivo)
+        arquivo.flush()
+        self._arquivo = arquivo
+        return True
+
+    def liberar(self):
+        if self._arquivo is not None:
+            arquivo, self._arquivo = self._arquivo, None
+            try:
+                _destravar_arquivo(arquivo)
+            except OSError:
+                pass
+            arquivo.close()
+
+    def __enter__(self):
+        return self.adquirir()
+
+    def __exit__(self, *exc):
+        self.liberar()
+
+
+class EstadoColetas:
+    """Última coleta bem-sucedida de cada ticker (data e valores), persistida entre execuções."""
+
+    def __init__(self, caminho=ARQUIVO_ESTADO_PADRAO):
+        self.caminho = caminho
+        self.tickers = {}
+        if caminho and os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    self.tickers = json.load(f).get("tickers", {})
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Estado do agendador ignorado ({caminho}): {e}")
+
+    def atualizado(self, ticker, agora, validade, feriados_extras=None):
+        """
+        Indica se o ticker pode ser pulado nesta execução.
+
+        O ticker está atualizado se foi coletado há menos de `validade`, ou se foi
+        coletado depois do último fechamento e o pregão ainda não reabriu.
+        """
+        entrada = self.tickers.get(ticker)
+        if not entrada:
+            return False
+        coletado_em = datetime.fromisoformat(entrada["coletado_em"])
+        if agora - coletado_em < validade:
+            return True
+        return (not pregao_aberto(agora, feriados_extras)
+                and coletado_em >= ultimo_fechamento(agora, feriados_extras))
+
+    def registrar(self, dados_acoes, momento):
+        """Registra os tickers extraídos sem erro."""
+        for linha in dados_acoes:
+            if "Erro" not in linha:
+                self.tickers[linha["Ticker"]] = {"coletado_em": momento.isoformat(timespec="seconds"), "dados": linha}
+
+    def dados(self, ticker):
+        entrada = self.tickers.get(ticker)
+        return entrada["dados"] if entrada else None
+
+    def salvar(self):
+        """Persiste o estado de forma atômica."""
+        if not self.caminho:
+            return
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({"tickers": self.tickers}, f, ensure_ascii=False, indent=4)
+        os.replace(temporario, self.caminho)
+
+
+class Agendador:
+    """Dispara extrações segundo as regras de "agendamentos", reaproveitando o navegador."""
+
+    def __init__(self, caminho_config=ARQUIVO_CONFIG_PADRAO, status_callback=None, evento_parada=None,
+                 caminho_estado=ARQUIVO_ESTADO_PADRAO, caminho_trava=ARQUIVO_TRAVA_PADRAO):
+        """
+        Args:
+            caminho_config (str): Arquivo de configuração (relido quando modificado)
+            status_callback (callable): Função (mensagem, progresso) para o status
+            evento_parada (threading.Event | multiprocessing.Event): Encerra o laço e cancela a extração
+            caminho_estado (str): Arquivo com a última coleta de cada ticker
+            caminho_trava (str): Arquivo de trava contra execuções simultâneas
+        """
+        self.store = obter_store(caminho_config)
+        self.status_callback = status_callback or (lambda msg, prog=None: logger.info(msg))
+        self.evento_parada = evento_parada or threading.Event()
+        self.estado = EstadoColetas(caminho_estado)
+        self.trava = TravaExecucao(caminho_trava)
+        self._em_execucao = threading.Lock()
+        self.extrator = None
+
+    def regras(self):
+        """Regras válidas da configuração atual como (regra, RegraCron)."""
+        regras = []
+        for regra in self.store.carregar().get("agendamentos", []):
+            try:
+                regras.append((regra, RegraCron(regra["cron"])))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Agendamento ignorado ({regra!r}): {e}")
+        return regras
+
+    def proximo_disparo(self, agora):
+        """Retorna (momento, regra) do próximo disparo, ou (None, None) sem regras."""
+        proximos = [(cron.proxima(agora), regra) for regra, cron in self.regras()]
+        if not proximos:
+            return None, None
+        return min(proximos, key=lambda item: item[0])
+
+    def executar_laco(self):
+        """Executa até `evento_parada`, disparando as regras no horário (disparos perdidos não acumulam)."""
+        self.status_callback("⏰ Agendador iniciado.", None)
+        try:
+            while not self.evento_parada.is_set():
+                agora = agora_b3()
+                momento, regra = self.proximo_disparo(agora)
+                if momento is None:
+                    self.status_callback("⏰ Nenhum agendamento configurado em 'agendamentos'.", None)
+                    self.evento_parada.wait(INTERVALO_VERIFICACAO_S)
+                    continue
+
+                self.status_callback(f"⏰ Próxima execução: {momento:%d/%m %H:%M} ({regra.get('nome', regra['cron'])})", None)
+                # Espera em partes para acompanhar mudanças no config.json
+                espera = (momento - agora).total_seconds()
+                if espera > 0:
+                    self.evento_parada.wait(min(espera, INTERVALO_VERIFICACAO_S))
+                    if agora_b3() < momento:
+                        continue
+                if self.evento_parada.is_set():
+                    break
+                try:
+                    self.executar(regra)
+                except Exception as e:
+                    # Uma execução com falha não encerra o agendador: o próximo disparo abre um navegador novo
+                    logger.exception(f"Erro na execução agendada ({regra.get('nome', regra.get('cron'))})")
+                    self.status_callback(f"⏰ Erro na execução agendada: {e}", None)
+                    self._fechar_extrator()
+        finally:
+            self.encerrar()
+
+    def executar(self, regra, agora=None):
+        """
+        Executa uma regra agora, se nenhuma outra execução estiver em andamento.
+
+        Returns:
+            str | None: Caminho do Excel exportado, ou None se a execução foi pulada
+        """
+        agora = agora or agora_b3()
+        config = self.store.carregar()
+        feriados_extras = config.get("feriados_extras", [])
+        if regra.get("apenas_pregao", True) and not pregao_aberto(agora, feriados_extras):
+            self.status_callback(f"⏰ {agora:%d/%m %H:%M}: fora do horário de pregão, execução pulada.", None)
+            return None
+
+        if not self._em_execucao.acquire(blocking=False):
+            self.status_callback("⏰ Execução anterior ainda em andamento, disparo descartado.", None)
+            return None
+        try:
+            if not self.trava.adquirir():
+                self.status_callback("⏰ Outra extração está em andamento (trava em uso), disparo descartado.", None)
+                return None
+            try:
+                return self._executar(regra, dict(config), agora, feriados_extras)
+            finally:
+                self.trava.liberar()
+        finally:
+            self._em_execucao.release()
+
+    def _configuracao_da_regra(self, regra, config):
+        """Restringe a configuração às listas da regra, se ela as indicar."""
+        nomes = regra.get("listas")
+        if nomes:
+            config["listas"] = [lista for lista in config.get("listas", []) if lista["nome"] in nomes]
+            config["acoes"] = []
+        return config
+
+    def _obter_extrator(self, config):
+        """Retorna o extrator com navegador aberto, criando-o (e fazendo login) se necessário."""
+        if self.extrator is not None and not self.extrator.navegador_ativo():
+            logger.warning("Navegador do agendador não responde, iniciando outro.")
+            self._fechar_extrator()
+        if self.extrator is None:
+            from data_extractor import DataExtractor
+            self.extrator = DataExtractor(config=config, status_callback=self.status_callback,
+                                          cancelamento_event=self.evento_parada)
+            self.extrator.setup_driver()
+            self.extrator.access_site_and_await_login()
+        return self.extrator
+
+    def _executar(self, regra, config, agora, feriados_extras):
+        import pandas as pd
+
+        config = self._configuracao_da_regra(regra, config)
+        todas = acoes_da_execucao(config)
+        validade = timedelta(minutes=regra.get("validade_min", VALIDADE_PADRAO_MIN))
+        pendentes = [t for t in todas if not self.estado.atualizado(t, agora, validade, feriados_extras)]
+        self.status_callback(f"⏰ {regra.get('nome', regra['cron'])}: {len(pendentes)} de {len(todas)} tickers "
+                             "a atualizar.", 0)
+
+        extrator = self._obter_extrator(config)
+        extrator.preparar_execucao(config, acoes=pendentes)
+        extrator.metrics.extras["agendamento"] = {
+            "regra": regra.get("nome", regra["cron"]),
+            "tickers_total": len(todas),
+            "tickers_reaproveitados": len(todas) - len(pendentes),
+        }
+
+        dados_acoes = extrator.extract_stock_data() if pendentes else []
+        dados_carteiras = extrator.extract_portfolio_data() if regra.get("carteiras", True) else []
+        if self.evento_parada.is_set():
+            return None
+
+        self.estado.registrar(dados_acoes, agora)
+        self.estado.salvar()
+        extrator.miss_index.salvar()
+
+        # Tickers pulados entram no Excel com os valores da última coleta
+        extraidos = {linha["Ticker"]: linha for linha in dados_acoes}
+        linhas = [extraidos.get(t) or self.estado.dados(t) for t in todas]
+        linhas = [linha for linha in linhas if linha]
+        if not linhas and not dados_carteiras:
+            return None
+        return extrator.salvar_excel(pd.DataFrame(linhas), pd.DataFrame(dados_carteiras))
+
+    def _fechar_extrator(self):
+        if self.extrator is not None:
+            try:
+                self.extrator.cleanup()
+            except Exception as e:
+                logger.warning(f"Erro ao finalizar o navegador do agendador: {e}")
+            self.extrator = None
+
+    def encerrar(self):
+        """Fecha o navegador mantido entre execuções."""
+        self._fechar_extrator()
+        self.status_callback("⏰ Agendador encerrado.", None)
+
+
+def executar_agendador(caminho_config, fila, evento_parada):
+    """
+    Ponto de entrada do processo do agendador iniciado pela interface.
+
+    Usa o mesmo protocolo de mensagens do extraction_worker (status, exportado, erro, fim).
+    """
+    def status(mensagem, progresso=None):
+        fila.put((MSG_STATUS, mensagem, progresso))
+
+    class AgendadorComAvisos(Agendador):
+        def executar(self, regra, agora=None):
+            caminho = super().executar(regra, agora)
+            if caminho:
+                fila.put((MSG_EXPORTADO, caminho))
+            return caminho
+
+    raiz_tk = None
+    try:
+        agendador = AgendadorComAvisos(caminho_config, status_callback=status, evento_parada=evento_parada)
+        if not agendador.store.carregar().get("headless", True):
+            # Diálogos do extrator (ex: aviso de login) precisam de uma raiz Tk neste processo
+            raiz_tk = _criar_raiz_tk_oculta()
+        agendador.executar_laco()
+    except Exception as e:
+        logger.exception("Erro no agendador")
+        fila.put((MSG_ERRO, str(e)))
+    finally:
+        if raiz_tk is not None:
+            try:
+                raiz_tk.destroy()
+            except Exception:
+                pass
+        fila.put((MSG_FIM,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agendador de extrações do Investidor10")
+    parser.add_argument("--config", default=ARQUIVO_CONFIG_PADRAO)
+    parser.add_argument("--agora", action="store_true", help="Executa a primeira regra uma vez (ignora o horário)")
+    parser.add_argument("--proximas", type=int, metavar="N", help="Lista os próximos N disparos e sai")
+    args = parser.parse_args()
+
+    agendador = Agendador(args.config, status_callback=lambda msg, prog=None: print(msg))
+
+    if args.proximas:
+        momento = agora_b3()
+        for _ in range(args.proximas):
+            momento, regra = agendador.proximo_disparo(momento)
+            if momento is None:
+                print("Nenhum agendamento configurado.")
+                break
+            print(f"{momento:%a %d/%m/%Y %H:%M}  {regra.get('nome', regra['cron'])}")
+        return
+
+    if args.agora:
+        regras = agendador.regras()
+        regra = dict(regras[0][0]) if regras else {"nome": "manual", "cron": "* * * * *"}
+        regra["apenas_pregao"] = False
+        try:
+            caminho = agendador.executar(regra)
+            if caminho:
+                print(f"Exportado: {caminho}")
+        finally:
+            agendador.encerrar()
+        return
+
+    try:
+        agendador.executar_laco()
+    except KeyboardInterrupt:
+        agendador.evento_parada.set()
+
+
+if __name__ == "__main__":
+    main()
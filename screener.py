@@ -0,0 +1,377 @@
+"""
+Triagem (screener) dos dados extraídos.
+
+Critérios são expressões sobre as colunas tipadas do resultado, com nomes de
+coluna entre colchetes e percentuais escritos com "%":
+
+    [P/VP Atual] <= 1 e [DY (12M)] >= 10%
+    [DIVIDENDO EM 12M] > [Cotacao] * 0.1 ou não [Vacancia] < 2%
+
+As expressões são avaliadas de forma vetorizada sobre um DataFrame (ou
+qualquer conjunto de colunas numéricas) e também podem ser convertidas em
+fórmulas do Excel. Assim, as mesmas definições servem para:
+
+- as triagens salvas em "triagens" no config.json, exportadas como abas
+  ordenadas (ranking) no Excel;
+- as regras de formatação condicional das colunas ("regras_formatacao"),
+  que pintam de verde o valor bom e de vermelho o ruim.
+
+Uso pela linha de comando (sobre a última exportação ou um Excel exportado):
+    python screener.py --filtro "[P/VP Atual] < 0.95 e [DY (12M)] >= 12%" --ordenar -"DY (12M)"
+    python screener.py --triagem "Papel descontado" --arquivo Exports/FIIs_2026-01-02_18-00-00.xlsx
+"""
+
+import argparse
+import ast
+import copy
+import logging
+import re
+
+import pandas as pd
+
+from config_store import FORMATOS_NUMERICOS
+
+logger = logging.getLogger(__name__)
+
+# Regras de formatação condicional padrão: o valor da coluna é "bom" (verde) quando a
+# expressão é verdadeira e "ruim" (vermelho) quando "ruim" é verdadeira (padrão: o contrário de "bom")
+REGRAS_FORMATACAO_PADRAO = [
+    {"coluna": "P/VP Atual", "bom": "[P/VP Atual] <= 1"},
+    {"coluna": "DY ATUAL", "bom": "[DY ATUAL] > 1%", "ruim": "[DY ATUAL] < 1%"},
+    {"coluna": "DY (12M)", "bom": "[DY (12M)] >= 10%"},
+    {"coluna": "VALORIZAÇÃO 12M", "bom": "[VALORIZAÇÃO 12M] >= 10%"},
+    {"coluna": "Rentabilidade 1 mes", "bom": "[Rentabilidade 1 mes] >= 1%"},
+    {"coluna": "Rentabilidade 1 ano", "bom": "[Rentabilidade 1 ano] >= 10%"},
+    {"coluna": "Vacancia", "bom": "[Vacancia] < 2%"},
+    {"coluna": "DIVIDENDO EM 12M", "bom": "[DIVIDENDO EM 12M] > [Cotacao] * 0.1"},
+]
+
+_TOKEN = re.compile(r"\[([^\]]+)\]|(\d+(?:\.\d+)?)\s*%|\b(e|ou|não|nao)\b", re.IGNORECASE)
+_PALAVRAS = {"e": " and ", "ou": " or ", "não": " not ", "nao": " not "}
+_NOS_PERMITIDOS = (ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+                   ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Compare, ast.Eq, ast.NotEq,
+                   ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Name, ast.Load, ast.Constant)
+_OPERADORES_EXCEL = {ast.Eq: "=", ast.NotEq: "<>", ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=",
+                     ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+
+
+class ErroExpressao(ValueError):
+    """Expressão de triagem inválida."""
+
+
+class Expressao:
+    """Critério sobre colunas, avaliável de forma vetorizada e conversível em fórmula do Excel."""
+
+    def __init__(self, texto):
+        self.texto = texto
+        self.colunas = []
+
+        def substituir(match):
+            coluna, percentual, palavra = match.groups()
+            if coluna is not None:
+                coluna = coluna.strip()
+                if coluna not in self.colunas:
+                    self.colunas.append(coluna)
+                return f" __c{self.colunas.index(coluna)} "
+            if percentual is not None:
+                return repr(float(percentual) / 100)
+            return _PALAVRAS[palavra.lower()]
+
+        codigo = _TOKEN.sub(substituir, texto or "")
+        try:
+            self.arvore = ast.parse(codigo.strip(), mode="eval")
+        except SyntaxError:
+            raise ErroExpressao(f"Expressão inválida: '{texto}'")
+        for no in ast.walk(self.arvore):
+            if not isinstance(no, _NOS_PERMITIDOS):
+                raise ErroExpressao(f"Construção não permitida em '{texto}': {type(no).__name__}")
+            if isinstance(no, ast.Name) and not re.fullmatch(r"__c\d+", no.id):
+                raise ErroExpressao(f"Nome desconhecido em '{texto}': {no.id} (use [Coluna])")
+            if isinstance(no, ast.Constant) and (isinstance(no.value, bool) or not isinstance(no.value, (int, float))):
+                raise ErroExpressao(f"Valor não numérico em '{texto}': {no.value!r}")
+        self._codigo = compile(ast.fix_missing_locations(_Vetorizar().visit(copy.deepcopy(self.arvore))), "<triagem>", "eval")
+
+    def __repr__(self):
+        return f"Expressao({self.texto!r})"
+
+    def avaliar(self, dados):
+        """
+        Avalia a expressão sobre colunas numéricas.
+
+        Args:
+            dados: DataFrame ou dicionário coluna -> Series/array (valores ausentes = NaN)
+
+        Returns:
+            Série/array booleano (valores ausentes nunca atendem ao critério)
+        """
+        faltando = [coluna for coluna in self.colunas if coluna not in dados]
+        if faltando:
+            raise ErroExpressao(f"Colunas inexistentes em '{self.texto}': {', '.join(faltando)}")
+        ambiente = {f"__c{i}": dados[coluna] for i, coluna in enumerate(self.colunas)}
+        resultado = eval(self._codigo, {"__builtins__": {}}, ambiente)
+        # NaN != NaN: linhas com alguma coluna ausente ficam de fora (inclusive sob "não")
+        for valores in ambiente.values():
+            resultado = resultado & (valores == valores)
+        return resultado
+
+    def formula_excel(self, letras_colunas, linha):
+        """
+        Fórmula do Excel equivalente, relativa à primeira linha de dados.
+
+        Células vazias ou com texto nunca atendem ao critério, como na avaliação vetorizada.
+
+        Args:
+            letras_colunas (dict): Coluna -> letra no Excel
+            linha (int): Número da primeira linha de dados (a fórmula é relativa a ela)
+        """
+        referencias = [f"${letras_colunas[coluna]}{linha}" for coluna in self.colunas]
+        corpo = _formula(self.arvore.body, referencias)
+        guardas = [f"ISNUMBER({ref})" for ref in referencias]
+        return f"=AND({', '.join(guardas + [corpo])})"
+
+
+class _Vetorizar(ast.NodeTransformer):
+    """Troca and/or/not e comparações encadeadas por operadores elemento a elemento (&, |, ~)."""
+
+    def visit_BoolOp(self, no):
+        self.generic_visit(no)
+        operador = ast.BitAnd() if isinstance(no.op, ast.And) else ast.BitOr()
+        resultado = no.values[0]
+        for valor in no.values[1:]:
+            resultado = ast.BinOp(left=resultado, op=operador, right=valor)
+        return resultado
+
+    def visit_UnaryOp(self, no):
+        self.generic_visit(no)
+        if isinstance(no.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=no.operand)
+        return no
+
+    def visit_Compare(self, no):
+        self.generic_visit(no)
+        esquerda = no.left
+        pares = []
+        for operador, direita in zip(no.ops, no.comparators):
+            pares.append(ast.Compare(left=esquerda, ops=[operador], comparators=[direita]))
+            esquerda = direita
+        resultado = pares[0]
+        for par in pares[1:]:
+            resultado = ast.BinOp(left=resultado, op=ast.BitAnd(), right=par)
+        return resultado
+
+
+def _formula(no, referencias):
+    if isinstance(no, ast.Name):
+        return referencias[int(no.id[3:])]
+    if isinstance(no, ast.Constant):
+        return repr(no.value)
+    if isinstance(no, ast.BoolOp):
+        funcao = "AND" if isinstance(no.op, ast.And) else "OR"
+        return f"{funcao}({', '.join(_formula(v, referencias) for v in no.values)})"
+    if isinstance(no, ast.UnaryOp):
+        operando = _formula(no.operand, referencias)
+        if isinstance(no.op, ast.Not):
+            return f"NOT({operando})"
+        return f"-({operando})" if isinstance(no.op, ast.USub) else operando
+    if isinstance(no, ast.BinOp):
+        return f"({_formula(no.left, referencias)}{_OPERADORES_EXCEL[type(no.op)]}{_formula(no.right, referencias)})"
+    if isinstance(no, ast.Compare):
+        termos = [no.left] + list(no.comparators)
+        pares = [f"{_formula(a, referencias)}{_OPERADORES_EXCEL[type(op)]}{_formula(b, referencias)}"
+                 for a, op, b in zip(termos, no.ops, termos[1:])]
+        return pares[0] if len(pares) == 1 else f"AND({', '.join(pares)})"
+    raise ErroExpressao(f"Construção não suportada: {type(no).__name__}")
+
+
+def tipar_dataframe(df, formatos):
+    """
+    Converte as colunas numéricas (segundo o formato Excel de cada coluna) de texto para número.
+
+    Percentuais viram fração ("8,5%" -> 0.085), como no Excel exportado. Colunas
+    que não têm nenhum valor numérico são mantidas como estão, assim como as que
+    já são numéricas (reconvertê-las em texto trataria o ponto decimal como
+    separador de milhar: 8.521 viraria 8521).
+
+    Args:
+        df (pd.DataFrame): Dados como extraídos (texto no formato brasileiro)
+        formatos (dict): Coluna -> formato Excel ("Moeda", "Porcentagem"...)
+
+    Returns:
+        pd.DataFrame: Cópia com as colunas numéricas convertidas
+    """
+    df_processed = df.copy()
+    for col_name in df_processed.columns:
+        formato_excel = formatos.get(col_name, "Texto")
+
+        if formato_excel in FORMATOS_NUMERICOS and not pd.api.types.is_numeric_dtype(df_processed[col_name]):
+            original_series = df_processed[col_name].copy()
+            try:
+                current_col_as_str = df_processed[col_name].astype(str)
+                cleaned_col = current_col_as_str.str.replace('R$', '', regex=False).str.strip()
+                cleaned_col = cleaned_col.str.replace('%', '', regex=False).str.strip()
+                cleaned_col = cleaned_col.str.replace(r'\.(?=\d{3})', '', regex=True)
+                cleaned_col = cleaned_col.str.replace(',', '.', regex=False)
+
+                numeric_series = pd.to_numeric(cleaned_col, errors='coerce')
+
+                if formato_excel == "Porcentagem":
+                    df_processed[col_name] = numeric_series / 100.0
+                else:
+                    df_processed[col_name] = numeric_series
+
+                if df_processed[col_name].isnull().all():
+                    df_processed[col_name] = original_series
+            except Exception:
+                df_processed[col_name] = original_series
+    return df_processed
+
+
+def _numericas(df, colunas):
+    """Colunas do DataFrame como números (texto não numérico vira NaN)."""
+    return {coluna: pd.to_numeric(df[coluna], errors='coerce') for coluna in colunas if coluna in df.columns}
+
+
+class Triagem:
+    """Triagem salva: filtro, ordenação (ranking) e limite de resultados."""
+
+    def __init__(self, nome, filtro, ordenar=None, limite=None):
+        """
+        Args:
+            nome (str): Nome da triagem (vira o nome da aba no Excel)
+            filtro (str): Expressão do critério
+            ordenar (list): Colunas do ranking; prefixo "-" = decrescente (ex: ["-DY (12M)", "P/VP Atual"])
+            limite (int): Quantidade máxima de fundos no resultado
+        """
+        self.nome = nome
+        self.expressao = Expressao(filtro)
+        self.ordenar = [ordenar] if isinstance(ordenar, str) else list(ordenar or [])
+        self.limite = limite
+
+    @classmethod
+    def de_config(cls, definicao):
+        return cls(definicao["nome"], definicao["filtro"], definicao.get("ordenar"), definicao.get("limite"))
+
+    def aplicar(self, df_tipado):
+        """
+        Filtra e ordena os dados tipados.
+
+        Returns:
+            pd.Index: Índices das linhas aprovadas, na ordem do ranking
+        """
+        colunas_ordem = [(c[1:], False) if c.startswith("-") else (c, True) for c in self.ordenar]
+        dados = _numericas(df_tipado, self.expressao.colunas + [c for c, _ in colunas_ordem])
+        mascara = pd.Series(self.expressao.avaliar(dados), index=df_tipado.index).fillna(False).astype(bool)
+        aprovados = pd.DataFrame({c: v[mascara] for c, v in dados.items()}, index=df_tipado.index[mascara])
+
+        colunas_ordem = [(c, asc) for c, asc in colunas_ordem if c in aprovados.columns]
+        if colunas_ordem:
+            aprovados = aprovados.sort_values([c for c, _ in colunas_ordem],
+                                              ascending=[asc for _, asc in colunas_ordem],
+                                              na_position="last", kind="mergesort")
+        indices = aprovados.index
+        return indices[:self.limite] if self.limite else indices
+
+    def resultado(self, df, df_tipado):
+        """Linhas originais (sem tipagem) aprovadas, ordenadas e com a coluna "Posição"."""
+        resultado = df.loc[self.aplicar(df_tipado)].copy()
+        resultado.insert(0, "Posição", range(1, len(resultado) + 1))
+        return resultado
+
+
+def carregar_triagens(config):
+    """Triagens válidas de "triagens" no config.json (as inválidas são registradas e ignoradas)."""
+    triagens = []
+    for definicao in config.get("triagens", []):
+        try:
+            triagens.append(Triagem.de_config(definicao))
+        except (ErroExpressao, KeyError, TypeError) as e:
+            logger.warning(f"Triagem ignorada ({definicao!r}): {e}")
+    return triagens
+
+
+class RegraFormatacao:
+    """Formatação condicional de uma coluna: verde quando "bom", vermelho quando "ruim"."""
+
+    def __init__(self, coluna, bom, ruim=None):
+        self.coluna = coluna
+        self.bom = Expressao(bom)
+        self.ruim = Expressao(ruim) if ruim else None
+
+    def formulas_excel(self, letras_colunas, linha):
+        """
+        Fórmulas (bom, ruim) para a coluna, ou None se faltar alguma coluna usada.
+
+        Sem "ruim" explícito, ruim é o contrário de bom (apenas para células numéricas).
+        """
+        colunas = self.bom.colunas + (self.ruim.colunas if self.ruim else [])
+        if any(coluna not in letras_colunas for coluna in colunas):
+            return None
+        formula_bom = self.bom.formula_excel(letras_colunas, linha)
+        if self.ruim is not None:
+            formula_ruim = self.ruim.formula_excel(letras_colunas, linha)
+        else:
+            referencias = [f"${letras_colunas[c]}{linha}" for c in self.bom.colunas]
+            guardas = ", ".join(f"ISNUMBER({ref})" for ref in referencias)
+            formula_ruim = f"=AND({guardas}, NOT({formula_bom[1:]}))"
+        return formula_bom, formula_ruim
+
+
+def carregar_regras_formatacao(config):
+    """Regras de "regras_formatacao" do config.json, ou as regras padrão."""
+    regras = []
+    for definicao in config.get("regras_formatacao", REGRAS_FORMATACAO_PADRAO):
+        try:
+            regras.append(RegraFormatacao(definicao["coluna"], definicao["bom"], definicao.get("ruim")))
+        except (ErroExpressao, KeyError, TypeError) as e:
+            logger.warning(f"Regra de formatação ignorada ({definicao!r}): {e}")
+    return regras
+
+
+def _carregar_dados(arquivo, config):
+    """DataFrame da aba "Acoes" de um Excel exportado (já tipado) ou da última exportação."""
+    from config_store import montar_plano_extracao
+
+    if arquivo:
+        return pd.read_excel(arquivo, sheet_name="Acoes")
+    from delta import SnapshotExecucao, ARQUIVO_SNAPSHOT_PADRAO
+    snapshot = SnapshotExecucao(config.get("snapshot_execucao", ARQUIVO_SNAPSHOT_PADRAO))
+    df = pd.DataFrame([{"Ticker": t, **e.get("valores", {})} for t, e in snapshot.tickers.items()])
+    return tipar_dataframe(df, montar_plano_extracao(config.get("colunas_personalizadas")).formatos)
+
+
+def main():
+    from config_store import obter_store, ARQUIVO_CONFIG_PADRAO
+
+    parser = argparse.ArgumentParser(description="Triagem dos FIIs extraídos")
+    parser.add_argument("--config", default=ARQUIVO_CONFIG_PADRAO)
+    parser.add_argument("--arquivo", help="Excel exportado (padrão: valores da última exportação)")
+    parser.add_argument("--triagem", help="Nome de uma triagem salva em \"triagens\"")
+    parser.add_argument("--filtro", help="Expressão, ex: \"[P/VP Atual] < 1 e [DY (12M)] >= 10%%\"")
+    parser.add_argument("--ordenar", action="append", help="Coluna do ranking (prefixo - para decrescente)")
+    parser.add_argument("--limite", type=int)
+    args = parser.parse_args()
+
+    config = obter_store(args.config).carregar()
+    if args.triagem:
+        definicao = next((t for t in config.get("triagens", []) if t.get("nome") == args.triagem), None)
+        if definicao is None:
+            parser.error(f"Triagem não encontrada: {args.triagem}")
+        triagem = Triagem.de_config(definicao)
+    elif args.filtro:
+        triagem = Triagem("linha de comando", args.filtro, args.ordenar, args.limite)
+    else:
+        parser.error("Informe --triagem ou --filtro")
+
+    df = _carregar_dados(args.arquivo, config)
+    if df.empty:
+        print("Nenhum dado para triar.")
+        return
+    resultado = triagem.resultado(df, df)
+    colunas = ["Posição", "Ticker"] + [c for c in triagem.expressao.colunas + [o.lstrip("-") for o in triagem.ordenar]
+                                       if c in resultado.columns and c != "Ticker"]
+    print(resultado[list(dict.fromkeys(colunas))].to_string(index=False))
+    print(f"\n{len(resultado)} de {len(df)} fundos atendem à triagem '{triagem.nome}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Índice de seletores ausentes ("miss index").
+
+Quando um `seletor_css` configurado está errado ou o layout do site muda, cada
+ticker paga o custo completo dos fallbacks (JavaScript individual, espera de 3 s
+e buscas em tabela). Este índice lembra, por tipo de página, quais seletores
+falharam em K tickers consecutivos e passa a responder "N/A" imediatamente para
+eles, reavaliando o seletor periodicamente. O estado é persistido entre execuções.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_INDICE_PADRAO = os.path.join("cache", "indice_seletores.json")
+LIMITE_FALHAS_PADRAO = 3
+INTERVALO_REPROBE_PADRAO = 10
+
+
+class SelectorMissIndex:
+    """Registra acertos/falhas por seletor e decide quando pular os fallbacks."""
+
+    def __init__(self, caminho=ARQUIVO_INDICE_PADRAO, limite_falhas=LIMITE_FALHAS_PADRAO,
+                 intervalo_reprobe=INTERVALO_REPROBE_PADRAO):
+        """
+        Args:
+            caminho (str): Arquivo JSON de persistência (None desativa a persistência)
+            limite_falhas (int): Falhas consecutivas para considerar o seletor ausente
+            intervalo_reprobe (int): A cada quantos pulos o seletor é testado novamente
+        """
+        self.caminho = caminho
+        self.limite_falhas = max(1, int(limite_falhas))
+        self.intervalo_reprobe = max(1, int(intervalo_reprobe))
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self.pulos_execucao = {}
+        self.carregar()
+
+    @staticmethod
+    def _chave(seletor, tipo_pagina):
+        return f"{tipo_pagina}|{seletor}"
+
+    def carregar(self):
+        """Carrega o índice persistido, ignorando arquivos ausentes ou corrompidos."""
+        if not self.caminho or not os.path.exists(self.caminho):
+            return
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            if isinstance(dados, dict):
+                self._entradas = {chave: entrada for chave, entrada in dados.items() if isinstance(entrada, dict)}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Índice de seletores ignorado ({self.caminho}): {e}")
+
+    def salvar(self):
+        """Persiste o índice de forma atômica."""
+        if not self.caminho:
+            return
+        with self._lock:
+            dados = dict(self._entradas)
+        try:
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            temporario = f"{self.caminho}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(dados, f, ensure_ascii=False, indent=4)
+            os.replace(temporario, self.caminho)
+        except OSError as e:
+            logger.warning(f"Erro ao salvar índice de seletores: {e}")
+
+    def deve_pular(self, seletor, tipo_pagina="fii"):
+        """
+        Indica se os fallbacks do seletor devem ser pulados neste ticker.
+
+        Seletores considerados ausentes são pulados, exceto a cada
+        `intervalo_reprobe` pulos, quando são testados novamente.
+        """
+        chave = self._chave(seletor, tipo_pagina)
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if not entrada or entrada.get("falhas_consecutivas", 0) < self.limite_falhas:
+                return False
+            entrada["pulos"] = entrada.get("pulos", 0) + 1
+            if entrada["pulos"] % self.intervalo_reprobe == 0:
+                return False
+            self.pulos_execucao[chave] = self.pulos_execucao.get(chave, 0) + 1
+            return True
+
+    def registrar(self, seletor, encontrado, tipo_pagina="fii"):
+        """Registra o resultado de uma tentativa de extração do seletor."""
+        chave = self._chave(seletor, tipo_pagina)
+        with self._lock:
+            entrada = self._entradas.setdefault(chave, {"falhas_consecutivas": 0, "acertos": 0, "falhas": 0})
+            if encontrado:
+                entrada["acertos"] = entrada.get("acertos", 0) + 1
+                entrada["falhas_consecutivas"] = 0
+                entrada["pulos"] = 0
+            else:
+                entrada["falhas"] = entrada.get("falhas", 0) + 1
+                entrada["falhas_consecutivas"] = entrada.get("falhas_consecutivas", 0) + 1
+                entrada["ultima_falha"] = datetime.now().isoformat(timespec="seconds")
+
+    def seletores_ausentes(self):
+        """Lista os seletores atualmente considerados ausentes, para o relatório da execução."""
+        with self._lock:
+            ausentes = []
+            for chave, entrada in self._entradas.items():
+                if entrada.get("falhas_consecutivas", 0) >= self.limite_falhas:
+                    tipo_pagina, seletor = chave.split("|", 1)
+                    ausentes.append({
+                        "tipo_pagina": tipo_pagina,
+                        "seletor": seletor,
+                        "falhas_consecutivas": entrada["falhas_consecutivas"],
+                        "ultima_falha": entrada.get("ultima_falha"),
+                        "pulos_nesta_execucao": self.pulos_execucao.get(chave, 0),
+                    })
+            return sorted(ausentes, key=lambda item: -item["falhas_consecutivas"])
@@ -0,0 +1,339 @@
+"""
+Armazenamento colunar das séries de cotações e dividendos de todos os fundos.
+
+Cada série (ex: "cotacoes", "dividendos") fica em três arrays numpy contíguos,
+no layout CSR: `datas` (int64, dias desde 1970-01-01), `valores` (float64) e
+`offsets` (int64), em que os pontos do i-ésimo ticker são
+`datas[offsets[i]:offsets[i + 1]]`, em ordem de data. Os arquivos `.npy` são
+abertos com memory-map, e só a parte lida é carregada.
+
+Novas capturas acrescentam apenas os pontos posteriores ao último já guardado
+de cada ticker. A gravação é atômica: os arrays vão para arquivos de uma nova
+geração e o manifesto que aponta para eles é substituído por último.
+
+As consultas em janela (soma de dividendos em 12 meses, última cotação até
+uma data, DY móvel) são vetorizadas sobre todos os tickers de uma vez, com
+somas acumuladas e `searchsorted`, sem laço por ticker.
+
+Uso:
+    python series_store.py --dy12m [--data 2025-06-30]
+    python series_store.py --importar cache/series_capturadas.json
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+from datetime import date
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DIR_SERIES_PADRAO = os.path.join("cache", "series")
+ARQUIVO_MANIFESTO = "manifesto.json"
+DIAS_12_MESES = 365
+# Separa os tickers nas chaves (ticker, data) usadas pelas buscas vetorizadas
+_PASSO_CHAVE = np.int64(1 << 32)
+
+
+def dias_epoca(datas):
+    """Converte datas (ISO ou `date`) para dias desde 1970-01-01 (int64)."""
+    return np.asarray(datas, dtype="datetime64[D]").astype(np.int64)
+
+
+def data_iso(dias):
+    """Converte dias desde 1970-01-01 para texto ISO."""
+    return str(np.int64(dias).astype("datetime64[D]"))
+
+
+class SerieColunar:
+    """Pontos de todos os tickers de uma série em arrays contíguos (layout CSR)."""
+
+    def __init__(self, tickers, offsets, datas, valores):
+        self.tickers = list(tickers)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.datas = np.asarray(datas, dtype=np.int64)
+        self.valores = np.asarray(valores, dtype=np.float64)
+        self._posicoes = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._chaves = None
+
+    @classmethod
+    def vazia(cls):
+        return cls([], np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+    def __len__(self):
+        return len(self.datas)
+
+    def indice(self, ticker):
+        """Posição do ticker na série, ou None."""
+        return self._posicoes.get(ticker)
+
+    def pontos(self, ticker):
+        """(datas, valores) de um ticker, como visões dos arrays (vazios se ausente)."""
+        i = self.indice(ticker)
+        if i is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        inicio, fim = self.offsets[i], self.offsets[i + 1]
+        return self.datas[inicio:fim], self.valores[inicio:fim]
+
+    def ultimas_datas(self):
+        """Última data de cada ticker (-1 para tickers sem pontos)."""
+        tamanhos = np.diff(self.offsets)
+        ultimas = np.full(len(self.tickers), -1, dtype=np.int64)
+        com_pontos = tamanhos > 0
+        ultimas[com_pontos] = self.datas[self.offsets[1:][com_pontos] - 1]
+        return ultimas
+
+    def chaves(self):
+        """Chave (ticker, data) de cada ponto, crescente em todo o array."""
+        if self._chaves is None:
+            segmentos = np.repeat(np.arange(len(self.tickers), dtype=np.int64), np.diff(self.offsets))
+            self._chaves = segmentos * _PASSO_CHAVE + self.datas
+        return self._chaves
+
+    def somar_janela(self, fim, dias):
+        """Soma, por ticker, dos valores com data em (fim - dias, fim]."""
+        dentro = (self.datas > fim - dias) & (self.datas <= fim)
+        acumulado = np.concatenate(([0.0], np.cumsum(np.where(dentro, self.valores, 0.0))))
+        return acumulado[self.offsets[1:]] - acumulado[self.offsets[:-1]]
+
+    def ultimo_valor(self, ate):
+        """Último valor de cada ticker com data <= `ate` (NaN se não houver)."""
+        n = len(self.tickers)
+        alvo = np.arange(n, dtype=np.int64) * _PASSO_CHAVE + ate
+        posicoes = np.searchsorted(self.chaves(), alvo, side="right") - 1
+        validos = posicoes >= self.offsets[:-1]
+        resultado = np.full(n, np.nan)
+        resultado[validos] = self.valores[posicoes[validos]]
+        return resultado
+
+    def com_novos_pontos(self, novos):
+        """
+        Acrescenta os pontos posteriores ao último guardado de cada ticker.
+
+        Args:
+            novos (dict): Ticker -> (datas int64, valores float64)
+
+        Returns:
+            tuple: (SerieColunar nova, quantidade de pontos acrescentados)
+        """
+        ultimas = self.ultimas_datas()
+        posicoes, blocos_datas, blocos_valores = [], [], []
+        acrescimos = np.zeros(len(self.tickers), dtype=np.int64)
+        tickers_novos, offsets_novos, datas_novas, valores_novos = [], [], [], []
+
+        for ticker, (datas, valores) in novos.items():
+            datas = np.asarray(datas, dtype=np.int64)
+            valores = np.asarray(valores, dtype=np.float64)
+            ordem = np.argsort(datas, kind="stable")
+            datas, valores = datas[ordem], valores[ordem]
+            # Datas repetidas na captura: vale o último valor
+            unicas = np.append(datas[1:] != datas[:-1], True) if len(datas) else np.empty(0, dtype=bool)
+            datas, valores = datas[unicas], valores[unicas]
+
+            i = self.indice(ticker)
+            if i is None:
+                if len(datas):
+                    tickers_novos.append(ticker)
+                    offsets_novos.append(len(datas))
+                    datas_novas.append(datas)
+                    valores_novos.append(valores)
+                continue
+            recentes = datas > ultimas[i]
+            if recentes.any():
+                acrescimos[i] = recentes.sum()
+                posicoes.append(np.full(acrescimos[i], self.offsets[i + 1]))
+                blocos_datas.append(datas[recentes])
+                blocos_valores.append(valores[recentes])
+
+        datas_resultado, valores_resultado = self.datas, self.valores
+        if posicoes:
+            indices = np.concatenate(posicoes)
+            datas_resultado = np.insert(datas_resultado, indices, np.concatenate(blocos_datas))
+            valores_resultado = np.insert(valores_resultado, indices, np.concatenate(blocos_valores))
+        offsets = np.concatenate(([0], self.offsets[1:] + np.cumsum(acrescimos)))
+        if tickers_novos:
+            offsets = np.concatenate((offsets, offsets[-1] + np.cumsum(offsets_novos)))
+            datas_resultado = np.concatenate([datas_resultado] + datas_novas)
+            valores_resultado = np.concatenate([valores_resultado] + valores_novos)
+
+        total = int(acrescimos.sum()) + sum(offsets_novos)
+        return SerieColunar(self.tickers + tickers_novos, offsets, datas_resultado, valores_resultado), total
+
+
+class SeriesStore:
+    """Séries colunares persistidas em arquivos .npy (memory-mapped) por série."""
+
+    def __init__(self, diretorio=DIR_SERIES_PADRAO):
+        self.diretorio = diretorio
+        self._series = {}
+
+    def _dir_serie(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    def nomes(self):
+        """Séries existentes no diretório."""
+        if not os.path.isdir(self.diretorio):
+            return []
+        return sorted(nome for nome in os.listdir(self.diretorio)
+                      if os.path.exists(os.path.join(self._dir_serie(nome), ARQUIVO_MANIFESTO)))
+
+    def serie(self, nome):
+        """Série pelo nome (vazia se ainda não existir)."""
+        if nome not in self._series:
+            self._series[nome] = self._carregar(nome)
+        return self._series[nome]
+
+    def _carregar(self, nome):
+        diretorio = self._dir_serie(nome)
+        try:
+            with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), 'r', encoding='utf-8') as f:
+                manifesto = json.load(f)
+            geracao = manifesto["geracao"]
+            arrays = {campo: np.load(os.path.join(diretorio, f"{campo}.{geracao}.npy"), mmap_mode="r")
+                      for campo in ("offsets", "datas", "valores")}
+            return SerieColunar(manifesto["tickers"], arrays["offsets"], arrays["datas"], arrays["valores"])
+        except FileNotFoundError:
+            return SerieColunar.vazia()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Série '{nome}' ignorada ({diretorio}): {e}")
+            return SerieColunar.vazia()
+
+    def _gravar(self, nome, serie):
+        diretorio = self._dir_serie(nome)
+        os.makedirs(diretorio, exist_ok=True)
+        caminho_manifesto = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+        geracao = 1
+        if os.path.exists(caminho_manifesto):
+            with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+                geracao = json.load(f).get("geracao", 0) + 1
+
+        for campo in ("offsets", "datas", "valores"):
+            with open(os.path.join(diretorio, f"{campo}.{geracao}.npy"), 'wb') as f:
+                np.save(f, np.ascontiguousarray(getattr(serie, campo)))
+        temporario = f"{caminho_manifesto}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({"geracao": geracao, "tickers": serie.tickers, "pontos": len(serie)}, f, ensure_ascii=False)
+        os.replace(temporario, caminho_manifesto)
+
+        # Gerações anteriores (arquivos ainda mapeados no Windows ficam para a próxima gravação)
+        for caminho in glob.glob(os.path.join(diretorio, "*.npy")):
+            if not caminho.endswith(f".{geracao}.npy"):
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+
+    def acrescentar(self, nome, pontos_por_ticker):
+        """
+        Acrescenta à série os pontos novos de cada ticker e grava.
+
+        Args:
+            nome (str): Nome da série
+            pontos_por_ticker (dict): Ticker -> [[data ISO, valor], ...]
+
+        Returns:
+            int: Quantidade de pontos acrescentados
+        """
+        novos = {}
+        for ticker, pontos in pontos_por_ticker.items():
+            if pontos:
+                datas, valores = zip(*pontos)
+                novos[ticker] = (dias_epoca(list(datas)), np.asarray(valores, dtype=np.float64))
+        if not novos:
+            return 0
+        serie, acrescentados = self.serie(nome).com_novos_pontos(novos)
+        if acrescentados:
+            self._gravar(nome, serie)
+            self._series[nome] = serie
+        return acrescentados
+
+    def acrescentar_capturas(self, series_por_ticker):
+        """
+        Acrescenta as séries capturadas em uma execução (ver network_capture.py).
+
+        Args:
+            series_por_ticker (dict): Ticker -> {nome da série: [[data ISO, valor], ...]}
+
+        Returns:
+            dict: Nome da série -> pontos acrescentados
+        """
+        por_serie = {}
+        for ticker, series in series_por_ticker.items():
+            for nome, pontos in series.items():
+                por_serie.setdefault(nome, {})[ticker] = pontos
+        return {nome: self.acrescentar(nome, pontos) for nome, pontos in por_serie.items()}
+
+    def dy_12m(self, fim=None, dividendos="dividendos", cotacoes="cotacoes"):
+        """
+        Dividend yield de 12 meses de todos os tickers em uma data, em %.
+
+        Soma dos dividendos em (fim - 365 dias, fim] sobre a última cotação até `fim`.
+
+        Returns:
+            dict: Ticker -> DY (NaN sem cotação)
+        """
+        fim = int(dias_epoca(fim or date.today()))
+        serie_cotacoes = self.serie(cotacoes)
+        serie_dividendos = self.serie(dividendos)
+        precos = serie_cotacoes.ultimo_valor(fim)
+        somas = serie_dividendos.somar_janela(fim, DIAS_12_MESES)
+        indices = np.array([serie_dividendos.indice(t) if serie_dividendos.indice(t) is not None else -1
+                            for t in serie_cotacoes.tickers], dtype=np.int64)
+        somas_alinhadas = np.where(indices >= 0, somas[np.maximum(indices, 0)] if len(somas) else 0.0, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dy = np.where(precos > 0, somas_alinhadas / precos * 100, np.nan)
+        return dict(zip(serie_cotacoes.tickers, dy.tolist()))
+
+    def rendimento_movel(self, dias=DIAS_12_MESES, dividendos="dividendos", cotacoes="cotacoes"):
+        """
+        DY móvel em cada ponto de cotação: dividendos em (data - `dias`, data] / cotação, em %.
+
+        Returns:
+            SerieColunar: Mesmos tickers, offsets e datas da série de cotações
+        """
+        serie_cotacoes = self.serie(cotacoes)
+        serie_dividendos = self.serie(dividendos)
+        indices = np.array([serie_dividendos.indice(t) if serie_dividendos.indice(t) is not None else -1
+                            for t in serie_cotacoes.tickers], dtype=np.int64)
+        por_ponto = np.repeat(indices, np.diff(serie_cotacoes.offsets))
+
+        chaves = serie_dividendos.chaves()
+        acumulado = np.concatenate(([0.0], np.cumsum(serie_dividendos.valores)))
+        base = np.maximum(por_ponto, 0) * _PASSO_CHAVE
+        ate = np.searchsorted(chaves, base + serie_cotacoes.datas, side="right")
+        desde = np.searchsorted(chaves, base + serie_cotacoes.datas - dias, side="right")
+        somas = np.where(por_ponto >= 0, acumulado[ate] - acumulado[desde], 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rendimento = np.where(serie_cotacoes.valores > 0, somas / serie_cotacoes.valores * 100, np.nan)
+        return SerieColunar(serie_cotacoes.tickers, serie_cotacoes.offsets, serie_cotacoes.datas, rendimento)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Séries de cotações e dividendos capturadas")
+    parser.add_argument("--dir", default=DIR_SERIES_PADRAO)
+    parser.add_argument("--importar", help="JSON {ticker: {serie: [[data, valor], ...]}} a acrescentar")
+    parser.add_argument("--dy12m", action="store_true", help="DY de 12 meses de todos os tickers")
+    parser.add_argument("--data", help="Data de referência do DY (AAAA-MM-DD, padrão: hoje)")
+    args = parser.parse_args()
+
+    store = SeriesStore(args.dir)
+    if args.importar:
+        with open(args.importar, 'r', encoding='utf-8') as f:
+            acrescentados = store.acrescentar_capturas(json.load(f))
+        for nome, quantidade in acrescentados.items():
+            print(f"{nome}: {quantidade} pontos novos")
+
+    if args.dy12m:
+        for ticker, dy in sorted(store.dy_12m(args.data).items(), key=lambda item: -np.nan_to_num(item[1], nan=-1)):
+            print(f"{ticker}  {dy:6.2f}%" if dy == dy else f"{ticker}     -")
+    elif not args.importar:
+        for nome in store.nomes():
+            serie = store.serie(nome)
+            print(f"{nome}: {len(serie.tickers)} tickers, {len(serie)} pontos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Canal de status entre as threads de extração e a interface Tkinter.
+
+As threads de trabalho publicam mensagens e progresso a qualquer frequência;
+o canal guarda apenas a última mensagem e o último progresso informado. A
+interface drena o canal em um intervalo fixo (~20 Hz), de modo que a extração
+nunca espera por trabalho de UI e a fila de eventos do Tk não é inundada.
+"""
+
+import threading
+
+INTERVALO_DRENAGEM_MS = 50
+
+
+class StatusChannel:
+    """Slot thread-safe com a última mensagem de status e o último progresso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mensagem = None
+        self._progresso = None
+        self._pendente = False
+        self.publicadas = 0
+        self.descartadas = 0
+
+    def publicar(self, mensagem, progresso=None):
+        """
+        Publica uma mensagem de status (nunca bloqueia por trabalho de UI).
+
+        Args:
+            mensagem (str): Texto do status
+            progresso (float): Progresso de 0 a 100, ou None para manter o atual
+        """
+        with self._lock:
+            if self._pendente:
+                self.descartadas += 1
+            self._mensagem = mensagem
+            if progresso is not None:
+                self._progresso = progresso
+            self._pendente = True
+            self.publicadas += 1
+
+    def consumir(self):
+        """
+        Retira o status pendente, se houver.
+
+        Returns:
+            tuple | None: (mensagem, progresso) ou None se nada mudou desde a última leitura.
+                O progresso é None quando nenhuma das mensagens coalescidas o informou.
+        """
+        with self._lock:
+            if not self._pendente:
+                return None
+            item = (self._mensagem, self._progresso)
+            self._pendente = False
+            self._progresso = None
+            return item
@@ -0,0 +1,71 @@
+"""
+Abas de um mesmo Chrome usadas como pipeline de carregamento.
+
+Em vez de abrir vários navegadores, o modo de abas (`abas_paralelas` > 1)
+mantém K abas em uma única instância: a navegação de cada aba é iniciada sem
+bloquear (`location.href` via script, em vez de `driver.get`), e enquanto o
+DOM de uma aba é extraído as próximas páginas já estão carregando nas outras.
+As abas são atendidas na ordem em que foram abastecidas, então os resultados
+saem na ordem dos tickers.
+
+Para saber que a navegação terminou, o script de navegação marca o documento
+atual; a aba está pronta quando o documento não tem mais a marca (é a página
+nova) e `document.readyState` é "complete" — a mesma condição do `driver.get`.
+"""
+
+import logging
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_NAVEGAR = "window.__extratorNavegando = true; window.location.href = arguments[0];"
+SCRIPT_PRONTA = "return !window.__extratorNavegando && document.readyState === 'complete';"
+INTERVALO_VERIFICACAO_S = 0.05
+
+
+class PipelineAbas:
+    """K abas de um navegador com navegação não bloqueante."""
+
+    def __init__(self, driver, quantidade):
+        self.driver = driver
+        self.quantidade = max(1, quantidade)
+        self.abas = []
+
+    def abrir(self):
+        """Abre as abas extras (a aba atual é a primeira) e volta para a primeira."""
+        principal = self.driver.current_window_handle
+        self.abas = [principal]
+        for _ in range(self.quantidade - 1):
+            self.driver.switch_to.new_window('tab')
+            self.abas.append(self.driver.current_window_handle)
+        self.driver.switch_to.window(principal)
+        return self
+
+    def iniciar(self, aba, url):
+        """Começa a carregar `url` na aba, sem esperar o carregamento."""
+        self.driver.switch_to.window(aba)
+        self.driver.execute_script(SCRIPT_NAVEGAR, url)
+
+    def aguardar(self, aba, timeout):
+        """Torna a aba a atual e espera a página iniciada por `iniciar` terminar de carregar."""
+        self.driver.switch_to.window(aba)
+        WebDriverWait(self.driver, timeout, poll_frequency=INTERVALO_VERIFICACAO_S).until(
+            lambda driver: driver.execute_script(SCRIPT_PRONTA)
+        )
+
+    def fechar_extras(self):
+        """Fecha as abas extras e deixa a primeira como atual."""
+        if not self.abas:
+            return
+        for aba in self.abas[1:]:
+            try:
+                self.driver.switch_to.window(aba)
+                self.driver.close()
+            except Exception as e:
+                logger.debug(f"Erro ao fechar aba: {e}")
+        try:
+            self.driver.switch_to.window(self.abas[0])
+        except Exception as e:
+            logger.debug(f"Erro ao voltar para a aba principal: {e}")
+        self.abas = self.abas[:1]
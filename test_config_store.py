@@ -0,0 +1,68 @@
+"""Testes da validação e normalização da configuração (config_store.py)."""
+
+from config_store import config_padrao, normalizar_config
+
+
+def test_config_vazia_recebe_os_padroes():
+    config, avisos = normalizar_config({})
+    assert config == config_padrao()
+    assert avisos == []
+
+
+def test_campos_obrigatorios_invalidos_voltam_ao_padrao():
+    config, avisos = normalizar_config({"acoes": "MXRF11", "headless": "sim", "tema": "azul"})
+    assert config["acoes"] == [] and config["headless"] is True and config["tema"] == "escuro"
+    assert len(avisos) == 3
+
+
+def test_campos_opcionais_invalidos_sao_removidos():
+    config, avisos = normalizar_config({"abas_paralelas": True, "paginas_simultaneas": 0,
+                                        "reciclar_apos_paginas": "50", "base_url": "https://exemplo.com.br",
+                                        "comparar_execucoes": False, "reciclar_rss_mb": 800})
+    for nome in ("abas_paralelas", "paginas_simultaneas", "reciclar_apos_paginas"):
+        assert nome not in config
+    assert config["base_url"] == "https://exemplo.com.br"
+    assert config["comparar_execucoes"] is False and config["reciclar_rss_mb"] == 800
+    assert len(avisos) == 3
+
+
+def test_motor_de_extracao_desconhecido():
+    config, avisos = normalizar_config({"motor_extracao": "puppeteer"})
+    assert "motor_extracao" not in config and len(avisos) == 1
+    assert normalizar_config({"motor_extracao": "cdp"})[0]["motor_extracao"] == "cdp"
+
+
+def test_acoes_normalizadas_e_sem_duplicados():
+    config, avisos = normalizar_config({"acoes": [" mxrf11", "HGLG11", "MXRF11", "", None]})
+    assert config["acoes"] == ["MXRF11", "HGLG11"]
+    assert avisos == ["3 ticker(s) vazio(s) ou duplicado(s) removido(s)"]
+
+
+def test_colunas_personalizadas():
+    config, avisos = normalizar_config({"colunas_personalizadas": [
+        {"nome": " DY ", "seletor_css": " .dy ", "formato_excel": "Porcentagem"},
+        {"nome": "DY", "tipo": "simples"},
+        {"nome": "  "},
+        "P/VP",
+        {"nome": "Cotistas", "tipo": "rotulo", "rotulo": "Número de Cotistas", "formato_excel": "Inteiro"},
+    ]})
+    dy, cotistas = config["colunas_personalizadas"]
+    assert dy == {"nome": "DY", "tipo": "avancado", "classe_busca": "", "classe_retorno": "",
+                  "seletor_css": ".dy", "rotulo": "", "formato_excel": "Porcentagem"}
+    assert cotistas["tipo"] == "rotulo" and cotistas["formato_excel"] == "Texto"
+    assert len(avisos) == 3
+
+
+def test_chaves_desconhecidas_preservadas():
+    config, _ = normalizar_config({"minha_chave": {"a": 1}})
+    assert config["minha_chave"] == {"a": 1}
+
+
+def test_listas_referenciam_colunas_existentes():
+    config, avisos = normalizar_config({
+        "colunas_personalizadas": [{"nome": "DY"}],
+        "listas": [{"nome": " Papel ", "acoes": ["mxrf11"], "colunas": ["DY", "Vacância"]},
+                   {"nome": "Papel"}, {"acoes": ["HGLG11"]}],
+    })
+    assert config["listas"] == [{"nome": "Papel", "acoes": ["MXRF11"], "colunas": ["DY"]}]
+    assert len(avisos) == 3
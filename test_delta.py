@@ -0,0 +1,93 @@
+"""Testes da comparação entre execuções (delta.py)."""
+
+import pytest
+
+from delta import SnapshotExecucao, calcular_delta, delta_para_linhas, resumo_delta
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """Snapshot com a execução anterior de AAAA11, BBBB11 e CCCC11."""
+    snapshot = SnapshotExecucao(str(tmp_path / "ultima_execucao.json"))
+    calcular_delta(snapshot, [
+        {"Ticker": "AAAA11", "Cotacao": "R$ 10,00", "DY": "8,00%"},
+        {"Ticker": "BBBB11", "Cotacao": "R$ 20,00", "DY": "9,00%"},
+        {"Ticker": "CCCC11", "Cotacao": "R$ 30,00", "DY": "10,00%"},
+    ])
+    return snapshot
+
+
+def test_primeira_execucao_nao_reporta_novos(tmp_path):
+    snapshot = SnapshotExecucao(str(tmp_path / "ultima_execucao.json"))
+    delta = calcular_delta(snapshot, [{"Ticker": "AAAA11", "Cotacao": "R$ 10,00"}])
+    assert delta["novos"] == [] and delta["removidos"] == []
+    assert list(snapshot.tickers) == ["AAAA11"]
+
+
+def test_alterados_novos_e_removidos(snapshot):
+    delta = calcular_delta(snapshot, [
+        {"Ticker": "AAAA11", "Cotacao": "R$ 11,00", "DY": "8,00%"},
+        {"Ticker": "BBBB11", "Cotacao": "R$ 20,00", "DY": "9,00%"},
+        {"Ticker": "DDDD11", "Cotacao": "R$ 40,00", "DY": "7,00%"},
+    ], solicitados=["AAAA11", "BBBB11", "CCCC11", "DDDD11"])
+    assert delta["novos"] == ["DDDD11"]
+    assert delta["removidos"] == ["CCCC11"]
+    assert delta["sem_alteracao"] == 1
+    assert delta["alterados"] == [{"Ticker": "AAAA11", "Coluna": "Cotacao", "Anterior": "R$ 10,00",
+                                   "Atual": "R$ 11,00", "Variacao_%": 10.0}]
+    assert resumo_delta(delta) == {"alterados": 1, "valores_alterados": 1, "novos": 1, "removidos": 1,
+                                   "sem_alteracao": 1}
+
+
+def test_ticker_com_erro_mantem_valores_anteriores(snapshot):
+    anterior = snapshot.tickers["BBBB11"]
+    delta = calcular_delta(snapshot, [
+        {"Ticker": "AAAA11", "Cotacao": "R$ 10,00", "DY": "8,00%"},
+        {"Ticker": "BBBB11", "Erro": "TimeoutException: página não carregou"},
+        {"Ticker": "CCCC11", "Cotacao": "R$ 30,00", "DY": "10,00%"},
+    ])
+    assert delta["removidos"] == [] and delta["alterados"] == []
+    assert snapshot.tickers["BBBB11"] == anterior
+
+
+def test_erro_nan_de_dataframe_nao_conta_como_erro(snapshot):
+    delta = calcular_delta(snapshot, [{"Ticker": "AAAA11", "Cotacao": "R$ 12,00", "DY": "8,00%",
+                                       "Erro": float("nan")}], solicitados=["AAAA11"])
+    assert [a["Coluna"] for a in delta["alterados"]] == ["Cotacao"]
+
+
+def test_execucao_parcial_so_remove_solicitados(snapshot):
+    # Regra do agendador restrita a uma lista com AAAA11 e BBBB11: CCCC11 não foi visitado
+    delta = calcular_delta(snapshot, [{"Ticker": "AAAA11", "Cotacao": "R$ 10,00", "DY": "8,00%"}],
+                           solicitados=["AAAA11", "BBBB11"])
+    assert delta["removidos"] == ["BBBB11"]
+    assert sorted(snapshot.tickers) == ["AAAA11", "CCCC11"]
+
+    # A execução completa seguinte não reporta CCCC11 como novo
+    delta = calcular_delta(snapshot, [
+        {"Ticker": "AAAA11", "Cotacao": "R$ 10,00", "DY": "8,00%"},
+        {"Ticker": "CCCC11", "Cotacao": "R$ 30,00", "DY": "10,00%"},
+    ], solicitados=["AAAA11", "CCCC11"])
+    assert delta["novos"] == [] and delta["removidos"] == []
+    assert delta["sem_alteracao"] == 2
+
+
+def test_sem_solicitados_nada_e_removido(snapshot):
+    # Execução cancelada: apenas os tickers com linha são considerados
+    delta = calcular_delta(snapshot, [{"Ticker": "AAAA11", "Cotacao": "R$ 10,00", "DY": "8,00%"}])
+    assert delta["removidos"] == []
+    assert sorted(snapshot.tickers) == ["AAAA11", "BBBB11", "CCCC11"]
+
+
+def test_snapshot_persistido(snapshot):
+    snapshot.salvar("FIIs.xlsx")
+    recarregado = SnapshotExecucao(snapshot.caminho)
+    assert recarregado.tickers == snapshot.tickers
+    assert recarregado.arquivo_excel == "FIIs.xlsx"
+
+
+def test_linhas_da_aba_delta_com_variacao_em_fracao(snapshot):
+    delta = calcular_delta(snapshot, [{"Ticker": "AAAA11", "Cotacao": "R$ 11,00", "DY": "8,00%"}],
+                           solicitados=["AAAA11"])
+    assert delta_para_linhas(delta) == [{"Ticker": "AAAA11", "Tipo": "Alterado", "Coluna": "Cotacao",
+                                         "Anterior": "R$ 10,00", "Atual": "R$ 11,00", "Variação %": 0.1}]
@@ -0,0 +1,40 @@
+"""Testes da conversão dos textos extraídos para números (formatos.py)."""
+
+import pytest
+
+from formatos import para_numero, para_texto, variacao_percentual
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("R$ 1.234,56", 1234.56),
+    ("8,52%", 8.52),
+    ("-0,35%", -0.35),
+    ("R$ 2,79 B", 2.79e9),
+    ("1,2 Mil", 1200.0),
+    ("R$\xa010,50", 10.5),
+    ("1.234.567", 1234567.0),
+    ("42", 42.0),
+    (7, 7.0),
+    (0.95, 0.95),
+])
+def test_para_numero(valor, esperado):
+    assert para_numero(valor) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize("valor", [None, "", "N/A", "-", "abc", "1,2 xyz", True, float("nan")])
+def test_para_numero_nao_numerico(valor):
+    assert para_numero(valor) is None
+
+
+@pytest.mark.parametrize("numero, texto", [(0.95, "0,95"), (1234.5, "1234,5"), (12.0, "12"), (-0.0, "0"),
+                                            (2790000000.0, "2790000000"), (-3.25, "-3,25")])
+def test_para_texto_volta_para_o_mesmo_numero(numero, texto):
+    assert para_texto(numero) == texto
+    assert para_numero(texto) == pytest.approx(numero)
+
+
+def test_variacao_percentual():
+    assert variacao_percentual("R$ 10,00", "R$ 11,00") == pytest.approx(10.0)
+    assert variacao_percentual("-2", "-1") == pytest.approx(50.0)
+    assert variacao_percentual("0", "1") is None
+    assert variacao_percentual("N/A", "1") is None
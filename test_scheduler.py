@@ -0,0 +1,87 @@
+"""Testes das regras cron do agendador (scheduler.py) e do calendário da B3 (calendario_b3.py)."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from calendario_b3 import domingo_de_pascoa, eh_dia_pregao, feriados_b3, pregao_aberto, ultimo_fechamento
+from scheduler import EstadoColetas, RegraCron
+
+
+@pytest.mark.parametrize("expressao, apos, esperado", [
+    # Estritamente depois: no minuto exato do disparo, vale o próximo dia
+    ("30 18 * * *", datetime(2025, 1, 3, 18, 30), datetime(2025, 1, 4, 18, 30)),
+    ("30 18 * * *", datetime(2025, 1, 3, 18, 29, 59), datetime(2025, 1, 3, 18, 30)),
+    # Dias úteis: de sexta à noite para segunda
+    ("0 19 * * 1-5", datetime(2025, 1, 3, 19, 0), datetime(2025, 1, 6, 19, 0)),
+    # Passos e listas
+    ("*/15 10-11 * * *", datetime(2025, 1, 3, 11, 46), datetime(2025, 1, 4, 10, 0)),
+    ("0 9,17 * * *", datetime(2025, 1, 3, 9, 0), datetime(2025, 1, 3, 17, 0)),
+    # 7 também é domingo
+    ("0 8 * * 7", datetime(2025, 1, 3, 0, 0), datetime(2025, 1, 5, 8, 0)),
+    # Virada de mês e de ano
+    ("0 0 1 * *", datetime(2025, 12, 15, 12, 0), datetime(2026, 1, 1, 0, 0)),
+    ("0 12 29 2 *", datetime(2025, 3, 1, 0, 0), datetime(2028, 2, 29, 12, 0)),
+    # Dia do mês e da semana restritos: basta um coincidir (dia 10 ou qualquer segunda)
+    ("0 12 10 * 1", datetime(2025, 1, 7, 0, 0), datetime(2025, 1, 10, 12, 0)),
+    ("0 12 10 * 1", datetime(2025, 1, 10, 12, 0), datetime(2025, 1, 13, 12, 0)),
+])
+def test_proxima(expressao, apos, esperado):
+    assert RegraCron(expressao).proxima(apos) == esperado
+
+
+@pytest.mark.parametrize("expressao", ["0 18 * *", "60 * * * *", "0 24 * * *", "0 0 0 * *", "0 0 * 13 *",
+                                       "0 0 * * 8", "5-1 * * * *", "*/0 * * * *", "a * * * *"])
+def test_expressao_invalida(expressao):
+    with pytest.raises(ValueError):
+        RegraCron(expressao)
+
+
+def test_data_impossivel_nao_tem_disparo():
+    with pytest.raises(ValueError):
+        RegraCron("0 0 31 2 *").proxima(datetime(2025, 1, 1))
+
+
+def test_pascoa_e_feriados_moveis():
+    assert domingo_de_pascoa(2025) == date(2025, 4, 20)
+    assert domingo_de_pascoa(2024) == date(2024, 3, 31)
+    feriados = feriados_b3(2025)
+    for feriado in (date(2025, 3, 3), date(2025, 3, 4), date(2025, 4, 18), date(2025, 6, 19)):
+        assert feriado in feriados
+
+
+def test_consciencia_negra_a_partir_de_2024():
+    assert date(2024, 11, 20) in feriados_b3(2024)
+    assert date(2023, 11, 20) not in feriados_b3(2023)
+
+
+def test_feriados_extras():
+    assert eh_dia_pregao(date(2025, 7, 9))
+    assert not eh_dia_pregao(date(2025, 7, 9), extras=["2025-07-09"])
+    assert not eh_dia_pregao(datetime(2025, 1, 4, 12, 0))  # sábado
+
+
+def test_pregao_aberto():
+    assert pregao_aberto(datetime(2025, 1, 6, 10, 0))
+    assert not pregao_aberto(datetime(2025, 1, 6, 9, 59))
+    assert not pregao_aberto(datetime(2025, 1, 6, 18, 0))
+    assert not pregao_aberto(datetime(2025, 3, 4, 12, 0))  # Carnaval
+
+
+def test_ultimo_fechamento():
+    # Segunda depois do fechamento: o próprio dia
+    assert ultimo_fechamento(datetime(2025, 1, 6, 18, 0)) == datetime(2025, 1, 6, 18, 0)
+    # Segunda antes do fechamento: a sexta anterior
+    assert ultimo_fechamento(datetime(2025, 1, 6, 12, 0)) == datetime(2025, 1, 3, 18, 0)
+    # Quarta de cinzas cedo: pula o Carnaval e o fim de semana
+    assert ultimo_fechamento(datetime(2025, 3, 5, 9, 0)) == datetime(2025, 2, 28, 18, 0)
+
+
+def test_coleta_apos_fechamento_vale_ate_a_reabertura():
+    estado = EstadoColetas(caminho=None)
+    estado.registrar([{"Ticker": "AAAA11"}, {"Ticker": "BBBB11", "Erro": "falhou"}], datetime(2025, 1, 3, 19, 0))
+    validade = timedelta(minutes=60)
+    assert "BBBB11" not in estado.tickers
+    assert estado.atualizado("AAAA11", datetime(2025, 1, 3, 19, 30), validade)
+    assert estado.atualizado("AAAA11", datetime(2025, 1, 5, 12, 0), validade)
+    assert not estado.atualizado("AAAA11", datetime(2025, 1, 6, 10, 0), validade)
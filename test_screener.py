@@ -0,0 +1,71 @@
+"""Testes das expressões de triagem (screener.py)."""
+
+import math
+
+import pandas as pd
+import pytest
+
+from screener import ErroExpressao, Expressao, Triagem, tipar_dataframe
+
+
+@pytest.fixture
+def dados():
+    return pd.DataFrame({"P/VP": [0.9, 1.1, math.nan, 0.95], "DY": [0.12, 0.13, 0.20, 0.05]})
+
+
+def test_avaliacao_com_percentual_e_palavras(dados):
+    assert list(Expressao("[P/VP] <= 1 e [DY] >= 10%").avaliar(dados)) == [True, False, False, False]
+
+
+def test_nao_nunca_aprova_valores_ausentes(dados):
+    # A linha 2 tem P/VP ausente: fica de fora mesmo sob "não"
+    assert list(Expressao("não [P/VP] > 1").avaliar(dados)) == [True, False, False, True]
+    assert list(Expressao("não [DY] > 10%").avaliar(dados)) == [False, False, False, True]
+
+
+def test_comparacao_encadeada(dados):
+    assert list(Expressao("0.9 < [P/VP] <= 1.1").avaliar(dados)) == [False, True, False, True]
+
+
+def test_colunas_na_ordem_de_uso():
+    assert Expressao("[DY] > 0 and [P/VP] < [DY] * 10").colunas == ["DY", "P/VP"]
+
+
+@pytest.mark.parametrize("texto", [
+    "[P/VP] <=",                   # sintaxe
+    "[P/VP] < abs(1)",             # chamada de função
+    "[P/VP].real > 1",             # atributo
+    "[P/VP] < x",                  # nome solto
+    "__import__('os')",            # nome e chamada
+    "[P/VP] < 'um'",               # texto
+    "[P/VP] < True",               # booleano
+    "[P/VP] < [1][0]",             # subscrito
+    "lambda: 1",                   # lambda
+])
+def test_construcoes_rejeitadas(texto):
+    with pytest.raises(ErroExpressao):
+        Expressao(texto)
+
+
+def test_coluna_inexistente_na_avaliacao(dados):
+    with pytest.raises(ErroExpressao, match="Vacância"):
+        Expressao("[Vacância] < 5%").avaliar(dados)
+
+
+def test_formula_excel():
+    assert (Expressao("[P/VP] <= 1 e [DY] >= 10%").formula_excel({"P/VP": "B", "DY": "C"}, 2)
+            == "=AND(ISNUMBER($B2), ISNUMBER($C2), AND($B2<=1, $C2>=0.1))")
+    assert (Expressao("não [A] < 2 ou [B] > [A] * 0.1").formula_excel({"A": "B", "B": "C"}, 2)
+            == "=AND(ISNUMBER($B2), ISNUMBER($C2), OR(NOT($B2<2), $C2>($B2*0.1)))")
+    assert Expressao("1 < [A] <= 3").formula_excel({"A": "D"}, 5) == "=AND(ISNUMBER($D5), AND(1<$D5, $D5<=3))"
+
+
+def test_triagem_filtra_ordena_e_limita():
+    df = pd.DataFrame({"Ticker": ["AAAA11", "BBBB11", "CCCC11", "DDDD11"],
+                       "P/VP": ["0,90", "1,10", "N/A", "0,95"],
+                       "DY": ["12,00%", "13,00%", "20,00%", "11,00%"]})
+    tipado = tipar_dataframe(df, {"P/VP": "Decimal", "DY": "Porcentagem"})
+    triagem = Triagem("Baratos", "[P/VP] <= 1", ordenar=["-DY"], limite=1)
+    resultado = triagem.resultado(df, tipado)
+    assert list(resultado["Ticker"]) == ["AAAA11"]
+    assert list(resultado["Posição"]) == [1]
@@ -0,0 +1,99 @@
+"""Testes do armazenamento colunar de séries (series_store.py)."""
+
+import math
+
+import numpy as np
+import pytest
+
+from series_store import SerieColunar, SeriesStore, data_iso, dias_epoca
+
+
+def _pontos(serie, ticker):
+    datas, valores = serie.pontos(ticker)
+    return [data_iso(d) for d in datas], valores.tolist()
+
+
+@pytest.fixture
+def serie():
+    return SerieColunar.vazia().com_novos_pontos({
+        "AAAA11": (dias_epoca(["2025-01-02", "2025-01-03"]), [10.0, 10.5]),
+        "BBBB11": (dias_epoca(["2025-01-02"]), [20.0]),
+    })[0]
+
+
+def test_datas_ida_e_volta():
+    assert data_iso(dias_epoca("2025-06-30")) == "2025-06-30"
+    assert int(dias_epoca("1970-01-02")) == 1
+
+
+def test_acrescenta_so_pontos_posteriores(serie):
+    nova, total = serie.com_novos_pontos({
+        "AAAA11": (dias_epoca(["2025-01-03", "2025-01-06", "2025-01-02"]), [99.0, 11.0, 99.0]),
+        "BBBB11": (dias_epoca(["2025-01-03"]), [21.0]),
+    })
+    assert total == 2
+    assert _pontos(nova, "AAAA11") == (["2025-01-02", "2025-01-03", "2025-01-06"], [10.0, 10.5, 11.0])
+    assert _pontos(nova, "BBBB11") == (["2025-01-02", "2025-01-03"], [20.0, 21.0])
+    # A série original não é alterada
+    assert len(serie) == 3
+
+
+def test_data_repetida_na_captura_vale_o_ultimo_valor(serie):
+    nova, total = serie.com_novos_pontos({"BBBB11": (dias_epoca(["2025-01-07", "2025-01-07"]), [1.0, 2.0])})
+    assert total == 1
+    assert _pontos(nova, "BBBB11") == (["2025-01-02", "2025-01-07"], [20.0, 2.0])
+
+
+def test_ticker_novo_vai_para_o_fim(serie):
+    nova, total = serie.com_novos_pontos({"CCCC11": (dias_epoca(["2024-12-30"]), [30.0]),
+                                          "DDDD11": (np.empty(0, dtype=np.int64), [])})
+    assert total == 1
+    assert nova.tickers == ["AAAA11", "BBBB11", "CCCC11"]
+    assert nova.offsets.tolist() == [0, 2, 3, 4]
+    assert _pontos(nova, "CCCC11") == (["2024-12-30"], [30.0])
+
+
+def test_sem_novidades(serie):
+    nova, total = serie.com_novos_pontos({"AAAA11": (dias_epoca(["2025-01-03"]), [10.5])})
+    assert total == 0
+    assert nova.offsets.tolist() == serie.offsets.tolist()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SeriesStore(str(tmp_path / "series"))
+    store.acrescentar_capturas({
+        "AAAA11": {"cotacoes": [["2024-06-28", 100.0], ["2025-06-30", 80.0]],
+                   "dividendos": [["2024-06-15", 5.0], ["2024-07-15", 1.0], ["2025-06-15", 1.0]]},
+        "BBBB11": {"cotacoes": [["2025-06-30", 50.0]]},
+    })
+    return store
+
+
+def test_dy_12m(store):
+    dy = store.dy_12m("2025-06-30")
+    # Janela (2024-06-30, 2025-06-30]: 1,00 + 1,00 sobre a cotação de 80,00
+    assert dy["AAAA11"] == pytest.approx(2.5)
+    assert dy["BBBB11"] == 0.0
+
+
+def test_dy_12m_sem_cotacao_ate_a_data(store):
+    dy = store.dy_12m("2024-01-01")
+    assert math.isnan(dy["AAAA11"]) and math.isnan(dy["BBBB11"])
+
+
+def test_rendimento_movel_alinhado_com_as_cotacoes(store):
+    rendimento = store.rendimento_movel()
+    datas, valores = _pontos(rendimento, "AAAA11")
+    assert datas == ["2024-06-28", "2025-06-30"]
+    # 2024-06-28: só o dividendo de 2024-06-15 (5,00 / 100,00)
+    assert valores == pytest.approx([5.0, 2.5])
+    assert _pontos(rendimento, "BBBB11")[1] == [0.0]
+
+
+def test_persistencia_entre_instancias(store, tmp_path):
+    relido = SeriesStore(str(tmp_path / "series"))
+    assert relido.nomes() == ["cotacoes", "dividendos"]
+    assert _pontos(relido.serie("cotacoes"), "AAAA11") == (["2024-06-28", "2025-06-30"], [100.0, 80.0])
+    assert relido.acrescentar("cotacoes", {"AAAA11": [["2025-06-30", 80.0], ["2025-07-01", 81.0]]}) == 1
+    assert len(SeriesStore(str(tmp_path / "series")).serie("cotacoes")) == 4
@@ -0,0 +1,57 @@
+"""Testes da importação de tickers em lote (ticker_import.py)."""
+
+from ticker_import import candidatos_do_csv, candidatos_do_texto, classificar, verificar_existencia
+
+
+def test_candidatos_do_texto():
+    assert candidatos_do_texto("mxrf11, HGLG11;knri11\n  xpml11 | visc11\t") == [
+        "mxrf11", "HGLG11", "knri11", "xpml11", "visc11"]
+    assert candidatos_do_texto(None) == []
+
+
+def test_classificar():
+    resultado = classificar([" mxrf11", "HGLG11", "KNRI11", "mxrf11", "PETR4", "", "   ", "xpml11 "],
+                            existentes=["HGLG11"])
+    assert resultado.novos == ["MXRF11", "KNRI11", "XPML11"]
+    assert resultado.duplicados == ["HGLG11"]
+    # Inválidos mantêm o texto original (sem espaços) para o usuário reconhecer
+    assert resultado.invalidos == ["PETR4"]
+    assert resultado.resumo() == "3 novos, 1 já na lista, 1 inválidos"
+
+
+def test_classificar_rejeita_formatos_parecidos():
+    resultado = classificar(["MXRF12", "MXR11", "MXRFF11", "MXRF11B", "1XRF11"], existentes=[])
+    assert resultado.novos == []
+    assert resultado.invalidos == ["MXRF12", "MXR11", "MXRFF11", "MXRF11B", "1XRF11"]
+
+
+def test_candidatos_do_csv_com_cabecalho():
+    conteudo = "Nome;Código;Setor\nMaxi Renda;MXRF11;Papel\nCSHG Log;HGLG11;Logística\n"
+    assert candidatos_do_csv(conteudo) == ["MXRF11", "HGLG11"]
+
+
+def test_candidatos_do_csv_sem_cabecalho():
+    assert candidatos_do_csv("MXRF11,10.5\nHGLG11,160\n\n") == ["MXRF11", "HGLG11"]
+
+
+class _BuscadorFalso:
+    def __init__(self, existencias):
+        self.existencias = existencias
+        self.consultados = []
+
+    def existem(self, urls):
+        urls = list(urls)
+        self.consultados.extend(urls)
+        return {url: self.existencias.get(url.rstrip("/").rsplit("/", 1)[-1].upper()) for url in urls}
+
+
+def test_verificar_existencia():
+    resultado = classificar(["MXRF11", "ZZZZ11", "KNRI11", "HGLG11"], existentes=[])
+    buscador = _BuscadorFalso({"ZZZZ11": False, "KNRI11": None, "HGLG11": True})
+    verificar_existencia(resultado, "https://exemplo.com.br/", universo={"MXRF11": {}}, buscador=buscador)
+    # Tickers do universo da descoberta não são consultados
+    assert buscador.consultados == ["https://exemplo.com.br/fiis/zzzz11/", "https://exemplo.com.br/fiis/knri11/",
+                                    "https://exemplo.com.br/fiis/hglg11/"]
+    assert resultado.novos == ["MXRF11", "KNRI11", "HGLG11"]
+    assert resultado.inexistentes == ["ZZZZ11"]
+    assert resultado.nao_verificados == ["KNRI11"]
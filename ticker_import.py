@@ -0,0 +1,157 @@
+"""
+Importação de tickers em lote para a lista de ações.
+
+Aceita texto livre (colado ou da área de transferência) e arquivos CSV. Cada
+candidato é normalizado, validado pelo formato de ticker de FII, deduplicado
+contra a lista atual e, opcionalmente, tem a existência conferida no site
+antes de entrar na lista — assim erros de digitação aparecem na importação,
+e não como linhas "Erro" depois de uma extração inteira.
+
+A conferência de existência é barata: tickers presentes no universo salvo
+pela descoberta (`discovery.py`) não são consultados, e os demais são
+verificados em paralelo com requisições HEAD pelo `BuscadorHttp`.
+"""
+
+import csv
+import io
+import logging
+import re
+
+from config_store import normalizar_ticker
+
+logger = logging.getLogger(__name__)
+
+# Ticker de FII: quatro letras seguidas de 11
+PADRAO_TICKER = re.compile(r"^[A-Z]{4}11$")
+SEPARADORES = re.compile(r"[\s,;|]+")
+# Nomes de coluna reconhecidos como a coluna de tickers em um CSV
+COLUNAS_TICKER = {"ticker", "tickers", "codigo", "código", "ativo", "acao", "ação", "fii", "papel"}
+
+
+class ResultadoImportacao:
+    """Classificação dos candidatos de uma importação."""
+
+    def __init__(self):
+        self.novos = []
+        self.duplicados = []
+        self.invalidos = []
+        self.inexistentes = []
+        self.nao_verificados = []
+
+    def resumo(self):
+        """Texto curto para a barra de status e o diálogo de confirmação."""
+        partes = [f"{len(self.novos)} novos"]
+        if self.duplicados:
+            partes.append(f"{len(self.duplicados)} já na lista")
+        if self.invalidos:
+            partes.append(f"{len(self.invalidos)} inválidos")
+        if self.inexistentes:
+            partes.append(f"{len(self.inexistentes)} inexistentes")
+        if self.nao_verificados:
+            partes.append(f"{len(self.nao_verificados)} não verificados")
+        return ", ".join(partes)
+
+
+def candidatos_do_texto(texto):
+    """Separa um texto livre em candidatos (vírgulas, ponto e vírgula, espaços ou linhas)."""
+    return [parte for parte in SEPARADORES.split(texto or "") if parte]
+
+
+def candidatos_do_csv(conteudo):
+    """
+    Extrai os candidatos de um CSV.
+
+    Se o cabeçalho tiver uma coluna reconhecida (Ticker, Código, Ativo...),
+    só ela é usada; caso contrário, a primeira coluna de cada linha.
+    """
+    amostra = conteudo[:4096]
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t|")
+    except csv.Error:
+        dialeto = csv.excel
+    linhas = [linha for linha in csv.reader(io.StringIO(conteudo), dialeto) if any(c.strip() for c in linha)]
+    if not linhas:
+        return []
+
+    cabecalho = [c.strip().lower() for c in linhas[0]]
+    indice = next((i for i, nome in enumerate(cabecalho) if nome in COLUNAS_TICKER), None)
+    if indice is not None:
+        linhas = linhas[1:]
+    else:
+        indice = 0
+    return [linha[indice].strip() for linha in linhas if len(linha) > indice and linha[indice].strip()]
+
+
+def ler_arquivo_csv(caminho):
+    """Lê os candidatos de um arquivo CSV (UTF-8, com ou sem BOM, ou Latin-1)."""
+    for codificacao in ("utf-8-sig", "latin-1"):
+        try:
+            with open(caminho, 'r', encoding=codificacao, newline='') as f:
+                return candidatos_do_csv(f.read())
+        except UnicodeDecodeError:
+            continue
+    return []
+
+
+def classificar(candidatos, existentes):
+    """
+    Normaliza, valida e deduplica os candidatos (sem acessar a rede).
+
+    Args:
+        candidatos (list): Textos brutos
+        existentes (list): Tickers já presentes na lista
+
+    Returns:
+        ResultadoImportacao: `novos` na ordem em que apareceram
+    """
+    resultado = ResultadoImportacao()
+    existentes = set(existentes)
+    vistos = set()
+    for candidato in candidatos:
+        ticker = normalizar_ticker(candidato)
+        if not ticker:
+            continue
+        if not PADRAO_TICKER.match(ticker):
+            resultado.invalidos.append(candidato.strip())
+        elif ticker in existentes:
+            resultado.duplicados.append(ticker)
+        elif ticker not in vistos:
+            vistos.add(ticker)
+            resultado.novos.append(ticker)
+    return resultado
+
+
+def verificar_existencia(resultado, base_url, universo=None, buscador=None):
+    """
+    Confere no site se os tickers novos existem, removendo os inexistentes de `novos`.
+
+    Tickers que não puderam ser verificados (rede, bloqueio) continuam em
+    `novos` e também são listados em `nao_verificados`.
+
+    Args:
+        resultado (ResultadoImportacao): Resultado de `classificar` (alterado no lugar)
+        base_url (str): Endereço base do site
+        universo (dict): Universo da descoberta (tickers conhecidos dispensam a consulta)
+        buscador (BuscadorHttp): Buscador a usar (um novo por padrão)
+    """
+    conhecidos = set(universo or {})
+    pendentes = [ticker for ticker in resultado.novos if ticker not in conhecidos]
+    if not pendentes:
+        return resultado
+
+    if buscador is None:
+        from http_fetch import BuscadorHttp
+        buscador = BuscadorHttp()
+    urls = {ticker: f"{base_url.rstrip('/')}/fiis/{ticker.lower()}/" for ticker in pendentes}
+    existencias = buscador.existem(urls.values())
+
+    for ticker, url in urls.items():
+        existe = existencias.get(url)
+        if existe is False:
+            resultado.inexistentes.append(ticker)
+        elif existe is None:
+            resultado.nao_verificados.append(ticker)
+    inexistentes = set(resultado.inexistentes)
+    resultado.novos = [ticker for ticker in resultado.novos if ticker not in inexistentes]
+    logger.info(f"Existência conferida para {len(pendentes)} tickers: {resultado.resumo()}")
+    return resultado